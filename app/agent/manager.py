@@ -1,6 +1,7 @@
 """
 Gestor del agente de conversación con memoria persistente.
 """
+import asyncio
 import logging
 import re
 from datetime import datetime, timedelta
@@ -16,8 +17,10 @@ from bedrock_agentcore.memory.integrations.strands.session_manager import (
 
 from app.config import settings
 from app.agent.prompts import build_system_prompt, ERROR_MESSAGES
+from app.database.identity_map import IdentityMap, turn_identity_map
 from app.agent.tools import (
     check_availability,
+    find_next_available,
     create_reservation,
     list_reservations,
     update_reservation,
@@ -42,6 +45,7 @@ class RestaurantAgentManager:
         self.tools = [
             calculator,
             check_availability,
+            find_next_available,
             create_reservation,
             list_reservations,
             update_reservation,
@@ -213,37 +217,82 @@ class RestaurantAgentManager:
         """
         clean_phone = self._sanitize_phone_number(phone_number)
         
-        try:
-            logger.info(f"📨 Procesando mensaje de {clean_phone}: {message[:50]}...")
+        # Las lecturas repetidas de un mismo item durante el turno se sirven de memoria
+        with turn_identity_map() as identity_map:
+            try:
+                logger.info(f"📨 Procesando mensaje de {clean_phone}: {message[:50]}...")
             
-            # Obtener o crear agente
-            agent = self._get_or_create_agent(phone_number)
-            self._refresh_agent_system_prompt(agent)
+                # Obtener o crear agente
+                agent = self._get_or_create_agent(phone_number)
+                self._refresh_agent_system_prompt(agent)
 
-            # Inyectar metadatos del canal para evitar pedir el teléfono al usuario
-            enriched_message = self._build_message_with_metadata(clean_phone, message)
+                # Inyectar metadatos del canal para evitar pedir el teléfono al usuario
+                enriched_message = self._build_message_with_metadata(clean_phone, message)
 
-            # Procesar mensaje
-            results = agent(enriched_message)
-            response = results.message['content'][0]['text']
-            response = self._sanitize_agent_response(response)
+                # Procesar mensaje
+                results = agent(enriched_message)
+                return self._build_response(clean_phone, results)
             
-            # Limitar longitud para WhatsApp
-            if len(response) > settings.max_message_length:
-                logger.warning(f"⚠️ Respuesta muy larga ({len(response)} chars), truncando")
-                response = response[:settings.max_message_length - 50] + (
-                    "...\n\n(Mensaje completo en próxima respuesta)"
+            except Exception as e:
+                logger.error(
+                    f"❌ Error procesando mensaje de {clean_phone}: {e}",
+                    exc_info=True
                 )
+                return ERROR_MESSAGES["generic"]
+            finally:
+                self._log_turn_reads(clean_phone, identity_map)
+
+    async def process_message_async(self, phone_number: str, message: str) -> str:
+        """
+        Igual que process_message, pero el agente (y sus herramientas async)
+        se ejecutan en el event loop del servidor en lugar de en un hilo.
+        La creación del agente con memoria sigue siendo bloqueante y va a un hilo.
+        """
+        clean_phone = self._sanitize_phone_number(phone_number)
+        
+        # Las lecturas repetidas de un mismo item durante el turno se sirven de memoria
+        with turn_identity_map() as identity_map:
+            try:
+                logger.info(f"📨 Procesando mensaje de {clean_phone}: {message[:50]}...")
             
-            logger.info(f"✅ Respuesta generada para {clean_phone}: {response[:50]}...")
-            return response
+                agent = await asyncio.to_thread(self._get_or_create_agent, phone_number)
+                self._refresh_agent_system_prompt(agent)
+                enriched_message = self._build_message_with_metadata(clean_phone, message)
+
+                results = await agent.invoke_async(enriched_message)
+                return self._build_response(clean_phone, results)
             
-        except Exception as e:
-            logger.error(
-                f"❌ Error procesando mensaje de {clean_phone}: {e}",
-                exc_info=True
+            except Exception as e:
+                logger.error(
+                    f"❌ Error procesando mensaje de {clean_phone}: {e}",
+                    exc_info=True
+                )
+                return ERROR_MESSAGES["generic"]
+            finally:
+                self._log_turn_reads(clean_phone, identity_map)
+
+    def _log_turn_reads(self, clean_phone: str, identity_map: IdentityMap) -> None:
+        """Registra cuántas lecturas del turno se resolvieron sin ir a DynamoDB."""
+        stats = identity_map.stats()
+        logger.info(
+            f"🗂️ Lecturas del turno de {clean_phone}: {stats['hits']} servidas de caché, "
+            f"{stats['misses']} a DynamoDB ({stats['items']} items en memoria)"
+        )
+
+    def _build_response(self, clean_phone: str, results) -> str:
+        """Extrae, sanea y limita la respuesta del agente para WhatsApp."""
+        response = results.message['content'][0]['text']
+        response = self._sanitize_agent_response(response)
+        
+        # Limitar longitud para WhatsApp
+        if len(response) > settings.max_message_length:
+            logger.warning(f"⚠️ Respuesta muy larga ({len(response)} chars), truncando")
+            response = response[:settings.max_message_length - 50] + (
+                "...\n\n(Mensaje completo en próxima respuesta)"
             )
-            return ERROR_MESSAGES["generic"]
+        
+        logger.info(f"✅ Respuesta generada para {clean_phone}: {response[:50]}...")
+        return response
     
     def clear_user_session(self, phone_number: str) -> bool:
         """
@@ -154,6 +154,8 @@ Orden recomendado si faltan datos:
 5) Preferencias (opcional)
 
 ⚠️ Teléfono: usa `telefono_usuario` desde metadatos y no lo solicites al cliente.
+🔎 Si pregunta por el próximo hueco libre en varios días ("este finde", "la semana que viene"),
+usa `find_next_available` con el rango completo en una sola llamada, no consultes día a día.
 Confirma al final:
 
 "Perfecto! ✅
@@ -3,11 +3,36 @@
 from __future__ import annotations
 
 import json
+import logging
 from datetime import datetime
+from functools import wraps
+from typing import Any, Awaitable, Callable
 
 from strands import tool
 
-from app.database.reservation_repository import VALID_STATUSES, reservation_repository
+from app.database.async_reservation_repository import get_async_reservation_repository
+from app.database.reservation_repository import NO_TABLES_MESSAGE, PACING_FULL_MESSAGE, VALID_STATUSES
+from app.database.usage import tool_usage, track_usage
+
+logger = logging.getLogger(__name__)
+
+
+def _track_dynamodb_usage(func: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+    """Log and roll up the DynamoDB calls and capacity one tool invocation used."""
+
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> str:
+        with track_usage() as usage:
+            result = await func(*args, **kwargs)
+        tool_usage.add(func.__name__, usage)
+        logger.info(
+            "Tool %s DynamoDB usage %s",
+            func.__name__,
+            json.dumps({"tool": func.__name__, **usage.as_dict()}, sort_keys=True),
+        )
+        return result
+
+    return wrapper
 
 
 def _format_date_human(date: str) -> str:
@@ -20,7 +45,8 @@ def _format_date_human(date: str) -> str:
 
 
 @tool
-def create_reservation(
+@_track_dynamodb_usage
+async def create_reservation(
     date: str,
     time: str,
     num_people: int,
@@ -36,7 +62,7 @@ def create_reservation(
     if len(phone.strip()) < 9:
         return "❌ Debes indicar un teléfono válido"
 
-    success, error, reservation = reservation_repository.create_reservation(
+    success, error, reservation = await get_async_reservation_repository().create_reservation(
         {
             "date": date,
             "time": time,
@@ -50,7 +76,19 @@ def create_reservation(
     )
 
     if not success or not reservation:
-        return f"❌ {error}"
+        if error not in (NO_TABLES_MESSAGE, PACING_FULL_MESSAGE):
+            return f"❌ {error}"
+
+        alternatives = await get_async_reservation_repository().nearest_alternatives(
+            date, time, int(num_people), preferences.strip()
+        )
+        if not alternatives:
+            return f"❌ {error}"
+        lines = [f"❌ {error}", "Alternativas más cercanas con mesa libre:"]
+        lines.extend(
+            f"- {_format_date_human(alt['date'])} a las {alt['time']} ({alt['zone']})" for alt in alternatives
+        )
+        return "\n".join(lines)
 
     details = [
         "✅ Reserva creada",
@@ -70,12 +108,13 @@ def create_reservation(
 
 
 @tool
-def check_availability(date: str, num_people: int, preferred_zone: str = "") -> str:
+@_track_dynamodb_usage
+async def check_availability(date: str, num_people: int, preferred_zone: str = "") -> str:
     """Check available time slots for a given date and party size."""
     if num_people < 1 or num_people > 12:
         return "❌ El número de personas debe estar entre 1 y 12"
 
-    available = reservation_repository.available_times(date, int(num_people), preferred_zone)
+    available = await get_async_reservation_repository().available_times(date, int(num_people), preferred_zone)
     if not available:
         return "No hay disponibilidad para esa fecha y tamaño de grupo"
 
@@ -92,16 +131,62 @@ def check_availability(date: str, num_people: int, preferred_zone: str = "") ->
 
 
 @tool
-def list_reservations(date: str = "", status: str = "all", customer_name: str = "") -> str:
-    """List reservations with optional filters."""
+@_track_dynamodb_usage
+async def find_next_available(
+    num_people: int,
+    start_date: str,
+    end_date: str = "",
+    preferred_zone: str = "",
+    limit: int = 5,
+) -> str:
+    """Find the earliest available slots for a party size across a date range (up to 14 days) in one call."""
+    if num_people < 1 or num_people > 12:
+        return "❌ El número de personas debe estar entre 1 y 12"
+
+    available = await get_async_reservation_repository().find_next_available(
+        start_date.strip(),
+        end_date.strip() or start_date.strip(),
+        int(num_people),
+        preferred_zone,
+        limit=max(1, min(int(limit), 10)),
+    )
+    if not available:
+        return "No hay disponibilidad en ese rango de fechas para ese tamaño de grupo"
+
+    return json.dumps(
+        {
+            "start_date": start_date,
+            "end_date": end_date or start_date,
+            "num_people": num_people,
+            "preferred_zone": preferred_zone or "sin preferencia",
+            "available": [
+                {**slot, "formatted_date": _format_date_human(slot["date"])} for slot in available
+            ],
+        },
+        ensure_ascii=False,
+        indent=2,
+    )
+
+
+@tool
+@_track_dynamodb_usage
+async def list_reservations(date: str = "", status: str = "all", customer_name: str = "", limit: int = 20) -> str:
+    """List reservations with optional filters, earliest first, at most `limit` (default 20) of them.
+
+    `returned` is how many are listed, not how many match. When `has_more` is
+    true there are more matches: call again with a larger `limit` or narrower
+    filters (a date or a customer name) before answering about all of them.
+    """
     status = status.lower().strip() or "all"
     if status != "all" and status not in VALID_STATUSES:
         return "❌ Estado inválido. Usa: all, pending, confirmed, cancelled"
+    limit = max(1, limit)
 
-    reservations = reservation_repository.list_reservations(
+    reservations = await get_async_reservation_repository().list_reservations(
         date=date.strip(),
         status=status,
         customer_name=customer_name.strip(),
+        limit=limit + 1,
     )
 
     if not reservations:
@@ -109,13 +194,14 @@ def list_reservations(date: str = "", status: str = "all", customer_name: str =
 
     return json.dumps(
         {
-            "total": len(reservations),
+            "returned": min(len(reservations), limit),
+            "has_more": len(reservations) > limit,
             "filters": {
                 "date": date or "all",
                 "status": status,
                 "customer_name": customer_name or "all",
             },
-            "reservations": reservations,
+            "reservations": reservations[:limit],
         },
         ensure_ascii=False,
         indent=2,
@@ -123,7 +209,8 @@ def list_reservations(date: str = "", status: str = "all", customer_name: str =
 
 
 @tool
-def update_reservation(
+@_track_dynamodb_usage
+async def update_reservation(
     reservation_id: str,
     new_date: str = "",
     new_time: str = "",
@@ -159,7 +246,9 @@ def update_reservation(
     if not updates:
         return "⚠️ No se recibieron cambios"
 
-    success, error, reservation = reservation_repository.update_reservation(reservation_id.strip(), updates)
+    success, error, reservation = await get_async_reservation_repository().update_reservation(
+        reservation_id.strip(), updates
+    )
     if not success or not reservation:
         return f"❌ {error}"
 
@@ -175,13 +264,16 @@ def update_reservation(
 
 
 @tool
-def cancel_reservation(reservation_id: str, reason: str = "") -> str:
+@_track_dynamodb_usage
+async def cancel_reservation(reservation_id: str, reason: str = "") -> str:
     """Cancel a reservation and release its table slots."""
     updates = {"status": "cancelled"}
     if reason.strip():
         updates["preferences"] = f"{reason.strip()}"
 
-    success, error, reservation = reservation_repository.update_reservation(reservation_id.strip(), updates)
+    success, error, reservation = await get_async_reservation_repository().update_reservation(
+        reservation_id.strip(), updates
+    )
     if not success or not reservation:
         return f"❌ {error}"
 
@@ -196,9 +288,10 @@ def cancel_reservation(reservation_id: str, reason: str = "") -> str:
 
 
 @tool
-def get_reservation_details(reservation_id: str) -> str:
+@_track_dynamodb_usage
+async def get_reservation_details(reservation_id: str) -> str:
     """Get full reservation details by reservation id."""
-    reservation = reservation_repository.get_reservation(reservation_id.strip())
+    reservation = await get_async_reservation_repository().get_reservation(reservation_id.strip())
     if not reservation:
         return "❌ No se encontró la reserva"
 
@@ -1,12 +1,30 @@
 """
 Configuración centralizada de la aplicación.
 """
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 from pydantic_settings import SettingsConfigDict
 from functools import lru_cache
 from typing import Literal
 
 
+class DurationRule(BaseModel):
+    """Duración de reserva para un tamaño de grupo, días de la semana y servicio."""
+
+    max_people: int = 12
+    weekdays: list[int] = []  # 0 = lunes; vacío = todos los días
+    service: Literal["", "lunch", "dinner"] = ""  # vacío = ambos servicios
+    minutes: int
+
+
+class PacingRule(BaseModel):
+    """Comensales máximos que la cocina admite por slot de entrada y por servicio."""
+
+    weekdays: list[int] = []  # 0 = lunes; vacío = todos los días
+    slot_covers: int = 0  # 0 = sin límite
+    service_covers: int = 0  # 0 = sin límite
+
+
 class Settings(BaseSettings):
     """Configuración de la aplicación."""
 
@@ -40,10 +58,44 @@ class Settings(BaseSettings):
     agentcore_memory_id: str
     agent_model: str = "eu.anthropic.claude-haiku-4-5-20251001-v1:0"
     
+    # Almacenamiento de reservas
+    reservation_backend: Literal["dynamodb", "sqlite"] = "dynamodb"
+    sqlite_path: str = "data/reservations.db"
+    sqlite_busy_timeout_ms: int = 5000  # espera máxima por el bloqueo de escritura
+
     # DynamoDB
     dynamodb_table_name: str = "restaurant-reservations"
     dynamodb_region: str = "eu-west-1"
+    dynamodb_backend: Literal["aws", "memory"] = "aws"  # memory: tabla en proceso, sin red
+    dynamodb_memory_latency_ms: float = 0.0  # latencia simulada por llamada con el backend memory
+    dynamodb_async: bool = False  # requiere aiobotocore
+    dynamodb_endpoint_url: str = ""  # p. ej. DynamoDB Local
+    dynamodb_max_pool_connections: int = 32
+    dynamodb_connect_timeout_seconds: float = 2.0
+    dynamodb_read_timeout_seconds: float = 5.0
+    dynamodb_tcp_keepalive: bool = True
+    dynamodb_retry_mode: Literal["legacy", "standard", "adaptive"] = "standard"
+    dynamodb_max_attempts: int = 3  # incluye el primer intento
+    dynamodb_scan_segments: int = 4  # segmentos de los Scan completos en paralelo
+    dynamodb_consumed_capacity: Literal["NONE", "TOTAL", "INDEXES"] = "TOTAL"
+    table_catalog_ttl_seconds: int = 30
+    allocation_reseating: bool = True
+    occupancy_legacy_keys: bool = False  # reclamar también las filas TABLE#/SLOT# durante la migración
+    availability_cache_max_entries: int = 512
+    availability_cache_ttl_seconds: int = 60
     
+    # Slots y duraciones (se aplica la primera regla que encaje)
+    slot_minutes: int = 30
+    default_reservation_duration_minutes: int = 90
+    reservation_duration_rules: list[DurationRule] = [DurationRule(minutes=90)]
+
+    # Ritmo de cocina (se aplica la primera regla cuyo día encaje)
+    pacing_rules: list[PacingRule] = []
+
+    # Calendario (fechas YYYY-MM-DD)
+    closed_dates: list[str] = []
+    holiday_dates: list[str] = []
+
     # Logging
     log_level: str = "INFO"
     
@@ -0,0 +1,142 @@
+"""Interval-scheduling table allocation used when greedy first-fit fails."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from app.database.availability import table_members
+
+MAX_SEARCH_NODES = 20000
+
+
+@dataclass(frozen=True)
+class Booking:
+    """A reservation seen as a slot interval (bitmask) needing one table or combination."""
+
+    reservation_id: str
+    num_people: int
+    mask: int
+    candidates: tuple[str, ...]
+    table_id: str = ""
+
+
+@dataclass(frozen=True)
+class Move:
+    booking: Booking
+    table_id: str
+
+
+def plan_reseating(
+    bookings: list[Booking],
+    request: Booking,
+    fixed_masks: dict[str, int],
+    max_nodes: int = MAX_SEARCH_NODES,
+) -> tuple[str, list[Move]] | None:
+    """Find a seating of ``bookings`` plus ``request`` with no overlaps.
+
+    Each booking is tried on its current table first, so the first solution
+    found moves few reservations. Returns the table for ``request`` and the
+    moves in an order where every move targets slots that are already free,
+    or ``None`` if no seating exists within the search budget.
+    """
+    order = sorted(
+        [*bookings, request],
+        key=lambda booking: (len(booking.candidates), -booking.num_people, booking.reservation_id),
+    )
+    masks = dict(fixed_masks)
+    assignment: dict[str, str] = {}
+    nodes = 0
+
+    def occupied(table_id: str) -> int:
+        mask = 0
+        for member in table_members(table_id):
+            mask |= masks.get(member, 0)
+        return mask
+
+    def search(position: int) -> bool:
+        nonlocal nodes
+        if position == len(order):
+            return True
+        nodes += 1
+        if nodes > max_nodes:
+            return False
+
+        booking = order[position]
+        candidates = list(booking.candidates)
+        if booking.table_id in candidates:
+            candidates.remove(booking.table_id)
+            candidates.insert(0, booking.table_id)
+
+        for table_id in candidates:
+            if occupied(table_id) & booking.mask:
+                continue
+            members = table_members(table_id)
+            previous = {member: masks.get(member, 0) for member in members}
+            for member in members:
+                masks[member] = previous[member] | booking.mask
+            assignment[booking.reservation_id] = table_id
+            if search(position + 1):
+                return True
+            masks.update(previous)
+            del assignment[booking.reservation_id]
+        return False
+
+    if not search(0):
+        return None
+
+    moves = _order_moves(
+        bookings,
+        [Move(booking, assignment[booking.reservation_id])
+         for booking in bookings if assignment[booking.reservation_id] != booking.table_id],
+        fixed_masks,
+    )
+    if moves is None:
+        return None
+    return assignment[request.reservation_id], moves
+
+
+def _order_moves(
+    bookings: list[Booking],
+    moves: list[Move],
+    fixed_masks: dict[str, int],
+) -> list[Move] | None:
+    """Order moves so each one lands on slots free at that point (no swaps)."""
+    masks = dict(fixed_masks)
+
+    def place(table_id: str, mask: int) -> None:
+        for member in table_members(table_id):
+            masks[member] = masks.get(member, 0) | mask
+
+    def is_free(table_id: str, mask: int) -> bool:
+        return not any(masks.get(member, 0) & mask for member in table_members(table_id))
+
+    for booking in bookings:
+        place(booking.table_id, booking.mask)
+
+    pending = list(moves)
+    ordered: list[Move] = []
+    while pending:
+        ready = next((move for move in pending if is_free(move.table_id, move.booking.mask)), None)
+        if ready is None:
+            return None
+        pending.remove(ready)
+        ordered.append(ready)
+        for member in table_members(ready.booking.table_id):
+            masks[member] &= ~ready.booking.mask
+        place(ready.table_id, ready.booking.mask)
+    return ordered
+
+
+def greedy_seated(bookings: list[Booking]) -> list[Booking]:
+    """Replay bookings in order with first-fit and return the ones seated."""
+    masks: dict[str, int] = {}
+    seated: list[Booking] = []
+    for booking in bookings:
+        for table_id in booking.candidates:
+            members = table_members(table_id)
+            if not any(masks.get(member, 0) & booking.mask for member in members):
+                for member in members:
+                    masks[member] = masks.get(member, 0) | booking.mask
+                seated.append(booking)
+                break
+    return seated
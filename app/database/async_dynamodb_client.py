@@ -0,0 +1,394 @@
+"""Asyncio DynamoDB clients with the same surface as ``DynamoDBClient``."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator
+
+from botocore.exceptions import ClientError
+
+from app.config import settings
+from app.database.codec import build_request, serialize_item
+from app.database.dynamodb_client import (
+    _SEGMENT_DONE,
+    DynamoDBClient,
+    DynamoDBRequests,
+    PageCursor,
+    TransportStats,
+    client_config_options,
+    get_db_client,
+    with_capacity_request,
+)
+from app.database.usage import UsageReport, observe
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncItemStream(PageCursor):
+    """Async counterpart of ``ItemStream``: ``async for`` over items or ``pages()``."""
+
+    async def pages(self) -> AsyncIterator[list[dict[str, Any]]]:
+        while (request := self._next_request()) is not None:
+            try:
+                response = await self._fetch(self.operation, **request)
+            except Exception as exc:  # noqa: BLE001
+                self._fail(exc)
+                return
+            yield self._page(response)
+
+    async def __aiter__(self) -> AsyncIterator[dict[str, Any]]:
+        async for page in self.pages():
+            for item in page:
+                yield item
+
+
+class AsyncParallelScan:
+    """Async counterpart of ``ParallelScan``: one task per segment, pages merged as they arrive."""
+
+    def __init__(self, streams: list[AsyncItemStream]) -> None:
+        self.streams = streams
+
+    @property
+    def failed(self) -> bool:
+        return any(stream.failed for stream in self.streams)
+
+    async def pages(self) -> AsyncIterator[list[dict[str, Any]]]:
+        pages: asyncio.Queue[Any] = asyncio.Queue(maxsize=2 * len(self.streams))
+
+        async def produce(stream: AsyncItemStream) -> None:
+            try:
+                async for page in stream.pages():
+                    await pages.put(page)
+            except Exception as exc:  # noqa: BLE001
+                stream._fail(exc)
+            # Not in a ``finally``: a cancelled producer must not wait on a full queue nobody reads.
+            await pages.put(_SEGMENT_DONE)
+
+        tasks = [asyncio.create_task(produce(stream)) for stream in self.streams]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                page = await pages.get()
+                if page is _SEGMENT_DONE:
+                    remaining -= 1
+                    continue
+                yield page
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __aiter__(self) -> AsyncIterator[dict[str, Any]]:
+        async for page in self.pages():
+            for item in page:
+                yield item
+
+
+class AsyncDynamoDBClient(DynamoDBRequests):
+    """aiobotocore-backed DynamoDB client; return values match ``DynamoDBClient``.
+
+    aiobotocore is an optional dependency (``pip install aiobotocore``) and is
+    only imported when the first request is made. A low-level client is
+    opened per event loop, since its connection pool is bound to the loop
+    that created it; ``close`` releases them on shutdown.
+    """
+
+    def __init__(self) -> None:
+        self.table_name = settings.dynamodb_table_name
+        self._clients: dict[asyncio.AbstractEventLoop, tuple[Any, Any]] = {}
+        self.usage = UsageReport()
+        self.transport = TransportStats()
+
+    async def _client(self) -> Any:
+        loop = asyncio.get_running_loop()
+        if loop not in self._clients:
+            try:
+                from aiobotocore.config import AioConfig  # noqa: WPS433
+                from aiobotocore.session import get_session  # noqa: WPS433
+            except ImportError as exc:
+                raise RuntimeError("DYNAMODB_ASYNC=true requiere instalar aiobotocore") from exc
+
+            client_kwargs: dict[str, Any] = {
+                "region_name": settings.dynamodb_region,
+                "aws_access_key_id": settings.aws_access_key_id,
+                "aws_secret_access_key": settings.aws_secret_access_key,
+            }
+            if settings.aws_session_token:
+                client_kwargs["aws_session_token"] = settings.aws_session_token
+            if settings.dynamodb_endpoint_url:
+                client_kwargs["endpoint_url"] = settings.dynamodb_endpoint_url
+            client_kwargs["config"] = AioConfig(**client_config_options())
+            context = get_session().create_client("dynamodb", **client_kwargs)
+            self._clients[loop] = (context, await context.__aenter__())
+            logger.info("Async DynamoDB client ready for table: %s", self.table_name)
+        return self._clients[loop][1]
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        entry = self._clients.pop(loop, None)
+        if entry is not None:
+            await entry[0].__aexit__(None, None, None)
+
+    async def _call(self, operation: str, **request: Any) -> dict[str, Any]:
+        request = with_capacity_request(request)
+        client = await self._client()
+        self.transport.started()
+        metadata: dict[str, Any] = {}
+        response: dict[str, Any] | None = None
+        started = time.perf_counter()
+        try:
+            response = await getattr(client, operation)(**request)
+            metadata = response.get("ResponseMetadata", {})
+            return response
+        except ClientError as exc:
+            metadata = exc.response.get("ResponseMetadata", {})
+            raise
+        finally:
+            self.transport.finished(metadata)
+            observe(self.usage, operation, request, response, time.perf_counter() - started)
+
+    def call_stats(self) -> dict[str, Any]:
+        return self.usage.as_dict()
+
+    def transport_stats(self) -> dict[str, Any]:
+        return self.transport.snapshot()
+
+    async def _write(self, operation: str, params: dict[str, Any]) -> bool:
+        try:
+            await self._call(operation, **build_request(self.table_name, params))
+            succeeded = True
+        except Exception as exc:  # noqa: BLE001
+            succeeded = self._write_failed(operation, exc)
+        return self._record_write(operation, params, succeeded)
+
+    async def get_item(self, key: dict[str, Any]) -> dict[str, Any] | None:
+        known, cached = self._known_item(key)
+        if known:
+            return cached
+        try:
+            response = await self._call("get_item", TableName=self.table_name, Key=serialize_item(key))
+        except Exception as exc:  # noqa: BLE001
+            logger.error("DynamoDB get_item failed: %s", str(exc))
+            return None
+        return self._read_item(key, response)
+
+    async def put_item(
+        self,
+        item: dict[str, Any],
+        *,
+        condition_expression: str | None = None,
+        expression_attribute_values: dict[str, Any] | None = None,
+    ) -> bool:
+        return await self._write("put_item", self._put_params(item, condition_expression, expression_attribute_values))
+
+    async def delete_item(
+        self,
+        key: dict[str, Any],
+        *,
+        condition_expression: str | None = None,
+        expression_attribute_values: dict[str, Any] | None = None,
+    ) -> bool:
+        return await self._write(
+            "delete_item", self._delete_params(key, condition_expression, expression_attribute_values)
+        )
+
+    async def update_item(
+        self,
+        key: dict[str, Any],
+        *,
+        update_expression: str,
+        condition_expression: str | None = None,
+        expression_attribute_names: dict[str, str] | None = None,
+        expression_attribute_values: dict[str, Any] | None = None,
+    ) -> bool:
+        return await self._write(
+            "update_item",
+            self._update_params(
+                key, update_expression, condition_expression, expression_attribute_names, expression_attribute_values
+            ),
+        )
+
+    async def batch_get_items(
+        self,
+        keys: list[dict[str, Any]],
+        *,
+        consistent_read: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Fetch many items; chunks of 100 keys are requested concurrently."""
+        known, chunks = self._batch_get_chunks(keys)
+        results = await asyncio.gather(*(self._batch_get_chunk(chunk, consistent_read) for chunk in chunks))
+        return known + [item for chunk_items in results for item in chunk_items]
+
+    async def _batch_get_chunk(self, keys: list[dict[str, Any]], consistent_read: bool) -> list[dict[str, Any]]:
+        request = self._batch_get_request(keys, consistent_read)
+        found: list[dict[str, Any]] = []
+        attempt = 0
+        try:
+            while True:
+                response = await self._call("batch_get_item", RequestItems=request)
+                request = self._batch_get_page(keys, found, response)
+                if not request:
+                    break
+                attempt += 1
+                delay = self._retry_delay("batch_get_item", attempt, len(request[self.table_name]["Keys"]))
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("DynamoDB batch_get_item failed: %s", str(exc))
+        return found
+
+    def _stream(
+        self,
+        operation: str,
+        kwargs: dict[str, Any],
+        max_items: int | None,
+        start_key: dict[str, Any] | None,
+    ) -> AsyncItemStream:
+        request = self._stream_request(kwargs, start_key)
+        return AsyncItemStream(self._call, operation, request, max_items=max_items, start_key=start_key)
+
+    def iter_query(
+        self,
+        *,
+        max_items: int | None = None,
+        start_key: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> AsyncItemStream:
+        return self._stream("query", kwargs, max_items, start_key)
+
+    def iter_scan(
+        self,
+        *,
+        max_items: int | None = None,
+        start_key: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> AsyncItemStream:
+        return self._stream("scan", kwargs, max_items, start_key)
+
+    def parallel_scan(self, *, segments: int | None = None, **kwargs: Any) -> AsyncParallelScan:
+        return AsyncParallelScan(
+            [self._stream("scan", request, None, None) for request in self._segment_requests(segments, kwargs)]
+        )
+
+    async def query(self, **kwargs: Any) -> list[dict[str, Any]]:
+        stream = self.iter_query(**kwargs)
+        items = [item async for item in stream]
+        return [] if stream.failed else items
+
+    async def scan(self, **kwargs: Any) -> list[dict[str, Any]]:
+        stream = self.iter_scan(**kwargs)
+        items = [item async for item in stream]
+        return [] if stream.failed else items
+
+    async def scan_all(self, **kwargs: Any) -> list[dict[str, Any]]:
+        stream = self.parallel_scan(**kwargs)
+        items = [item async for item in stream]
+        return [] if stream.failed else items
+
+    async def transact_write(self, actions: list[dict[str, Any]]) -> tuple[bool, list[str]]:
+        """Same contract as ``DynamoDBClient.transact_write``."""
+        if not actions:
+            return True, []
+        request = self._transaction_request(actions)
+        if request is None:
+            return False, []
+        try:
+            await self._call("transact_write_items", **request)
+            committed, reasons = True, []
+        except Exception as exc:  # noqa: BLE001
+            committed, reasons = self._transaction_failed(exc)
+        self._record_transaction(actions, committed)
+        return committed, reasons
+
+
+class ThreadedDynamoDBClient(DynamoDBRequests):
+    """Async facade over the blocking client, used when aiobotocore is not enabled.
+
+    Each call runs in the default executor, so callers get the async API (and
+    ``gather``) either way; only the native client frees the worker threads.
+    """
+
+    def __init__(self, client: DynamoDBClient) -> None:
+        self.client = client
+        self.table_name = client.table_name
+
+    async def get_item(self, key: dict[str, Any]) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self.client.get_item, key)
+
+    async def put_item(self, item: dict[str, Any], **kwargs: Any) -> bool:
+        return await asyncio.to_thread(self.client.put_item, item, **kwargs)
+
+    async def delete_item(self, key: dict[str, Any], **kwargs: Any) -> bool:
+        return await asyncio.to_thread(self.client.delete_item, key, **kwargs)
+
+    async def update_item(self, key: dict[str, Any], **kwargs: Any) -> bool:
+        return await asyncio.to_thread(self.client.update_item, key, **kwargs)
+
+    async def batch_get_items(self, keys: list[dict[str, Any]], **kwargs: Any) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self.client.batch_get_items, keys, **kwargs)
+
+    async def query(self, **kwargs: Any) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self.client.query, **kwargs)
+
+    async def scan(self, **kwargs: Any) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self.client.scan, **kwargs)
+
+    async def scan_all(self, **kwargs: Any) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self.client.scan_all, **kwargs)
+
+    async def _fetch_page(self, operation: str, **request: Any) -> dict[str, Any]:
+        return await asyncio.to_thread(self.client._call, operation, **request)
+
+    def _stream(
+        self,
+        operation: str,
+        kwargs: dict[str, Any],
+        max_items: int | None,
+        start_key: dict[str, Any] | None,
+    ) -> AsyncItemStream:
+        request = self._stream_request(kwargs, start_key)
+        return AsyncItemStream(self._fetch_page, operation, request, max_items=max_items, start_key=start_key)
+
+    def iter_query(
+        self,
+        *,
+        max_items: int | None = None,
+        start_key: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> AsyncItemStream:
+        return self._stream("query", kwargs, max_items, start_key)
+
+    def iter_scan(
+        self,
+        *,
+        max_items: int | None = None,
+        start_key: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> AsyncItemStream:
+        return self._stream("scan", kwargs, max_items, start_key)
+
+    def parallel_scan(self, *, segments: int | None = None, **kwargs: Any) -> AsyncParallelScan:
+        return AsyncParallelScan(
+            [self._stream("scan", request, None, None) for request in self._segment_requests(segments, kwargs)]
+        )
+
+    async def transact_write(self, actions: list[dict[str, Any]]) -> tuple[bool, list[str]]:
+        return await asyncio.to_thread(self.client.transact_write, actions)
+
+    def call_stats(self) -> dict[str, Any]:
+        return self.client.call_stats()
+
+    def transport_stats(self) -> dict[str, Any]:
+        return self.client.transport_stats()
+
+    async def close(self) -> None:
+        return None
+
+
+def build_async_client() -> AsyncDynamoDBClient | ThreadedDynamoDBClient:
+    if settings.dynamodb_async and settings.dynamodb_backend != "memory":
+        return AsyncDynamoDBClient()
+    return ThreadedDynamoDBClient(get_db_client())
@@ -0,0 +1,383 @@
+"""Asyncio data path over the reservation repository's rules."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections import Counter
+from typing import Any
+
+from boto3.dynamodb.conditions import Attr, Key
+
+from app.config import settings
+from app.database.async_dynamodb_client import AsyncDynamoDBClient, ThreadedDynamoDBClient, build_async_client
+from app.database.availability import DayOccupancy, next_date
+from app.database.reservation_repository import (
+    ACTIVE_STATUSES,
+    NO_TABLES_FOR_CHANGES_MESSAGE,
+    NO_TABLES_MESSAGE,
+    NOT_FOUND_MESSAGE,
+    PACING_FULL_MESSAGE,
+    BaseReservationRepository,
+    ReservationRepository,
+    get_reservation_repository,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncReservationRepository:
+    """Async counterpart of ``ReservationRepository`` with the same semantics.
+
+    Validation, allocation, transaction building and the availability cache
+    are shared with the blocking repository; only the I/O is awaited here.
+    Re-seating, multi-day searches and reports still run the blocking
+    implementation in a worker thread.
+    """
+
+    def __init__(
+        self,
+        repository: ReservationRepository,
+        client: AsyncDynamoDBClient | ThreadedDynamoDBClient,
+    ) -> None:
+        self.repository = repository
+        self.client = client
+
+    async def _allocation_candidates(self, num_people: int, preferences: str) -> list[dict[str, Any]]:
+        if not self.repository.catalog.is_fresh():
+            await asyncio.to_thread(self.repository.catalog.active_tables)
+        return self.repository._allocation_candidates(num_people, preferences)
+
+    async def get_reservation(self, reservation_id: str) -> dict[str, Any] | None:
+        return await self.client.get_item(self.repository._reservation_key(reservation_id))
+
+    async def query_occupancy_by_date(self, date: str) -> list[dict[str, Any]]:
+        return await self.client.query(KeyConditionExpression=Key("PK").eq(f"OCC#{date}"))
+
+    async def _load_availability_summaries(self, dates: list[str]) -> dict[str, set[str]]:
+        items = await self.client.batch_get_items(
+            [self.repository._summary_key(date) for date in dates], consistent_read=True
+        )
+        summaries = self.repository._summaries_from_items(items)
+        missing = self.repository._missing_summaries(dates, summaries)
+        rows_by_date = await asyncio.gather(*(self.query_occupancy_by_date(date) for date in missing))
+        for date, rows in zip(missing, rows_by_date):
+            summaries[date] = self.repository._summary_entries(rows)
+            await self.client.put_item(**self.repository._summary_put(date, summaries[date], only_if_missing=True))
+        return summaries
+
+    async def _seed_availability_summaries(self, slot_keys: list[str]) -> None:
+        dates = self.repository._unseeded_summary_dates(slot_keys)
+        if dates:
+            await self._load_availability_summaries(dates)
+            self.repository._seeded_summaries.update(dates)
+
+    async def _load_pacing(self, dates: list[str]) -> dict[str, dict[str, Any]]:
+        keys = self.repository._pacing_keys(dates)
+        if not keys:
+            return {}
+        return self.repository._pacing_from_items(await self.client.batch_get_items(keys, consistent_read=True))
+
+    async def _load_slot_occupancy(
+        self,
+        date: str,
+        tables: list[dict[str, Any]],
+        slot_keys: list[str],
+    ) -> DayOccupancy:
+        keys = self.repository._slot_occupancy_keys(tables, slot_keys)
+        return self.repository._occupancy_from_rows(date, await self.client.batch_get_items(keys))
+
+    async def available_times(self, date: str, num_people: int, preferred_zone: str = "") -> list[dict[str, Any]]:
+        cache_key, generation, cached = self.repository._cached_availability(date, num_people, preferred_zone)
+        if cached is not None:
+            return cached
+
+        times = self.repository._bookable_times(date)
+        tables = await self._allocation_candidates(num_people, preferred_zone) if times else []
+        available: list[dict[str, Any]] = []
+        if tables:
+            summaries, paces = await asyncio.gather(
+                self._load_availability_summaries([date, next_date(date)]),
+                self._load_pacing([date]),
+            )
+            occupancy = self.repository._day_occupancy_from_summary(date, summaries)
+            available = self.repository._free_times(occupancy, tables, times, num_people, paces.get(date))
+        return self.repository._cache_availability(cache_key, generation, available)
+
+    async def find_next_available(
+        self,
+        start_date: str,
+        end_date: str,
+        num_people: int,
+        preferred_zone: str = "",
+        limit: int = 5,
+    ) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(
+            self.repository.find_next_available, start_date, end_date, num_people, preferred_zone, limit
+        )
+
+    async def nearest_alternatives(
+        self,
+        date: str,
+        time: str,
+        num_people: int,
+        preferences: str = "",
+        k: int = 3,
+    ) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self.repository.nearest_alternatives, date, time, num_people, preferences, k)
+
+    async def service_report(self, date: str) -> dict[str, dict[str, Any]]:
+        return await asyncio.to_thread(self.repository.service_report, date)
+
+    async def _find_table_for_reservation(
+        self,
+        date: str,
+        time: str,
+        num_people: int,
+        preferences: str,
+        duration_minutes: int,
+        reservation_id: str,
+    ) -> tuple[dict[str, Any] | None, list[str]]:
+        request = (date, time, num_people, preferences, duration_minutes)
+        candidates = await self._allocation_candidates(num_people, preferences)
+        occupancy = await self._load_slot_occupancy(
+            date, candidates, self.repository._slot_keys(date, time, duration_minutes)
+        )
+        table, slot_keys = self.repository._find_table_for_reservation(
+            *request, reservation_id, occupancy=occupancy
+        )
+        if not table and settings.allocation_reseating:
+            table = await asyncio.to_thread(self.repository._reseat_for_request, *request, reservation_id)
+        return table, slot_keys
+
+    async def _apply_update(self, update: dict[str, Any]) -> bool:
+        return await self.client.update_item(
+            update["Key"],
+            update_expression=update["UpdateExpression"],
+            condition_expression=update.get("ConditionExpression"),
+            expression_attribute_names=update.get("ExpressionAttributeNames"),
+            expression_attribute_values=update.get("ExpressionAttributeValues"),
+        )
+
+    async def _transact(self, actions: list[tuple[dict[str, Any], str]]) -> tuple[bool, str]:
+        committed, reasons = await self.client.transact_write([action for action, _ in actions])
+        return self.repository._transaction_result(actions, committed, reasons)
+
+    async def create_reservation(self, payload: dict[str, Any]) -> tuple[bool, str, dict[str, Any] | None]:
+        error, reservation = self.repository._prepare_reservation(payload)
+        if reservation is None:
+            return False, error, None
+
+        request = self.repository._allocation_request(reservation)
+        table, slot_keys = await self._find_table_for_reservation(*request, reservation["id"])
+        if not table:
+            return False, NO_TABLES_MESSAGE, None
+        self.repository._assign_table(reservation, table)
+
+        actions = self.repository._new_reservation_actions(reservation, slot_keys)
+        if actions is None:
+            return False, PACING_FULL_MESSAGE, None
+
+        if reservation["status"] in ACTIVE_STATUSES:
+            await self._seed_availability_summaries(slot_keys)
+        committed, error = await self._transact(actions)
+        return self.repository._new_reservation_result(reservation, slot_keys, committed, error)
+
+    async def update_reservation(
+        self,
+        reservation_id: str,
+        updates: dict[str, Any],
+    ) -> tuple[bool, str, dict[str, Any] | None]:
+        current = await self.get_reservation(reservation_id)
+        if not current:
+            return False, NOT_FOUND_MESSAGE, None
+
+        error, merged, reallocate = self.repository._merge_update(current, {**updates, "id": reservation_id})
+        if merged is None:
+            return False, error, None
+
+        new_slot_keys: list[str] = []
+        if merged["status"] in ACTIVE_STATUSES and reallocate:
+            request = self.repository._allocation_request(merged)
+            table, new_slot_keys = await self._find_table_for_reservation(*request, reservation_id)
+            if not table:
+                return False, NO_TABLES_FOR_CHANGES_MESSAGE, None
+            self.repository._assign_table(merged, table)
+
+        change = self.repository._reservation_change(current, merged, new_slot_keys if reallocate else None)
+        if change is None:
+            return False, PACING_FULL_MESSAGE, None
+        actions, deferred, touched = change
+
+        await self._seed_availability_summaries(touched)
+        committed, error = await self._transact(actions)
+        result = self.repository._change_result(merged, touched, committed, error)
+        if committed:
+            updates = self.repository._summary_updates("DELETE", deferred)
+            applied = await asyncio.gather(*(self._apply_update(update) for update in updates))
+            for update, ok in zip(updates, applied):
+                if not ok:
+                    self.repository._log_stale_summary(update)
+        return result
+
+    async def cancel_reservation(self, reservation_id: str) -> tuple[bool, str, dict[str, Any] | None]:
+        return await self.update_reservation(reservation_id, {"status": "cancelled"})
+
+    async def query_reservations_by_date(self, date: str) -> list[dict[str, Any]]:
+        return await self.client.query(
+            IndexName="GSI1",
+            KeyConditionExpression=Key("GSI1PK").eq(f"DATE#{date}"),
+        )
+
+    async def query_reservations_by_status(self, status: str) -> list[dict[str, Any]]:
+        return await self.client.query(
+            IndexName="StatusDateIndex",
+            KeyConditionExpression=Key("status").eq(status.lower()),
+        )
+
+    async def scan_all_reservations(self) -> list[dict[str, Any]]:
+        return await self.client.scan_all(FilterExpression=Attr("entity_type").eq("reservation"))
+
+    async def count_reservations_by_status(self) -> dict[str, int]:
+        counts: Counter[str] = Counter()
+        stream = self.client.parallel_scan(**self.repository._status_count_request())
+        async for page in stream.pages():
+            counts.update(str(item.get("status")) for item in page)
+        if stream.failed:
+            logger.error("Counting reservations by status failed; returning no counts")
+            return {}
+        return dict(counts)
+
+    async def list_reservations(
+        self,
+        *,
+        date: str = "",
+        status: str = "all",
+        customer_name: str = "",
+        phone: str = "",
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        status = status.lower()
+        operation, request, ordered = self.repository._listing_request(date, status)
+        stream = self.client.iter_query(**request) if operation == "query" else self.client.parallel_scan(**request)
+
+        reservations: list[dict[str, Any]] = []
+        async for page in stream.pages():
+            rows = self.repository._filter_reservations(page, status=status, customer_name=customer_name, phone=phone)
+            reservations = self.repository._first_reservations(reservations, rows, limit, ordered=ordered)
+            if self.repository._listing_complete(reservations, limit, ordered=ordered):
+                break
+        if stream.failed:
+            logger.error("Listing reservations failed; returning no rows instead of a partial list")
+            return []
+        return reservations
+
+
+class ThreadedReservationRepository:
+    """Async facade running a blocking repository's methods in worker threads.
+
+    Used for storage without an async driver (SQLite), which has no
+    DynamoDB client, so ``client`` is ``None``.
+    """
+
+    def __init__(self, repository: BaseReservationRepository) -> None:
+        self.repository = repository
+        self.client = None
+
+    async def get_reservation(self, reservation_id: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self.repository.get_reservation, reservation_id)
+
+    async def available_times(self, date: str, num_people: int, preferred_zone: str = "") -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self.repository.available_times, date, num_people, preferred_zone)
+
+    async def find_next_available(
+        self,
+        start_date: str,
+        end_date: str,
+        num_people: int,
+        preferred_zone: str = "",
+        limit: int = 5,
+    ) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(
+            self.repository.find_next_available, start_date, end_date, num_people, preferred_zone, limit
+        )
+
+    async def nearest_alternatives(
+        self,
+        date: str,
+        time: str,
+        num_people: int,
+        preferences: str = "",
+        k: int = 3,
+    ) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self.repository.nearest_alternatives, date, time, num_people, preferences, k)
+
+    async def service_report(self, date: str) -> dict[str, dict[str, Any]]:
+        return await asyncio.to_thread(self.repository.service_report, date)
+
+    async def create_reservation(self, payload: dict[str, Any]) -> tuple[bool, str, dict[str, Any] | None]:
+        return await asyncio.to_thread(self.repository.create_reservation, payload)
+
+    async def update_reservation(
+        self,
+        reservation_id: str,
+        updates: dict[str, Any],
+    ) -> tuple[bool, str, dict[str, Any] | None]:
+        return await asyncio.to_thread(self.repository.update_reservation, reservation_id, updates)
+
+    async def cancel_reservation(self, reservation_id: str) -> tuple[bool, str, dict[str, Any] | None]:
+        return await asyncio.to_thread(self.repository.cancel_reservation, reservation_id)
+
+    async def query_reservations_by_date(self, date: str) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self.repository.query_reservations_by_date, date)
+
+    async def query_reservations_by_status(self, status: str) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self.repository.query_reservations_by_status, status)
+
+    async def scan_all_reservations(self) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self.repository.scan_all_reservations)
+
+    async def count_reservations_by_status(self) -> dict[str, int]:
+        return await asyncio.to_thread(self.repository.count_reservations_by_status)
+
+    async def list_reservations(
+        self,
+        *,
+        date: str = "",
+        status: str = "all",
+        customer_name: str = "",
+        phone: str = "",
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(
+            lambda: self.repository.list_reservations(
+                date=date, status=status, customer_name=customer_name, phone=phone, limit=limit
+            )
+        )
+
+
+def build_async_repository() -> AsyncReservationRepository | ThreadedReservationRepository:
+    if settings.reservation_backend == "sqlite":
+        return ThreadedReservationRepository(get_reservation_repository())
+    return AsyncReservationRepository(get_reservation_repository(), build_async_client())
+
+
+_async_repository: AsyncReservationRepository | ThreadedReservationRepository | None = None
+_async_repository_lock = threading.Lock()
+
+
+def get_async_reservation_repository() -> AsyncReservationRepository | ThreadedReservationRepository:
+    """Process-wide async repository, built on first use (see ``get_reservation_repository``)."""
+    global _async_repository
+    if _async_repository is None:
+        with _async_repository_lock:
+            if _async_repository is None:
+                _async_repository = build_async_repository()
+    return _async_repository
+
+
+async def close_async_reservation_repository() -> None:
+    """Close the async client if the repository was ever built with one."""
+    if _async_repository is not None and _async_repository.client is not None:
+        await _async_repository.client.close()
@@ -0,0 +1,121 @@
+"""In-memory slot occupancy index used for table allocation and availability."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Iterable
+
+from app.config import settings
+
+SLOT_MINUTES = settings.slot_minutes
+if SLOT_MINUTES < 1 or 30 % SLOT_MINUTES:
+    raise ValueError("SLOT_MINUTES debe dividir 30 (por ejemplo 15 o 30)")
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+
+def slot_index(time: str) -> int:
+    """Convert an ``HH:MM`` string to its slot index within the day."""
+    hours, minutes = time.split(":", 1)
+    return (int(hours) * 60 + int(minutes)) // SLOT_MINUTES
+
+
+def slot_time(index: int) -> str:
+    """Convert a slot index (modulo one day) back to ``HH:MM``."""
+    minutes = (index % SLOTS_PER_DAY) * SLOT_MINUTES
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def slot_count(duration_minutes: int) -> int:
+    return max(1, (duration_minutes + SLOT_MINUTES - 1) // SLOT_MINUTES)
+
+
+def span_mask(start: int, count: int) -> int:
+    """Bitmask with ``count`` consecutive slots set starting at ``start``."""
+    return ((1 << count) - 1) << start
+
+
+def slot_keys(date: str, time: str, duration_minutes: int) -> list[str]:
+    """``<date>#<HH:MM>`` keys of every slot a booking holds, rolling past midnight."""
+    start = slot_index(time)
+    following = ""
+    keys = []
+    for index in range(start, start + slot_count(duration_minutes)):
+        if index < SLOTS_PER_DAY:
+            keys.append(f"{date}#{slot_time(index)}")
+            continue
+        following = following or next_date(date)
+        keys.append(f"{following}#{slot_time(index)}")
+    return keys
+
+
+def table_members(table_id: str) -> list[str]:
+    """Physical tables behind a table id (combinations are joined with ``+``)."""
+    return table_id.split("+")
+
+
+def next_date(date: str) -> str:
+    return (datetime.strptime(date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+class DayOccupancy:
+    """Per-table slot bitmasks for one service date.
+
+    Bits ``0..SLOTS_PER_DAY-1`` are the slots of ``date`` and the following
+    ``SLOTS_PER_DAY`` bits are the slots of the next day, so reservations that
+    run past midnight are checked against a single integer per table.
+    """
+
+    def __init__(self, date: str) -> None:
+        self.date = date
+        self.next_date = next_date(date)
+        self._masks: dict[str, int] = {}
+        self._owned: dict[str, dict[str, int]] = {}
+
+    def bit(self, slot_date: str, time: str) -> int | None:
+        if slot_date == self.date:
+            return slot_index(time)
+        if slot_date == self.next_date:
+            return SLOTS_PER_DAY + slot_index(time)
+        return None
+
+    def add(self, table_id: str, slot_date: str, time: str, reservation_id: str = "") -> None:
+        index = self.bit(slot_date, time)
+        if index is None:
+            return
+        bit = 1 << index
+        self._masks[table_id] = self._masks.get(table_id, 0) | bit
+        if reservation_id:
+            owned = self._owned.setdefault(reservation_id, {})
+            owned[table_id] = owned.get(table_id, 0) | bit
+
+    def add_slot_key(self, table_id: str, slot_key: str, reservation_id: str = "") -> None:
+        slot_date, time = slot_key.split("#", 1)
+        self.add(table_id, slot_date, time, reservation_id)
+
+    def request_mask(self, time: str, duration_minutes: int) -> int:
+        return span_mask(slot_index(time), slot_count(duration_minutes))
+
+    def table_mask(self, table_id: str, exclude_reservation: str | None = None) -> int:
+        owned = self._owned.get(exclude_reservation, {}) if exclude_reservation else {}
+        mask = 0
+        for member in table_members(table_id):
+            mask |= self._masks.get(member, 0) & ~owned.get(member, 0)
+        return mask
+
+    def owned(self, reservation_id: str) -> dict[str, int]:
+        """Slot masks held by one reservation, by table."""
+        return dict(self._owned.get(reservation_id, {}))
+
+    def is_free(self, table_id: str, mask: int, exclude_reservation: str | None = None) -> bool:
+        return not self.table_mask(table_id, exclude_reservation) & mask
+
+    def first_free(
+        self,
+        tables: Iterable[dict[str, Any]],
+        mask: int,
+        exclude_reservation: str | None = None,
+    ) -> dict[str, Any] | None:
+        for table in tables:
+            if self.is_free(table["table_id"], mask, exclude_reservation):
+                return table
+        return None
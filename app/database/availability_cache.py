@@ -0,0 +1,85 @@
+"""Bounded process-wide cache for availability answers."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+CacheKey = tuple[str, int, str]
+
+
+class AvailabilityCache:
+    """LRU cache of ``available_times`` results keyed by (date, party size, zone).
+
+    Local writes invalidate every entry of the dates they touch and bump a
+    per-date generation, so an answer computed from a read that raced with a
+    write is never stored. Entries also expire after ``ttl_seconds`` so writes
+    made by other workers are picked up.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[CacheKey, tuple[float, list[dict[str, Any]]]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: CacheKey) -> list[dict[str, Any]] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] >= self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self, date: str) -> int:
+        with self._lock:
+            return self._generations.get(date, 0)
+
+    def put(self, key: CacheKey, value: list[dict[str, Any]], generation: int) -> None:
+        """Store ``value`` unless ``key``'s date was invalidated since ``generation``."""
+        if self.max_entries < 1:
+            return
+        with self._lock:
+            if self._generations.get(key[0], 0) != generation:
+                return
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_dates(self, dates: set[str]) -> None:
+        with self._lock:
+            for date in dates:
+                self._generations[date] = self._generations.get(date, 0) + 1
+            stale = [key for key in self._entries if key[0] in dates]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
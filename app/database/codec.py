@@ -0,0 +1,138 @@
+"""DynamoDB attribute-value (de)serialization for the low-level clients.
+
+Same wire format and Python types as boto3's ``TypeSerializer`` /
+``TypeDeserializer`` (numbers come back as ``Decimal``, sets as ``set``,
+binary as ``Binary``), but dispatches on the exact type first instead of
+walking a chain of ``isinstance`` checks for every attribute.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Set
+from decimal import Decimal
+from typing import Any, Callable
+
+from boto3.dynamodb.conditions import ConditionBase, ConditionExpressionBuilder
+from boto3.dynamodb.types import Binary
+
+# Request fields holding attribute values (as opposed to expression strings).
+VALUE_FIELDS = frozenset({"Item", "Key", "ExpressionAttributeValues", "ExclusiveStartKey"})
+
+
+def _serialize_set(value: Set[Any]) -> dict[str, Any]:
+    if not value:
+        raise TypeError("Empty sets are not supported by DynamoDB")
+    sample = next(iter(value))
+    if isinstance(sample, str):
+        return {"SS": list(value)}
+    if isinstance(sample, (bytes, bytearray, Binary)):
+        return {"BS": [bytes(member) for member in value]}
+    if isinstance(sample, (int, Decimal)) and not isinstance(sample, bool):
+        return {"NS": [str(member) for member in value]}
+    raise TypeError(f"Unsupported set member type: {type(sample).__name__}")
+
+
+def _serialize_float(value: float) -> dict[str, Any]:
+    raise TypeError("Float types are not supported. Use Decimal types instead.")
+
+
+_SERIALIZERS: dict[type, Callable[[Any], dict[str, Any]]] = {
+    str: lambda value: {"S": value},
+    bool: lambda value: {"BOOL": value},
+    int: lambda value: {"N": str(value)},
+    Decimal: lambda value: {"N": str(value)},
+    float: _serialize_float,
+    type(None): lambda value: {"NULL": True},
+    bytes: lambda value: {"B": value},
+    bytearray: lambda value: {"B": bytes(value)},
+    Binary: lambda value: {"B": value.value},
+    dict: lambda value: {"M": serialize_item(value)},
+    list: lambda value: {"L": [serialize_value(member) for member in value]},
+    tuple: lambda value: {"L": [serialize_value(member) for member in value]},
+    set: _serialize_set,
+    frozenset: _serialize_set,
+}
+
+
+def serialize_value(value: Any) -> dict[str, Any]:
+    serializer = _SERIALIZERS.get(type(value))
+    if serializer is not None:
+        return serializer(value)
+    # Subclasses (Enum-like str/int, OrderedDict, ...) take the slow path.
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, str):
+        return {"S": str(value)}
+    if isinstance(value, (int, Decimal)):
+        return {"N": str(value)}
+    if isinstance(value, Mapping):
+        return {"M": serialize_item(value)}
+    if isinstance(value, Set):
+        return _serialize_set(value)
+    if isinstance(value, (list, tuple)):
+        return {"L": [serialize_value(member) for member in value]}
+    raise TypeError(f"Unsupported type for DynamoDB: {type(value).__name__}")
+
+
+def serialize_item(item: Mapping[str, Any]) -> dict[str, Any]:
+    return {name: serialize_value(value) for name, value in item.items()}
+
+
+_DESERIALIZERS: dict[str, Callable[[Any], Any]] = {
+    "S": lambda value: value,
+    "N": Decimal,
+    "BOOL": lambda value: value,
+    "NULL": lambda value: None,
+    "B": Binary,
+    "SS": set,
+    "NS": lambda value: {Decimal(member) for member in value},
+    "BS": lambda value: {Binary(member) for member in value},
+    "L": lambda value: [deserialize_value(member) for member in value],
+    "M": lambda value: deserialize_item(value),
+}
+
+
+def deserialize_value(value: dict[str, Any]) -> Any:
+    (kind, payload), = value.items()
+    return _DESERIALIZERS[kind](payload)
+
+
+def deserialize_item(item: Mapping[str, Any]) -> dict[str, Any]:
+    return {name: deserialize_value(value) for name, value in item.items()}
+
+
+def build_request(table_name: str | None, params: Mapping[str, Any]) -> dict[str, Any]:
+    """Low-level request from resource-style parameters.
+
+    ``Key``/``Attr`` conditions become expression strings with their
+    placeholders, attribute values are serialized and ``None`` parameters are
+    dropped, which is what the boto3 resource layer does on every call.
+    """
+    request: dict[str, Any] = {"TableName": table_name} if table_name else {}
+    names: dict[str, str] = {}
+    values: dict[str, Any] = {}
+    builder: ConditionExpressionBuilder | None = None
+
+    for name, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, ConditionBase):
+            builder = builder or ConditionExpressionBuilder()
+            expression = builder.build_expression(value, is_key_condition=name == "KeyConditionExpression")
+            names.update(expression.attribute_name_placeholders)
+            values.update(expression.attribute_value_placeholders)
+            request[name] = expression.condition_expression
+        elif name == "ExpressionAttributeNames":
+            names.update(value)
+        elif name == "ExpressionAttributeValues":
+            values.update(value)
+        elif name in VALUE_FIELDS:
+            request[name] = serialize_item(value)
+        else:
+            request[name] = value
+
+    if names:
+        request["ExpressionAttributeNames"] = names
+    if values:
+        request["ExpressionAttributeValues"] = serialize_item(values)
+    return request
@@ -0,0 +1,53 @@
+"""Cross-checks between reservations and the rows derived from them (claims, summary, pacing)."""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+from app.database import pacing
+from app.database.reservation_repository import BaseReservationRepository
+
+
+def check_consistency(repository: BaseReservationRepository, date: str, reservations: list[dict[str, Any]]) -> list[str]:
+    """Problems found comparing the stored state of ``date`` with ``reservations``, its only bookings.
+
+    Every slot an active reservation holds must be claimed by it, no other
+    reservation may hold a claim on ``date``, the availability summary must
+    match the claims and, when a pacing rule applies, the counters must add
+    up to the reservations' covers. An empty list means all is consistent.
+    """
+    problems: list[str] = []
+    expected_claims = {
+        claim: reservation["id"] for reservation in reservations for claim in repository.slot_claims(reservation)
+    }
+    claim_dates = {date} | {slot_key.split("#", 1)[0] for _, slot_key in expected_claims}
+    owners = {claim: owner for day in sorted(claim_dates) for claim, owner in repository.slot_owners(day).items()}
+
+    for (table_id, slot_key), reservation_id in sorted(expected_claims.items()):
+        owner = owners.get((table_id, slot_key))
+        if owner != reservation_id:
+            problems.append(f"{slot_key} {table_id}: esperado {reservation_id}, encontrado {owner}")
+
+    reservation_ids = {reservation["id"] for reservation in reservations}
+    day_claims = {claim: owner for claim, owner in owners.items() if claim[1].startswith(f"{date}#")}
+    for (table_id, slot_key), owner in sorted(day_claims.items()):
+        if owner not in reservation_ids:
+            problems.append(f"{slot_key} {table_id}: ocupado por {owner}, que no es una reserva creada")
+
+    summary = repository.availability_summary(date)
+    occupied = {f"{slot_key.split('#', 1)[1]}#{table_id}" for table_id, slot_key in day_claims}
+    if summary != occupied:
+        problems.append(f"resumen {date}: {len(summary)} entradas, {len(occupied)} en la ocupación")
+
+    if pacing.rule_for(date) is not None:
+        expected: Counter[str] = Counter()
+        for reservation in reservations:
+            if reservation["date"] == date and repository.slot_claims(reservation):
+                expected.update(pacing.covers_by_attribute(reservation["time"], int(reservation["num_people"])))
+        stored = repository.pacing_counters(date)
+        for attribute in sorted(set(expected) | set(stored)):
+            covers = stored.get(attribute, 0)
+            if covers != expected[attribute]:
+                problems.append(f"ritmo {attribute}: {covers} guardados, {expected[attribute]} esperados")
+    return problems
@@ -3,18 +3,386 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Callable, Iterator
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from app.config import settings
+from app.database.codec import build_request, deserialize_item, serialize_item
+from app.database.identity_map import current_identity_map
+from app.database.memory_dynamodb import InMemoryDynamoDB
+from app.database.usage import UsageReport, observe
 
 logger = logging.getLogger(__name__)
 
+BATCH_GET_MAX_KEYS = 100
+BATCH_GET_MAX_RETRIES = 5
+BATCH_GET_BACKOFF_SECONDS = 0.05
+BATCH_WRITE_MAX_ITEMS = 25
+TRANSACT_WRITE_MAX_ITEMS = 100
+_SEGMENT_DONE = object()
 
-class DynamoDBClient:
-    """Thin wrapper around boto3 DynamoDB table operations."""
+
+def _error_code(exc: ClientError) -> str:
+    return exc.response.get("Error", {}).get("Code", "")
+
+
+def client_config_options() -> dict[str, Any]:
+    """botocore ``Config`` options shared by the blocking and asyncio clients."""
+    return {
+        "max_pool_connections": settings.dynamodb_max_pool_connections,
+        "connect_timeout": settings.dynamodb_connect_timeout_seconds,
+        "read_timeout": settings.dynamodb_read_timeout_seconds,
+        "tcp_keepalive": settings.dynamodb_tcp_keepalive,
+        "retries": {"mode": settings.dynamodb_retry_mode, "max_attempts": settings.dynamodb_max_attempts},
+    }
+
+
+def with_capacity_request(request: dict[str, Any]) -> dict[str, Any]:
+    """Ask DynamoDB to report consumed capacity, unless ``DYNAMODB_CONSUMED_CAPACITY=NONE``."""
+    if settings.dynamodb_consumed_capacity == "NONE":
+        return request
+    return {**request, "ReturnConsumedCapacity": settings.dynamodb_consumed_capacity}
+
+
+class TransportStats:
+    """Connection-pool pressure and SDK retries seen by one client.
+
+    ``pool_saturated`` counts requests started while every pooled connection
+    was already busy; urllib3 then opens (and afterwards drops) an extra
+    connection, paying a fresh TLS handshake. ``retries`` sums the attempts
+    botocore's retry policy made beyond the first one.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.in_flight_peak = 0
+        self.pool_saturated = 0
+        self.retries = 0
+
+    def started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.in_flight_peak = max(self.in_flight_peak, self.in_flight)
+            if self.in_flight > settings.dynamodb_max_pool_connections:
+                self.pool_saturated += 1
+
+    def finished(self, metadata: dict[str, Any]) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.retries += int(metadata.get("RetryAttempts", 0))
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_pool_connections": settings.dynamodb_max_pool_connections,
+                "retry_mode": settings.dynamodb_retry_mode,
+                "in_flight": self.in_flight,
+                "in_flight_peak": self.in_flight_peak,
+                "pool_saturated": self.pool_saturated,
+                "retries": self.retries,
+            }
+
+
+class PageCursor:
+    """Paging state of one query or scan, shared by the blocking and asyncio streams.
+
+    ``max_items`` stops after that many items; the last page's ``Limit`` is
+    cut so it ends exactly there, which keeps ``last_evaluated_key`` an exact
+    resume point: pass it as ``start_key`` to continue where the stream
+    stopped. It is ``None`` once the query is exhausted. A failed page is
+    logged and ends the stream with ``failed`` set.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[..., Any],
+        operation: str,
+        request: dict[str, Any],
+        *,
+        max_items: int | None = None,
+        start_key: dict[str, Any] | None = None,
+    ) -> None:
+        self._fetch = fetch
+        self.operation = operation
+        self._request = request
+        self._page_size: int | None = request.get("Limit")
+        self._remaining = max_items
+        self._exhausted = False
+        self.last_evaluated_key = start_key
+        self.failed = False
+
+    def _next_request(self) -> dict[str, Any] | None:
+        if self._exhausted or (self._remaining is not None and self._remaining <= 0):
+            return None
+        request = dict(self._request)
+        if self._remaining is not None:
+            request["Limit"] = min(self._remaining, self._page_size or self._remaining)
+        return request
+
+    def _page(self, response: dict[str, Any]) -> list[dict[str, Any]]:
+        items = [deserialize_item(item) for item in response.get("Items", [])]
+        next_key = response.get("LastEvaluatedKey")
+        if next_key:
+            self._request["ExclusiveStartKey"] = next_key
+            self.last_evaluated_key = deserialize_item(next_key)
+        else:
+            self._exhausted = True
+            self.last_evaluated_key = None
+        if self._remaining is not None:
+            self._remaining -= len(items)
+        return items
+
+    def _fail(self, exc: Exception) -> None:
+        logger.error("DynamoDB %s failed: %s", self.operation, str(exc))
+        self._exhausted = True
+        self.failed = True
+
+
+class ItemStream(PageCursor):
+    """Items of a query or scan, fetched one page at a time as they are consumed."""
+
+    def pages(self) -> Iterator[list[dict[str, Any]]]:
+        while (request := self._next_request()) is not None:
+            try:
+                response = self._fetch(self.operation, **request)
+            except Exception as exc:  # noqa: BLE001
+                self._fail(exc)
+                return
+            yield self._page(response)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for page in self.pages():
+            yield from page
+
+
+class ParallelScan:
+    """Segmented scan: ``TotalSegments`` streams read concurrently, pages merged as they arrive.
+
+    Each segment runs in its own worker thread (with the caller's context,
+    so ``track_usage`` scopes include it). The hand-off queue is bounded, so
+    a slow consumer holds back the workers instead of buffering the table;
+    stopping early makes them finish after their current page. Page order
+    across segments is arbitrary.
+    """
+
+    def __init__(self, streams: list[ItemStream]) -> None:
+        self.streams = streams
+        self._pages: queue.Queue[Any] = queue.Queue(maxsize=2 * len(streams))
+        self._stop = threading.Event()
+
+    @property
+    def failed(self) -> bool:
+        return any(stream.failed for stream in self.streams)
+
+    def _offer(self, value: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._pages.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, stream: ItemStream) -> None:
+        # The consumer waits for one marker per segment, whatever ends the segment.
+        try:
+            for page in stream.pages():
+                if not self._offer(page):
+                    return
+        except Exception as exc:  # noqa: BLE001
+            stream._fail(exc)
+        finally:
+            self._offer(_SEGMENT_DONE)
+
+    def pages(self) -> Iterator[list[dict[str, Any]]]:
+        executor = ThreadPoolExecutor(max_workers=len(self.streams), thread_name_prefix="dynamodb-scan")
+        for stream in self.streams:
+            executor.submit(copy_context().run, self._produce, stream)
+        remaining = len(self.streams)
+        try:
+            while remaining:
+                page = self._pages.get()
+                if page is _SEGMENT_DONE:
+                    remaining -= 1
+                    continue
+                yield page
+        finally:
+            self._stop.set()
+            executor.shutdown(wait=True)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for page in self.pages():
+            yield from page
+
+
+class DynamoDBRequests:
+    """Request building and response handling shared by the blocking and asyncio clients.
+
+    Subclasses only send what these methods build and hand back the response
+    (or the error raised); the identity map bookkeeping happens here too.
+    """
+
+    table_name: str
+
+    @staticmethod
+    def _put_params(
+        item: dict[str, Any],
+        condition_expression: str | None,
+        expression_attribute_values: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        return {
+            "Item": item,
+            "ConditionExpression": condition_expression,
+            "ExpressionAttributeValues": expression_attribute_values,
+        }
+
+    @staticmethod
+    def _delete_params(
+        key: dict[str, Any],
+        condition_expression: str | None,
+        expression_attribute_values: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        return {
+            "Key": key,
+            "ConditionExpression": condition_expression,
+            "ExpressionAttributeValues": expression_attribute_values,
+        }
+
+    @staticmethod
+    def _update_params(
+        key: dict[str, Any],
+        update_expression: str,
+        condition_expression: str | None,
+        expression_attribute_names: dict[str, str] | None,
+        expression_attribute_values: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        return {
+            "Key": key,
+            "UpdateExpression": update_expression,
+            "ConditionExpression": condition_expression,
+            "ExpressionAttributeNames": expression_attribute_names,
+            "ExpressionAttributeValues": expression_attribute_values,
+        }
+
+    def _write_failed(self, operation: str, exc: Exception) -> bool:
+        """Log a failed write, except the condition failures optimistic writes expect; always ``False``."""
+        if not (isinstance(exc, ClientError) and _error_code(exc) == "ConditionalCheckFailedException"):
+            logger.error("DynamoDB %s failed: %s", operation, str(exc))
+        return False
+
+    def _record_write(self, operation: str, params: dict[str, Any], succeeded: bool) -> bool:
+        identity_map = current_identity_map()
+        if identity_map is not None:
+            identity_map.record_write(operation, params, succeeded)
+        return succeeded
+
+    def _known_item(self, key: dict[str, Any]) -> tuple[bool, dict[str, Any] | None]:
+        """The item as this turn's identity map knows it, ``(False, None)`` if a read is needed."""
+        identity_map = current_identity_map()
+        return identity_map.lookup(key) if identity_map is not None else (False, None)
+
+    def _read_item(self, key: dict[str, Any], response: dict[str, Any]) -> dict[str, Any] | None:
+        item = response.get("Item")
+        result = deserialize_item(item) if item else None
+        identity_map = current_identity_map()
+        if identity_map is not None:
+            identity_map.store(key, result)
+        return result
+
+    def _batch_get_chunks(self, keys: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], list[list[dict[str, Any]]]]:
+        """Items already known this turn and the remaining unique keys, in chunks of 100."""
+        unique_keys = list({tuple(sorted(key.items())): key for key in keys}.values())
+        known: list[dict[str, Any]] = []
+        identity_map = current_identity_map()
+        if identity_map is not None:
+            known, unique_keys = identity_map.lookup_many(unique_keys)
+        chunks = [
+            unique_keys[start:start + BATCH_GET_MAX_KEYS] for start in range(0, len(unique_keys), BATCH_GET_MAX_KEYS)
+        ]
+        return known, chunks
+
+    def _batch_get_request(self, keys: list[dict[str, Any]], consistent_read: bool) -> dict[str, Any]:
+        return {self.table_name: {"Keys": [serialize_item(key) for key in keys], "ConsistentRead": consistent_read}}
+
+    def _batch_get_page(
+        self,
+        keys: list[dict[str, Any]],
+        found: list[dict[str, Any]],
+        response: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Add a response's items to ``found``; returns the unprocessed request (empty once ``keys`` are done)."""
+        found.extend(deserialize_item(item) for item in response.get("Responses", {}).get(self.table_name, []))
+        unprocessed = response.get("UnprocessedKeys") or {}
+        if not unprocessed:
+            identity_map = current_identity_map()
+            if identity_map is not None:
+                identity_map.store_batch(keys, found)
+        return unprocessed
+
+    def _retry_delay(self, operation: str, attempt: int, unprocessed: int, *, strict: bool = False) -> float | None:
+        """Backoff before retrying unprocessed keys or items, ``None`` (logged, or raised if ``strict``) once spent."""
+        if attempt <= BATCH_GET_MAX_RETRIES:
+            return BATCH_GET_BACKOFF_SECONDS * (2 ** (attempt - 1))
+        noun = "keys" if operation == "batch_get_item" else "items"
+        message = f"DynamoDB {operation} gave up with {unprocessed} unprocessed {noun}"
+        if strict:
+            raise RuntimeError(message)
+        logger.error(message)
+        return None
+
+    def _transaction_request(self, actions: list[dict[str, Any]]) -> dict[str, Any] | None:
+        """``TransactWriteItems`` parameters, or ``None`` (logged) above the 100-action limit."""
+        if len(actions) > TRANSACT_WRITE_MAX_ITEMS:
+            logger.error(
+                "DynamoDB transact_write_items got %s actions (max %s)", len(actions), TRANSACT_WRITE_MAX_ITEMS
+            )
+            return None
+        items = []
+        for action in actions:
+            operation, params = next(iter(action.items()))
+            items.append({operation: build_request(self.table_name, params)})
+        return {"TransactItems": items}
+
+    def _transaction_failed(self, exc: Exception) -> tuple[bool, list[str]]:
+        """Cancellation reason codes of a cancelled transaction; other errors are logged."""
+        if isinstance(exc, ClientError) and _error_code(exc) == "TransactionCanceledException":
+            reasons = exc.response.get("CancellationReasons", [])
+            return False, [str(reason.get("Code", "None")) for reason in reasons]
+        logger.error("DynamoDB transact_write_items failed: %s", str(exc))
+        return False, []
+
+    def _record_transaction(self, actions: list[dict[str, Any]], committed: bool) -> None:
+        identity_map = current_identity_map()
+        if identity_map is not None:
+            identity_map.record_transaction(actions, committed)
+
+    def _stream_request(self, kwargs: dict[str, Any], start_key: dict[str, Any] | None) -> dict[str, Any]:
+        return build_request(self.table_name, {**kwargs, "ExclusiveStartKey": start_key})
+
+    def _segment_requests(self, segments: int | None, kwargs: dict[str, Any]) -> list[dict[str, Any]]:
+        """Scan parameters of each segment; ``segments`` defaults to ``DYNAMODB_SCAN_SEGMENTS``."""
+        total = max(1, segments or settings.dynamodb_scan_segments)
+        return [{**kwargs, "Segment": segment, "TotalSegments": total} for segment in range(total)]
+
+
+class DynamoDBClient(DynamoDBRequests):
+    """Thin wrapper around the low-level boto3 DynamoDB client.
+
+    A single botocore client is shared by every thread: unlike boto3
+    resources it is thread-safe. Pool size, timeouts, keep-alive and retry
+    policy come from the ``DYNAMODB_*`` settings (``client_config_options``).
+    Items go in and come out as plain Python values (``Decimal`` numbers,
+    ``set`` for sets), serialized by ``codec``.
+    """
 
     def __init__(self) -> None:
         session_kwargs: dict[str, str] = {
@@ -25,17 +393,69 @@ class DynamoDBClient:
         if settings.aws_session_token:
             session_kwargs["aws_session_token"] = settings.aws_session_token
 
-        self.resource = boto3.resource("dynamodb", **session_kwargs)
-        self.table = self.resource.Table(settings.dynamodb_table_name)
-        logger.info("DynamoDB client ready for table: %s", settings.dynamodb_table_name)
+        if settings.dynamodb_backend == "memory":
+            self.client = InMemoryDynamoDB(
+                settings.dynamodb_table_name,
+                latency_ms=settings.dynamodb_memory_latency_ms,
+            )
+        else:
+            self.client = boto3.session.Session(**session_kwargs).client(
+                "dynamodb",
+                endpoint_url=settings.dynamodb_endpoint_url or None,
+                config=Config(**client_config_options()),
+            )
+        self.table_name = settings.dynamodb_table_name
+        self.usage = UsageReport()
+        self.transport = TransportStats()
+        logger.info(
+            "DynamoDB client ready for table: %s (backend: %s)",
+            settings.dynamodb_table_name,
+            settings.dynamodb_backend,
+        )
+
+    def call_stats(self) -> dict[str, Any]:
+        """Calls, items, latency and consumed RCU/WCU since start, in total and per operation."""
+        return self.usage.as_dict()
+
+    def transport_stats(self) -> dict[str, Any]:
+        return self.transport.snapshot()
+
+    def _call(self, operation: str, **request: Any) -> dict[str, Any]:
+        request = with_capacity_request(request)
+        self.transport.started()
+        metadata: dict[str, Any] = {}
+        response: dict[str, Any] | None = None
+        started = time.perf_counter()
+        try:
+            response = getattr(self.client, operation)(**request)
+            metadata = response.get("ResponseMetadata", {})
+            return response
+        except ClientError as exc:
+            metadata = exc.response.get("ResponseMetadata", {})
+            raise
+        finally:
+            self.transport.finished(metadata)
+            observe(self.usage, operation, request, response, time.perf_counter() - started)
 
     def get_item(self, key: dict[str, Any]) -> dict[str, Any] | None:
+        """Read one item; inside ``turn_identity_map()`` repeated reads are served from memory."""
+        known, cached = self._known_item(key)
+        if known:
+            return cached
         try:
-            response = self.table.get_item(Key=key)
-            return response.get("Item")
+            response = self._call("get_item", TableName=self.table_name, Key=serialize_item(key))
         except Exception as exc:  # noqa: BLE001
             logger.error("DynamoDB get_item failed: %s", str(exc))
             return None
+        return self._read_item(key, response)
+
+    def _write(self, operation: str, params: dict[str, Any]) -> bool:
+        try:
+            self._call(operation, **build_request(self.table_name, params))
+            succeeded = True
+        except Exception as exc:  # noqa: BLE001
+            succeeded = self._write_failed(operation, exc)
+        return self._record_write(operation, params, succeeded)
 
     def put_item(
         self,
@@ -44,25 +464,7 @@ class DynamoDBClient:
         condition_expression: str | None = None,
         expression_attribute_values: dict[str, Any] | None = None,
     ) -> bool:
-        kwargs: dict[str, Any] = {"Item": item}
-        if condition_expression:
-            kwargs["ConditionExpression"] = condition_expression
-        if expression_attribute_values:
-            kwargs["ExpressionAttributeValues"] = expression_attribute_values
-
-        try:
-            self.table.put_item(**kwargs)
-            return True
-        except ClientError as exc:
-            code = exc.response.get("Error", {}).get("Code", "")
-            if code == "ConditionalCheckFailedException":
-                # Expected in optimistic writes (e.g. slot already taken).
-                return False
-            logger.error("DynamoDB put_item failed: %s", str(exc))
-            return False
-        except Exception as exc:  # noqa: BLE001
-            logger.error("DynamoDB put_item failed: %s", str(exc))
-            return False
+        return self._write("put_item", self._put_params(item, condition_expression, expression_attribute_values))
 
     def delete_item(
         self,
@@ -71,54 +473,188 @@ class DynamoDBClient:
         condition_expression: str | None = None,
         expression_attribute_values: dict[str, Any] | None = None,
     ) -> bool:
-        kwargs: dict[str, Any] = {"Key": key}
-        if condition_expression:
-            kwargs["ConditionExpression"] = condition_expression
-        if expression_attribute_values:
-            kwargs["ExpressionAttributeValues"] = expression_attribute_values
+        return self._write("delete_item", self._delete_params(key, condition_expression, expression_attribute_values))
+
+    def update_item(
+        self,
+        key: dict[str, Any],
+        *,
+        update_expression: str,
+        condition_expression: str | None = None,
+        expression_attribute_names: dict[str, str] | None = None,
+        expression_attribute_values: dict[str, Any] | None = None,
+    ) -> bool:
+        return self._write(
+            "update_item",
+            self._update_params(
+                key, update_expression, condition_expression, expression_attribute_names, expression_attribute_values
+            ),
+        )
+
+    def batch_get_items(
+        self,
+        keys: list[dict[str, Any]],
+        *,
+        consistent_read: bool = False,
+        strict: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Fetch many items, chunking by 100 keys and retrying unprocessed keys.
+
+        Missing items are simply absent from the result; order is not preserved.
+        Inside ``turn_identity_map()`` only the keys not yet known are requested.
+        Errors are logged and yield a partial result, unless ``strict`` is set,
+        in which case they are raised (callers that act on absence need that).
+        """
+        items, chunks = self._batch_get_chunks(keys)
+        for chunk in chunks:
+            items.extend(self._batch_get_chunk(chunk, consistent_read, strict))
+        return items
 
+    def _batch_get_chunk(self, keys: list[dict[str, Any]], consistent_read: bool, strict: bool) -> list[dict[str, Any]]:
+        request = self._batch_get_request(keys, consistent_read)
+        found: list[dict[str, Any]] = []
+        attempt = 0
         try:
-            self.table.delete_item(**kwargs)
-            return True
-        except ClientError as exc:
-            code = exc.response.get("Error", {}).get("Code", "")
-            if code == "ConditionalCheckFailedException":
-                # Expected when conditional delete does not match.
-                return False
-            logger.error("DynamoDB delete_item failed: %s", str(exc))
-            return False
+            while True:
+                response = self._call("batch_get_item", RequestItems=request)
+                request = self._batch_get_page(keys, found, response)
+                if not request:
+                    break
+                attempt += 1
+                unprocessed = len(request[self.table_name]["Keys"])
+                delay = self._retry_delay("batch_get_item", attempt, unprocessed, strict=strict)
+                if delay is None:
+                    break
+                time.sleep(delay)
         except Exception as exc:  # noqa: BLE001
-            logger.error("DynamoDB delete_item failed: %s", str(exc))
-            return False
+            if strict:
+                raise
+            logger.error("DynamoDB batch_get_item failed: %s", str(exc))
+        return found
 
-    def query(self, **kwargs: Any) -> list[dict[str, Any]]:
-        try:
-            response = self.table.query(**kwargs)
-            items = response.get("Items", [])
+    def batch_put_items(self, items: list[dict[str, Any]]) -> bool:
+        """Write many items unconditionally, 25 per request, retrying unprocessed ones.
 
-            while "LastEvaluatedKey" in response:
-                response = self.table.query(ExclusiveStartKey=response["LastEvaluatedKey"], **kwargs)
-                items.extend(response.get("Items", []))
+        Returns ``False`` if any item could not be written.
+        """
+        for start in range(0, len(items), BATCH_WRITE_MAX_ITEMS):
+            chunk = items[start:start + BATCH_WRITE_MAX_ITEMS]
+            request: dict[str, Any] = {
+                self.table_name: [{"PutRequest": {"Item": serialize_item(item)}} for item in chunk]
+            }
+            attempt = 0
+            written = False
+            try:
+                while request:
+                    response = self._call("batch_write_item", RequestItems=request)
+                    request = response.get("UnprocessedItems") or {}
+                    if not request:
+                        written = True
+                        break
+
+                    attempt += 1
+                    delay = self._retry_delay("batch_write_item", attempt, len(request[self.table_name]))
+                    if delay is None:
+                        return False
+                    time.sleep(delay)
+            except Exception as exc:  # noqa: BLE001
+                logger.error("DynamoDB batch_write_item failed: %s", str(exc))
+                return False
+            finally:
+                for item in chunk:
+                    self._record_write("put_item", {"Item": item}, written)
+        return True
 
-            return items
+    def transact_write(self, actions: list[dict[str, Any]]) -> tuple[bool, list[str]]:
+        """Apply ``Put``/``Update``/``Delete``/``ConditionCheck`` actions atomically.
+
+        Actions use the same shape as the table-level calls (plain Python
+        values, no table name), e.g. ``{"Put": {"Item": ..., "ConditionExpression": ...}}``.
+        Returns ``(True, [])`` on commit. When the transaction is cancelled it
+        returns ``(False, codes)`` with one cancellation reason code per action,
+        in order (``"None"`` for actions that did not cause it), so callers can
+        tell which condition failed; other errors return ``(False, [])``.
+        """
+        if not actions:
+            return True, []
+        request = self._transaction_request(actions)
+        if request is None:
+            return False, []
+        try:
+            self._call("transact_write_items", **request)
+            committed, reasons = True, []
         except Exception as exc:  # noqa: BLE001
-            logger.error("DynamoDB query failed: %s", str(exc))
-            return []
+            committed, reasons = self._transaction_failed(exc)
+        self._record_transaction(actions, committed)
+        return committed, reasons
+
+    def _stream(
+        self,
+        operation: str,
+        kwargs: dict[str, Any],
+        max_items: int | None,
+        start_key: dict[str, Any] | None,
+    ) -> ItemStream:
+        request = self._stream_request(kwargs, start_key)
+        return ItemStream(self._call, operation, request, max_items=max_items, start_key=start_key)
+
+    def iter_query(
+        self,
+        *,
+        max_items: int | None = None,
+        start_key: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> ItemStream:
+        """Stream a query page by page; ``kwargs`` are the usual Query parameters
+        (``KeyConditionExpression``, ``ProjectionExpression``, ``Limit`` as page size...)."""
+        return self._stream("query", kwargs, max_items, start_key)
+
+    def iter_scan(
+        self,
+        *,
+        max_items: int | None = None,
+        start_key: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> ItemStream:
+        """Stream a scan page by page; see ``iter_query``."""
+        return self._stream("scan", kwargs, max_items, start_key)
+
+    def parallel_scan(self, *, segments: int | None = None, **kwargs: Any) -> ParallelScan:
+        """Scan split into ``segments`` (default ``DYNAMODB_SCAN_SEGMENTS``) read in parallel.
+
+        Same parameters as ``iter_scan`` except ``max_items``/``start_key``,
+        which have no meaning across segments.
+        """
+        return ParallelScan(
+            [self._stream("scan", request, None, None) for request in self._segment_requests(segments, kwargs)]
+        )
+
+    def query(self, **kwargs: Any) -> list[dict[str, Any]]:
+        stream = self.iter_query(**kwargs)
+        items = list(stream)
+        return [] if stream.failed else items
 
     def scan(self, **kwargs: Any) -> list[dict[str, Any]]:
-        try:
-            response = self.table.scan(**kwargs)
-            items = response.get("Items", [])
+        stream = self.iter_scan(**kwargs)
+        items = list(stream)
+        return [] if stream.failed else items
 
-            while "LastEvaluatedKey" in response:
-                response = self.table.scan(ExclusiveStartKey=response["LastEvaluatedKey"], **kwargs)
-                items.extend(response.get("Items", []))
+    def scan_all(self, **kwargs: Any) -> list[dict[str, Any]]:
+        """``scan`` through ``parallel_scan``; ``[]`` if any segment failed."""
+        stream = self.parallel_scan(**kwargs)
+        items = list(stream)
+        return [] if stream.failed else items
 
-            return items
-        except Exception as exc:  # noqa: BLE001
-            logger.error("DynamoDB scan failed: %s", str(exc))
-            return []
+
+_db_client: DynamoDBClient | None = None
+_db_client_lock = threading.Lock()
 
 
-# Global singleton
-db_client = DynamoDBClient()
+def get_db_client() -> DynamoDBClient:
+    """Process-wide client, created on first use so importing this module does no I/O."""
+    global _db_client
+    if _db_client is None:
+        with _db_client_lock:
+            if _db_client is None:
+                _db_client = DynamoDBClient()
+    return _db_client
@@ -0,0 +1,134 @@
+"""Per-turn identity map: items read (or written) once are served from memory for the rest of the turn."""
+
+from __future__ import annotations
+
+import copy
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterable, Iterator
+
+from app.database.codec import deserialize_item, serialize_item
+
+# Write operations as named by the table-level calls and by transaction actions.
+_WRITE_KINDS = {
+    "put_item": "Put",
+    "delete_item": "Delete",
+    "update_item": "Update",
+    "Put": "Put",
+    "Delete": "Delete",
+    "Update": "Update",
+    "ConditionCheck": "ConditionCheck",
+}
+
+
+def item_key(key: dict[str, Any]) -> tuple[str, str]:
+    """Identity of an item (or of a key dict) in the single table."""
+    return str(key["PK"]), str(key["SK"])
+
+
+class IdentityMap:
+    """Items known in the current turn, keyed by ``(PK, SK)``.
+
+    ``None`` records an item known to be absent, so repeated misses do not go
+    back to DynamoDB either. Entries are copied in and out, so callers can
+    mutate what they get. Safe to use from several threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._items: dict[tuple[str, str], dict[str, Any] | None] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: dict[str, Any]) -> tuple[bool, dict[str, Any] | None]:
+        """``(True, item)`` when the item is known (``item`` may be ``None``), else ``(False, None)``."""
+        identity = item_key(key)
+        with self._lock:
+            if identity not in self._items:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            return True, copy.deepcopy(self._items[identity])
+
+    def store(self, key: dict[str, Any], item: dict[str, Any] | None) -> None:
+        with self._lock:
+            self._items[item_key(key)] = copy.deepcopy(item)
+
+    def lookup_many(self, keys: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Split a batch into ``(known items, keys still to fetch)``; known-absent keys yield nothing."""
+        items: list[dict[str, Any]] = []
+        missing: list[dict[str, Any]] = []
+        for key in keys:
+            known, item = self.lookup(key)
+            if not known:
+                missing.append(key)
+            elif item is not None:
+                items.append(item)
+        return items, missing
+
+    def store_batch(self, keys: list[dict[str, Any]], found: list[dict[str, Any]]) -> None:
+        """Record a fully processed batch: the items returned and the absence of the rest."""
+        returned = {item_key(item): item for item in found}
+        for key in keys:
+            self.store(key, returned.get(item_key(key)))
+
+    def forget(self, keys: Iterable[dict[str, Any]]) -> None:
+        with self._lock:
+            for key in keys:
+                self._items.pop(item_key(key), None)
+
+    def record_write(self, operation: str, params: dict[str, Any], succeeded: bool) -> None:
+        """Keep the map in line with a write made through the client.
+
+        A successful put stores the written item and a delete records the
+        absence; updates (whose result is not returned) and failed writes drop
+        the entry so the next read goes to the table.
+        """
+        key = params.get("Item") if "Item" in params else params.get("Key")
+        if not key:
+            return
+        kind = _WRITE_KINDS.get(operation)
+        if succeeded and kind == "Put":
+            # Round-trip through the codec so numbers come back as Decimal, as a read would return them.
+            self.store(key, deserialize_item(serialize_item(params["Item"])))
+        elif succeeded and kind == "Delete":
+            self.store(key, None)
+        elif not succeeded or kind == "Update":
+            self.forget([key])
+
+    def record_transaction(self, actions: list[dict[str, Any]], committed: bool) -> None:
+        for action in actions:
+            operation, params = next(iter(action.items()))
+            self.record_write(operation, params, committed)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "items": len(self._items)}
+
+
+_current_map: ContextVar[IdentityMap | None] = ContextVar("dynamodb_identity_map", default=None)
+
+
+def current_identity_map() -> IdentityMap | None:
+    return _current_map.get()
+
+
+@contextmanager
+def turn_identity_map() -> Iterator[IdentityMap]:
+    """Serve repeated reads of the same item from memory inside the block.
+
+    Reads made through ``DynamoDBClient`` fill the map and this turn's writes
+    update it; it is dropped when the block exits. A nested block reuses the
+    enclosing map. Threads and tasks started with a copy of the context share it.
+    """
+    existing = _current_map.get()
+    if existing is not None:
+        yield existing
+        return
+    identity_map = IdentityMap()
+    token = _current_map.set(identity_map)
+    try:
+        yield identity_map
+    finally:
+        _current_map.reset(token)
@@ -0,0 +1,1110 @@
+"""In-process DynamoDB stand-in for offline runs and benchmarks.
+
+``InMemoryDynamoDB`` answers the low-level client calls ``DynamoDBClient``
+makes (wire-format requests and responses, ``ClientError`` codes included),
+so everything above it, from serialization to pagination and usage
+accounting, runs unchanged. Select it with ``DYNAMODB_BACKEND=memory``.
+
+It models the reservations table: ``PK``/``SK`` string keys, the ``GSI1``
+(``GSI1PK``/``GSI1SK``) and ``StatusDateIndex`` (``status``/``date``)
+indexes with all attributes projected (sparse, like DynamoDB), condition,
+filter, key, projection and update expressions, Limit and 1 MB pages,
+segmented scans, batch writes, all-or-nothing transactions, consumed
+capacity estimates and ``ttl`` expiry. Every call is serialized by one
+lock, so reads are always strongly consistent. Reserved words in expressions are not rejected.
+``DYNAMODB_MEMORY_LATENCY_MS`` adds a simulated round trip to each call.
+"""
+
+from __future__ import annotations
+
+import bisect
+import copy
+import hashlib
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable
+
+from botocore.exceptions import ClientError
+
+PAGE_MAX_BYTES = 1024 * 1024
+BATCH_GET_MAX_KEYS = 100
+BATCH_WRITE_MAX_ITEMS = 25
+TRANSACT_MAX_ITEMS = 100
+TTL_ATTRIBUTE = "ttl"
+TTL_SWEEP_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class KeySchema:
+    hash_key: str
+    range_key: str | None = None
+
+
+TABLE_SCHEMA = KeySchema("PK", "SK")
+INDEX_SCHEMAS = {
+    "GSI1": KeySchema("GSI1PK", "GSI1SK"),
+    "StatusDateIndex": KeySchema("status", "date"),
+}
+
+
+def _error(operation: str, code: str, message: str, **extra: Any) -> ClientError:
+    response = {
+        "Error": {"Code": code, "Message": message},
+        "ResponseMetadata": {"HTTPStatusCode": 400, "RetryAttempts": 0},
+        **extra,
+    }
+    return ClientError(response, operation)
+
+
+class ExpressionError(ValueError):
+    """Malformed expression or missing placeholder (a ValidationException)."""
+
+
+# ---------------------------------------------------------------------------
+# Attribute values
+# ---------------------------------------------------------------------------
+
+
+def _type_of(value: dict[str, Any]) -> str:
+    return next(iter(value))
+
+
+def _number(value: dict[str, Any]) -> Decimal:
+    return Decimal(value["N"])
+
+
+def _sort_value(value: dict[str, Any]) -> tuple[str, Any]:
+    kind = _type_of(value)
+    if kind == "N":
+        return kind, _number(value)
+    if kind == "B":
+        return kind, bytes(value["B"])
+    return kind, value[kind]
+
+
+def _hashable(value: dict[str, Any]) -> tuple[str, Any]:
+    kind = _type_of(value)
+    payload = value[kind]
+    if kind == "N":
+        return kind, _number(value)
+    if kind in ("SS", "BS"):
+        return kind, frozenset(payload)
+    if kind == "NS":
+        return kind, frozenset(Decimal(member) for member in payload)
+    if kind in ("L", "M"):
+        return kind, repr(payload)
+    return kind, payload
+
+
+def _equal(left: dict[str, Any] | None, right: dict[str, Any] | None) -> bool:
+    if left is None or right is None:
+        return False
+    if _type_of(left) != _type_of(right):
+        return False
+    kind = _type_of(left)
+    if kind == "L":
+        return len(left["L"]) == len(right["L"]) and all(map(_equal, left["L"], right["L"]))
+    if kind == "M":
+        return left["M"].keys() == right["M"].keys() and all(
+            _equal(value, right["M"][name]) for name, value in left["M"].items()
+        )
+    return _hashable(left) == _hashable(right)
+
+
+def _compare(left: dict[str, Any] | None, right: dict[str, Any] | None, operator: str) -> bool:
+    if operator == "=":
+        return _equal(left, right)
+    if operator == "<>":
+        return left is not None and right is not None and not _equal(left, right)
+    if left is None or right is None or _type_of(left) != _type_of(right) or _type_of(left) not in ("S", "N", "B"):
+        return False
+    a, b = _sort_value(left)[1], _sort_value(right)[1]
+    return {"<": a < b, "<=": a <= b, ">": a > b, ">=": a >= b}[operator]
+
+
+def _value_size(value: dict[str, Any]) -> int:
+    kind = _type_of(value)
+    payload = value[kind]
+    if kind == "S":
+        return len(payload.encode())
+    if kind == "N":
+        return len(payload.lstrip("-").replace(".", "")) // 2 + 1
+    if kind == "B":
+        return len(payload)
+    if kind in ("BOOL", "NULL"):
+        return 1
+    if kind == "SS":
+        return sum(len(member.encode()) for member in payload)
+    if kind == "NS":
+        return sum(len(member) // 2 + 1 for member in payload)
+    if kind == "BS":
+        return sum(len(member) for member in payload)
+    if kind == "L":
+        return 3 + sum(_value_size(member) + 1 for member in payload)
+    return 3 + sum(len(name.encode()) + _value_size(member) + 1 for name, member in payload.items())
+
+
+def item_size(item: dict[str, Any]) -> int:
+    """Approximate DynamoDB item size in bytes (attribute names plus values)."""
+    return sum(len(name.encode()) + _value_size(value) for name, value in item.items())
+
+
+# ---------------------------------------------------------------------------
+# Expressions
+# ---------------------------------------------------------------------------
+
+_TOKEN = re.compile(r"\s*(?:(#\w+)|(:\w+)|([A-Za-z_]\w*)|(\d+)|(<>|<=|>=|[=<>(),.\[\]+-]))")
+_KEYWORDS = {"AND", "OR", "NOT", "BETWEEN", "IN", "SET", "REMOVE", "ADD", "DELETE"}
+
+
+@dataclass(frozen=True)
+class Token:
+    kind: str  # name, value, word, index, op, end
+    text: str
+
+
+def _tokenize(expression: str) -> list[Token]:
+    tokens: list[Token] = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if not match or match.end() == position:
+            raise ExpressionError(f"Invalid expression near: {expression[position:position + 20]!r}")
+        name, value, word, index, op = match.groups()
+        if name:
+            tokens.append(Token("name", name))
+        elif value:
+            tokens.append(Token("value", value))
+        elif word:
+            tokens.append(Token("keyword" if word.upper() in _KEYWORDS else "word", word))
+        elif index:
+            tokens.append(Token("index", index))
+        else:
+            tokens.append(Token("op", op))
+        position = match.end()
+    tokens.append(Token("end", ""))
+    return tokens
+
+
+# A path is a tuple of (name placeholder or literal) and int list indexes.
+Path = tuple[Any, ...]
+Context = tuple[dict[str, Any], dict[str, str], dict[str, Any]]  # item, names, values
+
+
+def _context(item: dict[str, Any] | None, request: dict[str, Any]) -> Context:
+    return item or {}, request.get("ExpressionAttributeNames", {}), request.get("ExpressionAttributeValues", {})
+
+
+def _resolve_path(path: Path, names: dict[str, str]) -> list[Any]:
+    resolved: list[Any] = []
+    for element in path:
+        if isinstance(element, str) and element.startswith("#"):
+            if element not in names:
+                raise ExpressionError(f"Missing ExpressionAttributeNames entry for {element}")
+            resolved.append(names[element])
+        else:
+            resolved.append(element)
+    return resolved
+
+
+def _get_path(item: dict[str, Any], path: list[Any]) -> dict[str, Any] | None:
+    current: Any = {"M": item}
+    for element in path:
+        if isinstance(element, int):
+            if _type_of(current) != "L" or element >= len(current["L"]):
+                return None
+            current = current["L"][element]
+        else:
+            if _type_of(current) != "M" or element not in current["M"]:
+                return None
+            current = current["M"][element]
+    return current
+
+
+def _parent_for_write(item: dict[str, Any], path: list[Any]) -> tuple[Any, Any]:
+    container: Any = item
+    for element in path[:-1]:
+        value = container[element] if isinstance(container, list) else container.get(element)
+        if value is None:
+            raise ExpressionError("The document path provided in the update expression is invalid for update")
+        container = value["L"] if "L" in value else value.get("M")
+        if container is None:
+            raise ExpressionError("The document path provided in the update expression is invalid for update")
+    return container, path[-1]
+
+
+def _set_path(item: dict[str, Any], path: list[Any], value: dict[str, Any]) -> None:
+    container, last = _parent_for_write(item, path)
+    if isinstance(container, list):
+        if last >= len(container):
+            container.append(value)
+        else:
+            container[last] = value
+    else:
+        container[last] = value
+
+
+def _remove_path(item: dict[str, Any], path: list[Any]) -> None:
+    try:
+        container, last = _parent_for_write(item, path)
+    except ExpressionError:
+        return
+    if isinstance(container, list):
+        if last < len(container):
+            del container[last]
+    else:
+        container.pop(last, None)
+
+
+class _Parser:
+    """Recursive-descent parser compiling expressions into closures over ``Context``."""
+
+    def __init__(self, expression: str) -> None:
+        self.tokens = _tokenize(expression)
+        self.position = 0
+
+    # -- token helpers -----------------------------------------------------
+    def peek(self, offset: int = 0) -> Token:
+        return self.tokens[min(self.position + offset, len(self.tokens) - 1)]
+
+    def take(self) -> Token:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def accept(self, text: str) -> bool:
+        token = self.peek()
+        if token.kind in ("op", "keyword") and token.text.upper() == text:
+            self.position += 1
+            return True
+        return False
+
+    def expect(self, text: str) -> None:
+        if not self.accept(text):
+            raise ExpressionError(f"Expected {text!r}, found {self.peek().text!r}")
+
+    def done(self) -> None:
+        if self.peek().kind != "end":
+            raise ExpressionError(f"Unexpected token {self.peek().text!r}")
+
+    # -- operands ----------------------------------------------------------
+    def path(self) -> Path:
+        token = self.take()
+        if token.kind not in ("name", "word"):
+            raise ExpressionError(f"Expected an attribute name, found {token.text!r}")
+        elements: list[Any] = [token.text]
+        while True:
+            if self.accept("."):
+                token = self.take()
+                if token.kind not in ("name", "word"):
+                    raise ExpressionError("Expected an attribute name after '.'")
+                elements.append(token.text)
+            elif self.accept("["):
+                token = self.take()
+                if token.kind != "index":
+                    raise ExpressionError("Expected a list index")
+                elements.append(int(token.text))
+                self.expect("]")
+            else:
+                return tuple(elements)
+
+    def operand(self) -> Callable[[Context], dict[str, Any] | None]:
+        token = self.peek()
+        if token.kind == "value":
+            self.position += 1
+            placeholder = token.text
+
+            def value(context: Context) -> dict[str, Any]:
+                if placeholder not in context[2]:
+                    raise ExpressionError(f"Missing ExpressionAttributeValues entry for {placeholder}")
+                return context[2][placeholder]
+
+            return value
+        if token.kind == "word" and token.text == "size" and self.peek(1).text == "(":
+            self.position += 2
+            path = self.path()
+            self.expect(")")
+
+            def size(context: Context) -> dict[str, Any] | None:
+                target = _get_path(context[0], _resolve_path(path, context[1]))
+                if target is None:
+                    return None
+                kind = _type_of(target)
+                payload = target[kind]
+                length = len(payload.encode()) if kind == "S" else len(payload)
+                return {"N": str(length)}
+
+            return size
+        path = self.path()
+        return lambda context: _get_path(context[0], _resolve_path(path, context[1]))
+
+    # -- conditions --------------------------------------------------------
+    def condition(self) -> Callable[[Context], bool]:
+        left = self.conjunction()
+        while self.accept("OR"):
+            right = self.conjunction()
+            left = (lambda a, b: lambda context: a(context) or b(context))(left, right)
+        return left
+
+    def conjunction(self) -> Callable[[Context], bool]:
+        left = self.negation()
+        while self.accept("AND"):
+            right = self.negation()
+            left = (lambda a, b: lambda context: a(context) and b(context))(left, right)
+        return left
+
+    def negation(self) -> Callable[[Context], bool]:
+        if self.accept("NOT"):
+            inner = self.negation()
+            return lambda context: not inner(context)
+        return self.predicate()
+
+    def predicate(self) -> Callable[[Context], bool]:
+        if self.accept("("):
+            inner = self.condition()
+            self.expect(")")
+            return inner
+
+        token = self.peek()
+        if token.kind == "word" and self.peek(1).text == "(" and token.text != "size":
+            return self.function()
+
+        left = self.operand()
+        if self.accept("BETWEEN"):
+            low = self.operand()
+            self.expect("AND")
+            high = self.operand()
+            return lambda context: _compare(left(context), low(context), ">=") and _compare(
+                left(context), high(context), "<="
+            )
+        if self.accept("IN"):
+            self.expect("(")
+            options = [self.operand()]
+            while self.accept(","):
+                options.append(self.operand())
+            self.expect(")")
+            return lambda context: any(_equal(left(context), option(context)) for option in options)
+
+        operator = self.take()
+        if operator.kind != "op" or operator.text not in ("=", "<>", "<", "<=", ">", ">="):
+            raise ExpressionError(f"Expected a comparator, found {operator.text!r}")
+        right = self.operand()
+        return lambda context: _compare(left(context), right(context), operator.text)
+
+    def function(self) -> Callable[[Context], bool]:
+        name = self.take().text
+        self.expect("(")
+        if name in ("attribute_exists", "attribute_not_exists"):
+            path = self.path()
+            self.expect(")")
+            exists = name == "attribute_exists"
+            return lambda context: (_get_path(context[0], _resolve_path(path, context[1])) is not None) == exists
+        if name == "attribute_type":
+            path = self.path()
+            self.expect(",")
+            expected = self.operand()
+            self.expect(")")
+
+            def attribute_type(context: Context) -> bool:
+                target = _get_path(context[0], _resolve_path(path, context[1]))
+                wanted = expected(context)
+                return target is not None and wanted is not None and _type_of(target) == wanted.get("S")
+
+            return attribute_type
+        if name in ("begins_with", "contains"):
+            target_operand = self.operand()
+            self.expect(",")
+            argument = self.operand()
+            self.expect(")")
+            if name == "begins_with":
+
+                def begins_with(context: Context) -> bool:
+                    target, prefix = target_operand(context), argument(context)
+                    if target is None or prefix is None or _type_of(target) != _type_of(prefix):
+                        return False
+                    kind = _type_of(target)
+                    return kind in ("S", "B") and target[kind].startswith(prefix[kind])
+
+                return begins_with
+
+            def contains(context: Context) -> bool:
+                target, member = target_operand(context), argument(context)
+                if target is None or member is None:
+                    return False
+                kind = _type_of(target)
+                if kind == "S" and _type_of(member) == "S":
+                    return member["S"] in target["S"]
+                if kind in ("SS", "NS", "BS"):
+                    return _hashable(member)[1] in _hashable(target)[1]
+                if kind == "L":
+                    return any(_equal(entry, member) for entry in target["L"])
+                return False
+
+            return contains
+        raise ExpressionError(f"Unsupported function {name!r}")
+
+    # -- update ------------------------------------------------------------
+    def update(self) -> list[tuple[str, Path, Any]]:
+        actions: list[tuple[str, Path, Any]] = []
+        seen: set[str] = set()
+        while self.peek().kind != "end":
+            clause = self.take()
+            if clause.kind != "keyword" or clause.text.upper() not in ("SET", "REMOVE", "ADD", "DELETE"):
+                raise ExpressionError(f"Expected SET, REMOVE, ADD or DELETE, found {clause.text!r}")
+            keyword = clause.text.upper()
+            if keyword in seen:
+                raise ExpressionError(f"The {keyword} clause appears more than once")
+            seen.add(keyword)
+            while True:
+                path = self.path()
+                if keyword == "SET":
+                    self.expect("=")
+                    actions.append(("SET", path, self.set_value()))
+                elif keyword == "REMOVE":
+                    actions.append(("REMOVE", path, None))
+                else:
+                    actions.append((keyword, path, self.operand()))
+                if not self.accept(","):
+                    break
+        if not actions:
+            raise ExpressionError("Empty update expression")
+        return actions
+
+    def set_value(self) -> Callable[[Context], dict[str, Any] | None]:
+        left = self.set_term()
+        if self.peek().text in ("+", "-"):
+            operator = self.take().text
+            right = self.set_term()
+
+            def arithmetic(context: Context) -> dict[str, Any]:
+                a, b = left(context), right(context)
+                if a is None or b is None or _type_of(a) != "N" or _type_of(b) != "N":
+                    raise ExpressionError("An operand in the update expression has an incorrect data type")
+                total = _number(a) + _number(b) if operator == "+" else _number(a) - _number(b)
+                return {"N": str(total)}
+
+            return arithmetic
+        return left
+
+    def set_term(self) -> Callable[[Context], dict[str, Any] | None]:
+        token = self.peek()
+        if token.kind == "word" and token.text in ("if_not_exists", "list_append") and self.peek(1).text == "(":
+            self.position += 2
+            if token.text == "if_not_exists":
+                path = self.path()
+                self.expect(",")
+                default = self.operand()
+                self.expect(")")
+
+                def if_not_exists(context: Context) -> dict[str, Any] | None:
+                    current = _get_path(context[0], _resolve_path(path, context[1]))
+                    return current if current is not None else default(context)
+
+                return if_not_exists
+            first = self.operand()
+            self.expect(",")
+            second = self.operand()
+            self.expect(")")
+
+            def list_append(context: Context) -> dict[str, Any]:
+                a, b = first(context), second(context)
+                if a is None or b is None or _type_of(a) != "L" or _type_of(b) != "L":
+                    raise ExpressionError("list_append needs two lists")
+                return {"L": a["L"] + b["L"]}
+
+            return list_append
+        return self.operand()
+
+    def projection(self) -> list[Path]:
+        paths = [self.path()]
+        while self.accept(","):
+            paths.append(self.path())
+        return paths
+
+
+@lru_cache(maxsize=512)
+def compile_condition(expression: str) -> Callable[[Context], bool]:
+    parser = _Parser(expression)
+    condition = parser.condition()
+    parser.done()
+    return condition
+
+
+@lru_cache(maxsize=512)
+def compile_update(expression: str) -> list[tuple[str, Path, Any]]:
+    parser = _Parser(expression)
+    actions = parser.update()
+    parser.done()
+    return actions
+
+
+@lru_cache(maxsize=512)
+def compile_projection(expression: str) -> list[Path]:
+    parser = _Parser(expression)
+    paths = parser.projection()
+    parser.done()
+    return paths
+
+
+def _key_condition_hash(expression: str, schema: KeySchema, names: dict[str, str], values: dict[str, Any]) -> Any:
+    """Partition value of a key condition: the ``<hash key> = :value`` term (in either order)."""
+    tokens = _tokenize(expression)
+    for position in range(len(tokens) - 2):
+        first, operator, second = tokens[position], tokens[position + 1], tokens[position + 2]
+        if operator.text != "=":
+            continue
+        for name_token, value_token in ((first, second), (second, first)):
+            if name_token.kind in ("name", "word") and value_token.kind == "value":
+                name = names.get(name_token.text, name_token.text) if name_token.kind == "name" else name_token.text
+                if name == schema.hash_key:
+                    if value_token.text not in values:
+                        raise ExpressionError(f"Missing ExpressionAttributeValues entry for {value_token.text}")
+                    return _hashable(values[value_token.text])
+    raise ExpressionError(f"Query condition missed key schema element: {schema.hash_key}")
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+
+
+def _scan_hash(partition: Any) -> str:
+    return hashlib.md5(repr(partition).encode()).hexdigest()
+
+
+class InMemoryDynamoDB:
+    """Low-level DynamoDB client double holding one table in memory."""
+
+    def __init__(self, table_name: str, *, latency_ms: float = 0.0) -> None:
+        self.table_name = table_name
+        self.latency_seconds = max(0.0, latency_ms) / 1000
+        self._lock = threading.RLock()
+        self._items: dict[tuple[Any, Any], dict[str, Any]] = {}
+        # index name (None = table) -> partition -> {(range, table key): table key}
+        self._indexes: dict[str | None, dict[Any, dict[tuple[Any, Any], tuple[Any, Any]]]] = {
+            None: {},
+            **{name: {} for name in INDEX_SCHEMAS},
+        }
+        self._sorted: dict[tuple[str | None, Any], list[tuple[Any, Any]]] = {}
+        self._scan_order: dict[str | None, list[tuple[Any, ...]]] = {}
+        self._swept_at = 0.0
+
+    # -- plumbing ------------------------------------------------------------
+    def _simulate_latency(self) -> None:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+    def _check_table(self, operation: str, table_name: str | None) -> None:
+        if table_name != self.table_name:
+            raise _error(operation, "ResourceNotFoundException", "Requested resource not found")
+
+    def _schema(self, operation: str, index_name: str | None) -> KeySchema:
+        if index_name is None:
+            return TABLE_SCHEMA
+        if index_name not in INDEX_SCHEMAS:
+            raise _error(operation, "ValidationException", "The table does not have the specified index: " + index_name)
+        return INDEX_SCHEMAS[index_name]
+
+    def _table_key(self, operation: str, key: dict[str, Any]) -> tuple[Any, Any]:
+        if set(key) != {TABLE_SCHEMA.hash_key, TABLE_SCHEMA.range_key}:
+            raise _error(operation, "ValidationException", "The provided key element does not match the schema")
+        for value in key.values():
+            if _type_of(value) != "S":
+                raise _error(operation, "ValidationException", "The provided key element does not match the schema")
+        return _hashable(key[TABLE_SCHEMA.hash_key]), _hashable(key[TABLE_SCHEMA.range_key])
+
+    def _index_entry(self, schema: KeySchema, item: dict[str, Any]) -> tuple[Any, Any] | None:
+        hash_value = item.get(schema.hash_key)
+        range_value = item.get(schema.range_key) if schema.range_key else {"S": ""}
+        if hash_value is None or range_value is None:
+            return None
+        if _type_of(hash_value) not in ("S", "N", "B") or _type_of(range_value) not in ("S", "N", "B"):
+            return None
+        return _hashable(hash_value), _sort_value(range_value)
+
+    def _unindex(self, table_key: tuple[Any, Any], item: dict[str, Any]) -> None:
+        for name, partitions in self._indexes.items():
+            entry = self._index_entry(INDEX_SCHEMAS[name] if name else TABLE_SCHEMA, item)
+            if entry is None:
+                continue
+            partition, range_value = entry
+            members = partitions.get(partition)
+            if members is not None:
+                members.pop((range_value, table_key), None)
+                if not members:
+                    del partitions[partition]
+                self._sorted.pop((name, partition), None)
+            self._scan_order.pop(name, None)
+
+    def _index(self, table_key: tuple[Any, Any], item: dict[str, Any]) -> None:
+        for name, partitions in self._indexes.items():
+            entry = self._index_entry(INDEX_SCHEMAS[name] if name else TABLE_SCHEMA, item)
+            if entry is None:
+                continue
+            partition, range_value = entry
+            partitions.setdefault(partition, {})[(range_value, table_key)] = table_key
+            self._sorted.pop((name, partition), None)
+            self._scan_order.pop(name, None)
+
+    def _store(self, table_key: tuple[Any, Any], item: dict[str, Any] | None) -> None:
+        previous = self._items.pop(table_key, None)
+        if previous is not None:
+            self._unindex(table_key, previous)
+        if item is not None:
+            self._items[table_key] = item
+            self._index(table_key, item)
+
+    def _sweep_expired(self) -> None:
+        """Delete items whose ``ttl`` (epoch seconds) has passed, at most once per second."""
+        now = time.time()
+        if now - self._swept_at < TTL_SWEEP_SECONDS:
+            return
+        self._swept_at = now
+        expired = [
+            table_key
+            for table_key, item in self._items.items()
+            if _type_of(item.get(TTL_ATTRIBUTE, {"NULL": True})) == "N" and _number(item[TTL_ATTRIBUTE]) < now
+        ]
+        for table_key in expired:
+            self._store(table_key, None)
+
+    def _partition(self, index_name: str | None, partition: Any) -> list[tuple[Any, Any]]:
+        cache_key = (index_name, partition)
+        if cache_key not in self._sorted:
+            members = self._indexes[index_name].get(partition, {})
+            self._sorted[cache_key] = sorted(members)
+        return self._sorted[cache_key]
+
+    def _ordered_for_scan(self, index_name: str | None) -> list[tuple[Any, ...]]:
+        """``(hash, partition, range, table key)`` entries in scan order: partitions by hash, then by range."""
+        if index_name not in self._scan_order:
+            self._scan_order[index_name] = sorted(
+                (_scan_hash(partition), repr(partition), range_value, table_key)
+                for partition, members in self._indexes[index_name].items()
+                for range_value, table_key in members
+            )
+        return self._scan_order[index_name]
+
+    @staticmethod
+    def _metadata() -> dict[str, Any]:
+        return {"HTTPStatusCode": 200, "RetryAttempts": 0}
+
+    def _capacity(self, request: dict[str, Any], units: float, *, per_table: bool = False) -> dict[str, Any]:
+        mode = request.get("ReturnConsumedCapacity", "NONE")
+        if mode == "NONE":
+            return {}
+        consumed = {"TableName": self.table_name, "CapacityUnits": units}
+        return {"ConsumedCapacity": [consumed] if per_table else consumed}
+
+    @staticmethod
+    def _read_units(size: int, consistent: bool) -> float:
+        units = max(1, math.ceil(size / 4096))
+        return float(units) if consistent else units / 2
+
+    @staticmethod
+    def _write_units(size: int) -> float:
+        return float(max(1, math.ceil(size / 1024)))
+
+    def _project(self, item: dict[str, Any], request: dict[str, Any]) -> dict[str, Any]:
+        expression = request.get("ProjectionExpression")
+        if not expression:
+            return copy.deepcopy(item)
+        names = request.get("ExpressionAttributeNames", {})
+        projected: dict[str, Any] = {}
+        for path in compile_projection(expression):
+            resolved = _resolve_path(path, names)
+            value = _get_path(item, resolved)
+            if value is not None:
+                if len(resolved) == 1:
+                    projected[resolved[0]] = copy.deepcopy(value)
+                else:
+                    projected.setdefault(resolved[0], copy.deepcopy(item[resolved[0]]))
+        return projected
+
+    def _check_condition(
+        self,
+        operation: str,
+        item: dict[str, Any] | None,
+        request: dict[str, Any],
+    ) -> bool:
+        expression = request.get("ConditionExpression")
+        if not expression:
+            return True
+        try:
+            condition = compile_condition(expression)
+            return condition(_context(item, request))
+        except ExpressionError as exc:
+            raise _error(operation, "ValidationException", str(exc)) from exc
+
+    def _updated(
+        self,
+        operation: str,
+        key: dict[str, Any],
+        item: dict[str, Any] | None,
+        request: dict[str, Any],
+    ) -> dict[str, Any]:
+        updated = copy.deepcopy(item) if item is not None else copy.deepcopy(key)
+        context = _context(item, request)
+        try:
+            actions = compile_update(request["UpdateExpression"])
+            for action, path, argument in actions:
+                resolved = _resolve_path(path, context[1])
+                if resolved[0] in (TABLE_SCHEMA.hash_key, TABLE_SCHEMA.range_key):
+                    raise ExpressionError(f"Cannot update attribute {resolved[0]}. This attribute is part of the key")
+                if action == "SET":
+                    value = argument(context)
+                    if value is None:
+                        raise ExpressionError("The expression refers to an attribute that does not exist in the item")
+                    _set_path(updated, resolved, copy.deepcopy(value))
+                elif action == "REMOVE":
+                    _remove_path(updated, resolved)
+                else:
+                    self._add_or_delete(updated, resolved, action, argument(context))
+        except ExpressionError as exc:
+            raise _error(operation, "ValidationException", str(exc)) from exc
+        return updated
+
+    @staticmethod
+    def _add_or_delete(item: dict[str, Any], path: list[Any], action: str, value: dict[str, Any] | None) -> None:
+        if value is None:
+            raise ExpressionError("Missing value in update expression")
+        current = _get_path(item, path)
+        kind = _type_of(value)
+        if action == "ADD" and kind == "N":
+            if current is not None and _type_of(current) != "N":
+                raise ExpressionError("An operand in the update expression has an incorrect data type")
+            total = (_number(current) if current is not None else Decimal(0)) + _number(value)
+            _set_path(item, path, {"N": str(total)})
+            return
+        if kind not in ("SS", "NS", "BS"):
+            raise ExpressionError(f"{action} only supports numbers and sets")
+        if current is not None and _type_of(current) != kind:
+            raise ExpressionError("An operand in the update expression has an incorrect data type")
+        members = list(current[kind]) if current is not None else []
+        if action == "ADD":
+            for member in value[kind]:
+                if member not in members:
+                    members.append(member)
+        else:
+            removed = set(value[kind])
+            members = [member for member in members if member not in removed]
+        if members:
+            _set_path(item, path, {kind: members})
+        else:
+            _remove_path(item, path)
+
+    # -- single-item operations ------------------------------------------------
+    def get_item(self, **request: Any) -> dict[str, Any]:
+        self._simulate_latency()
+        with self._lock:
+            self._check_table("GetItem", request.get("TableName"))
+            self._sweep_expired()
+            item = self._items.get(self._table_key("GetItem", request["Key"]))
+            response: dict[str, Any] = {"ResponseMetadata": self._metadata()}
+            if item is not None:
+                response["Item"] = self._project(item, request)
+            size = item_size(item) if item is not None else 0
+            response.update(self._capacity(request, self._read_units(size, bool(request.get("ConsistentRead")))))
+            return response
+
+    def put_item(self, **request: Any) -> dict[str, Any]:
+        self._simulate_latency()
+        with self._lock:
+            self._check_table("PutItem", request.get("TableName"))
+            self._sweep_expired()
+            item = request["Item"]
+            table_key = self._table_key("PutItem", {name: item.get(name) for name in ("PK", "SK") if name in item})
+            if not self._check_condition("PutItem", self._items.get(table_key), request):
+                raise _error("PutItem", "ConditionalCheckFailedException", "The conditional request failed")
+            self._store(table_key, copy.deepcopy(item))
+            response = {"ResponseMetadata": self._metadata()}
+            response.update(self._capacity(request, self._write_units(item_size(item))))
+            return response
+
+    def delete_item(self, **request: Any) -> dict[str, Any]:
+        self._simulate_latency()
+        with self._lock:
+            self._check_table("DeleteItem", request.get("TableName"))
+            self._sweep_expired()
+            table_key = self._table_key("DeleteItem", request["Key"])
+            current = self._items.get(table_key)
+            if not self._check_condition("DeleteItem", current, request):
+                raise _error("DeleteItem", "ConditionalCheckFailedException", "The conditional request failed")
+            self._store(table_key, None)
+            response = {"ResponseMetadata": self._metadata()}
+            size = item_size(current) if current is not None else 0
+            response.update(self._capacity(request, self._write_units(size)))
+            return response
+
+    def update_item(self, **request: Any) -> dict[str, Any]:
+        self._simulate_latency()
+        with self._lock:
+            self._check_table("UpdateItem", request.get("TableName"))
+            self._sweep_expired()
+            table_key = self._table_key("UpdateItem", request["Key"])
+            current = self._items.get(table_key)
+            if not self._check_condition("UpdateItem", current, request):
+                raise _error("UpdateItem", "ConditionalCheckFailedException", "The conditional request failed")
+            updated = self._updated("UpdateItem", request["Key"], current, request)
+            self._store(table_key, updated)
+            response = {"ResponseMetadata": self._metadata()}
+            response.update(self._capacity(request, self._write_units(item_size(updated))))
+            return response
+
+    # -- multi-item operations ---------------------------------------------------
+    def batch_get_item(self, **request: Any) -> dict[str, Any]:
+        self._simulate_latency()
+        with self._lock:
+            self._sweep_expired()
+            responses: dict[str, list[dict[str, Any]]] = {}
+            units = 0.0
+            for table_name, spec in request["RequestItems"].items():
+                self._check_table("BatchGetItem", table_name)
+                if len(spec["Keys"]) > BATCH_GET_MAX_KEYS:
+                    raise _error("BatchGetItem", "ValidationException", "Too many items requested for BatchGetItem")
+                table_keys = [self._table_key("BatchGetItem", key) for key in spec["Keys"]]
+                if len(set(table_keys)) != len(table_keys):
+                    raise _error("BatchGetItem", "ValidationException", "The list of item keys contains duplicates")
+                found = [self._items.get(key) for key in table_keys]
+                responses[table_name] = [self._project(item, spec) for item in found if item is not None]
+                # Keys that match nothing still cost the minimum read.
+                units += sum(
+                    self._read_units(item_size(item) if item is not None else 0, bool(spec.get("ConsistentRead")))
+                    for item in found
+                )
+            response = {"Responses": responses, "UnprocessedKeys": {}, "ResponseMetadata": self._metadata()}
+            response.update(self._capacity(request, units, per_table=True))
+            return response
+
+    def batch_write_item(self, **request: Any) -> dict[str, Any]:
+        self._simulate_latency()
+        operation = "BatchWriteItem"
+        with self._lock:
+            self._sweep_expired()
+            planned: list[tuple[tuple[Any, Any], dict[str, Any] | None]] = []
+            seen: set[tuple[Any, Any]] = set()
+            units = 0.0
+            for table_name, writes in request["RequestItems"].items():
+                self._check_table(operation, table_name)
+                if len(writes) > BATCH_WRITE_MAX_ITEMS:
+                    raise _error(operation, "ValidationException", "Too many items requested for BatchWriteItem")
+                for write in writes:
+                    kind, params = next(iter(write.items()))
+                    key = params["Item"] if kind == "PutRequest" else params["Key"]
+                    table_key = self._table_key(operation, {name: key[name] for name in ("PK", "SK") if name in key})
+                    if table_key in seen:
+                        raise _error(operation, "ValidationException", "Provided list of item keys contains duplicates")
+                    seen.add(table_key)
+                    item = copy.deepcopy(params["Item"]) if kind == "PutRequest" else None
+                    planned.append((table_key, item))
+                    units += self._write_units(item_size(item or self._items.get(table_key) or {}))
+            # Each write stands alone (no conditions), so nothing can be rejected after validation.
+            for table_key, item in planned:
+                self._store(table_key, item)
+            response = {"UnprocessedItems": {}, "ResponseMetadata": self._metadata()}
+            response.update(self._capacity(request, units, per_table=True))
+            return response
+
+    def transact_write_items(self, **request: Any) -> dict[str, Any]:
+        self._simulate_latency()
+        operation = "TransactWriteItems"
+        actions = request["TransactItems"]
+        if len(actions) > TRANSACT_MAX_ITEMS:
+            raise _error(operation, "ValidationException", "Member must have length less than or equal to 100")
+        with self._lock:
+            self._sweep_expired()
+            planned: list[tuple[tuple[Any, Any], dict[str, Any] | None]] = []
+            reasons: list[dict[str, str]] = []
+            seen: set[tuple[Any, Any]] = set()
+            for action in actions:
+                kind, params = next(iter(action.items()))
+                self._check_table(operation, params.get("TableName"))
+                key = params["Item"] if kind == "Put" else params["Key"]
+                table_key = self._table_key(operation, {name: key.get(name) for name in ("PK", "SK") if name in key})
+                if table_key in seen:
+                    raise _error(
+                        operation,
+                        "ValidationException",
+                        "Transaction request cannot include multiple operations on one item",
+                    )
+                seen.add(table_key)
+                current = self._items.get(table_key)
+                if not self._check_condition(operation, current, params):
+                    reasons.append({"Code": "ConditionalCheckFailed", "Message": "The conditional request failed"})
+                    continue
+                reasons.append({"Code": "None"})
+                if kind == "Put":
+                    planned.append((table_key, copy.deepcopy(params["Item"])))
+                elif kind == "Delete":
+                    planned.append((table_key, None))
+                elif kind == "Update":
+                    planned.append((table_key, self._updated(operation, params["Key"], current, params)))
+                elif kind != "ConditionCheck":
+                    raise _error(operation, "ValidationException", f"Unsupported transaction action {kind}")
+
+            if any(reason["Code"] != "None" for reason in reasons):
+                raise _error(
+                    operation,
+                    "TransactionCanceledException",
+                    "Transaction cancelled, please refer cancellation reasons for specific reasons",
+                    CancellationReasons=reasons,
+                )
+
+            units = 0.0
+            for table_key, item in planned:
+                previous = self._items.get(table_key)
+                size = item_size(item) if item is not None else item_size(previous or {})
+                units += 2 * self._write_units(size)
+                self._store(table_key, item)
+            response = {"ResponseMetadata": self._metadata()}
+            response.update(self._capacity(request, units, per_table=True))
+            return response
+
+    def _page(
+        self,
+        operation: str,
+        request: dict[str, Any],
+        candidates: list[tuple[Any, Any]],
+        start_after: int,
+        schema: KeySchema,
+        index_name: str | None,
+        condition: Callable[[Context], bool] | None,
+    ) -> dict[str, Any]:
+        names = request.get("ExpressionAttributeNames", {})
+        values = request.get("ExpressionAttributeValues", {})
+        try:
+            item_filter = compile_condition(request["FilterExpression"]) if request.get("FilterExpression") else None
+        except ExpressionError as exc:
+            raise _error(operation, "ValidationException", str(exc)) from exc
+
+        limit = request.get("Limit")
+        count_only = request.get("Select") == "COUNT"
+        items: list[dict[str, Any]] = []
+        scanned = 0
+        read_bytes = 0
+        last_key: dict[str, Any] | None = None
+        position = start_after
+        while position < len(candidates):
+            table_key = candidates[position]
+            position += 1
+            item = self._items[table_key]
+            try:
+                if condition is not None and not condition((item, names, values)):
+                    continue
+                scanned += 1
+                read_bytes += item_size(item)
+                if item_filter is None or item_filter((item, names, values)):
+                    if not count_only:
+                        items.append(self._project(item, request))
+                    else:
+                        items.append({})
+            except ExpressionError as exc:
+                raise _error(operation, "ValidationException", str(exc)) from exc
+            if (limit is not None and scanned >= limit) or read_bytes >= PAGE_MAX_BYTES:
+                if position < len(candidates):
+                    last_key = self._last_key(item, schema, index_name)
+                break
+
+        response: dict[str, Any] = {
+            "Count": len(items),
+            "ScannedCount": scanned,
+            "ResponseMetadata": self._metadata(),
+        }
+        if not count_only:
+            response["Items"] = items
+        if last_key is not None:
+            response["LastEvaluatedKey"] = last_key
+        response.update(
+            self._capacity(request, self._read_units(read_bytes, bool(request.get("ConsistentRead"))))
+        )
+        return response
+
+    @staticmethod
+    def _last_key(item: dict[str, Any], schema: KeySchema, index_name: str | None) -> dict[str, Any]:
+        names = [TABLE_SCHEMA.hash_key, TABLE_SCHEMA.range_key]
+        if index_name is not None:
+            names += [name for name in (schema.hash_key, schema.range_key) if name and name not in names]
+        return {name: copy.deepcopy(item[name]) for name in names if name in item}
+
+    def _start_marker(
+        self,
+        operation: str,
+        request: dict[str, Any],
+        schema: KeySchema,
+    ) -> tuple[Any, tuple[Any, Any]] | None:
+        """``(partition, range, table key)`` of ``ExclusiveStartKey``; pages resume right after it."""
+        start = request.get("ExclusiveStartKey")
+        if not start:
+            return None
+        entry = self._index_entry(schema, start)
+        if entry is None:
+            raise _error(operation, "ValidationException", "The provided starting key is invalid")
+        table_key = self._table_key(operation, {name: start.get(name) for name in ("PK", "SK") if name in start})
+        return (*entry, table_key)
+
+    def query(self, **request: Any) -> dict[str, Any]:
+        self._simulate_latency()
+        operation = "Query"
+        with self._lock:
+            self._check_table(operation, request.get("TableName"))
+            self._sweep_expired()
+            index_name = request.get("IndexName")
+            schema = self._schema(operation, index_name)
+            if index_name is not None and request.get("ConsistentRead"):
+                raise _error(operation, "ValidationException", "Consistent reads are not supported on GSIs")
+            expression = request.get("KeyConditionExpression")
+            if not expression:
+                raise _error(operation, "ValidationException", "KeyConditionExpression must be specified")
+            names = request.get("ExpressionAttributeNames", {})
+            values = request.get("ExpressionAttributeValues", {})
+            try:
+                partition = _key_condition_hash(expression, schema, names, values)
+                condition = compile_condition(expression)
+            except ExpressionError as exc:
+                raise _error(operation, "ValidationException", str(exc)) from exc
+
+            entries = self._partition(index_name, partition)
+            forward = request.get("ScanIndexForward", True) is not False
+            table_keys = [table_key for _, table_key in entries]
+            if not forward:
+                table_keys.reverse()
+            start = 0
+            marker = self._start_marker(operation, request, schema)
+            if marker is not None:
+                position = marker[1:]
+                if forward:
+                    start = bisect.bisect_right(entries, position)
+                else:
+                    start = len(entries) - bisect.bisect_left(entries, position)
+            return self._page(operation, request, table_keys, start, schema, index_name, condition)
+
+    def scan(self, **request: Any) -> dict[str, Any]:
+        self._simulate_latency()
+        operation = "Scan"
+        with self._lock:
+            self._check_table(operation, request.get("TableName"))
+            self._sweep_expired()
+            index_name = request.get("IndexName")
+            schema = self._schema(operation, index_name)
+            order = self._ordered_for_scan(index_name)
+
+            total = request.get("TotalSegments")
+            segment = request.get("Segment")
+            if (total is None) != (segment is None) or (total is not None and not 0 <= segment < total):
+                raise _error(operation, "ValidationException", "Segment and TotalSegments must be used together")
+            if total is not None:
+                order = [entry for entry in order if int(entry[0], 16) % total == segment]
+
+            start = 0
+            marker = self._start_marker(operation, request, schema)
+            if marker is not None:
+                partition, range_value, table_key = marker
+                start = bisect.bisect_right(order, (_scan_hash(partition), repr(partition), range_value, table_key))
+            table_keys = [table_key for *_, table_key in order]
+            return self._page(operation, request, table_keys, start, schema, index_name, None)
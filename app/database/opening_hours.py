@@ -0,0 +1,152 @@
+"""Compiled opening-hours calendar shared by validation, availability and seeding."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import lru_cache
+
+from app.config import settings
+from app.database.availability import slot_index
+
+BOOKING_STEP_MINUTES = 30
+# Slots before this time belong to the previous day's service (e.g. a 23:30
+# booking running until 01:00).
+SERVICE_DAY_ROLLOVER = "06:00"
+# Start times from here on are dinner service; earlier ones are lunch.
+DINNER_SERVICE_START = "18:00"
+
+
+@dataclass(frozen=True)
+class DayRule:
+    """Bookable start-time windows (inclusive) and the message shown outside them."""
+
+    windows: tuple[tuple[str, str], ...]
+    message: str
+
+
+CLOSED_MONDAY = DayRule((), "El restaurante está cerrado los lunes")
+WEEKDAY_SERVICE = DayRule((("13:00", "16:00"), ("20:00", "23:30")), "Martes a jueves: 13:00-16:00 y 20:00-23:30")
+WEEKEND_SERVICE = DayRule((("00:00", "00:00"), ("13:00", "23:30")), "Viernes y sábado: 13:00-00:00")
+SUNDAY_SERVICE = DayRule((("13:00", "17:00"),), "Domingo: 13:00-17:00")
+CLOSED_DAY = DayRule((), "El restaurante está cerrado ese día")
+
+# Monday = 0
+WEEKDAY_RULES: dict[int, DayRule] = {
+    0: CLOSED_MONDAY,
+    1: WEEKDAY_SERVICE,
+    2: WEEKDAY_SERVICE,
+    3: WEEKDAY_SERVICE,
+    4: WEEKEND_SERVICE,
+    5: WEEKEND_SERVICE,
+    6: SUNDAY_SERVICE,
+}
+# Holidays open with the Sunday schedule.
+HOLIDAY_RULE = SUNDAY_SERVICE
+
+MINUTES_BY_TIME: dict[str, int] = {
+    f"{minute // 60:02d}:{minute % 60:02d}": minute for minute in range(24 * 60)
+}
+
+
+@dataclass(frozen=True)
+class CompiledDay:
+    weekday: int
+    rule: DayRule
+    times: tuple[str, ...]
+    slots: frozenset[int]
+
+
+def _window_times(start: str, end: str) -> list[str]:
+    return [
+        f"{minute // 60:02d}:{minute % 60:02d}"
+        for minute in range(MINUTES_BY_TIME[start], MINUTES_BY_TIME[end] + 1, BOOKING_STEP_MINUTES)
+    ]
+
+
+@lru_cache(maxsize=1024)
+def compile_day(date: str) -> CompiledDay | None:
+    """Bookable start times of a date, or ``None`` if the date is malformed."""
+    try:
+        day = datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        return None
+
+    if date in settings.closed_dates:
+        rule = CLOSED_DAY
+    elif date in settings.holiday_dates:
+        rule = HOLIDAY_RULE
+    else:
+        rule = WEEKDAY_RULES[day.weekday()]
+
+    times = tuple(time for start, end in rule.windows for time in _window_times(start, end))
+    return CompiledDay(weekday=day.weekday(), rule=rule, times=times, slots=frozenset(slot_index(time) for time in times))
+
+
+def service_for(time: str) -> str:
+    return "lunch" if SERVICE_DAY_ROLLOVER <= time < DINNER_SERVICE_START else "dinner"
+
+
+@lru_cache(maxsize=4096)
+def reservation_duration(num_people: int, date: str = "", time: str = "") -> int:
+    """Minutes a booking holds its table, from the first matching duration rule."""
+    compiled = compile_day(date) if date else None
+    weekday = compiled.weekday if compiled else None
+    service = service_for(time) if time else ""
+
+    for rule in settings.reservation_duration_rules:
+        if num_people > rule.max_people:
+            continue
+        if rule.weekdays and weekday not in rule.weekdays:
+            continue
+        if rule.service and rule.service != service:
+            continue
+        return rule.minutes
+    return settings.default_reservation_duration_minutes
+
+
+def normalize_time(time: str) -> str | None:
+    """``HH:MM`` with zero padding, or ``None`` if ``time`` is not a valid time."""
+    if time in MINUTES_BY_TIME:
+        return time
+    try:
+        return datetime.strptime(time, "%H:%M").strftime("%H:%M")
+    except ValueError:
+        return None
+
+
+def _now_key() -> str:
+    return datetime.now(UTC).strftime("%Y-%m-%d %H:%M")
+
+
+def validate(date: str, time: str) -> tuple[bool, str]:
+    compiled = compile_day(date)
+    if compiled is None:
+        return False, "Formato de fecha inválido. Usa YYYY-MM-DD"
+
+    normalized = normalize_time(time)
+    if normalized is None:
+        return False, "Formato de hora inválido. Usa HH:MM"
+
+    if MINUTES_BY_TIME[normalized] % BOOKING_STEP_MINUTES:
+        return False, "Solo hay reservas cada 30 minutos (por ejemplo 20:00 o 20:30)"
+
+    if f"{date} {normalized}" < _now_key():
+        return False, "No se pueden crear reservas en fechas/horas pasadas"
+
+    if slot_index(normalized) not in compiled.slots:
+        return False, compiled.rule.message
+
+    return True, ""
+
+
+def day_times(date: str) -> list[str]:
+    """Every bookable start time of a date, past or not."""
+    compiled = compile_day(date)
+    return list(compiled.times) if compiled else []
+
+
+def bookable_times(date: str) -> list[str]:
+    """Bookable start times of a date that are not in the past."""
+    now = _now_key()
+    return [time for time in day_times(date) if f"{date} {time}" >= now]
@@ -0,0 +1,54 @@
+"""Kitchen pacing: cover limits per arrival slot and per service."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any
+
+from app.config import PacingRule, settings
+from app.database.opening_hours import compile_day, service_for
+
+
+def pace_key(date: str) -> dict[str, str]:
+    return {"PK": f"PACE#{date}", "SK": "COVERS"}
+
+
+def slot_attribute(time: str) -> str:
+    return f"slot_{time.replace(':', '')}"
+
+
+def service_attribute(time: str) -> str:
+    return f"service_{service_for(time)}"
+
+
+@lru_cache(maxsize=1024)
+def rule_for(date: str) -> PacingRule | None:
+    """First pacing rule whose weekdays include ``date``, if any."""
+    compiled = compile_day(date)
+    if compiled is None:
+        return None
+    for rule in settings.pacing_rules:
+        if not rule.weekdays or compiled.weekday in rule.weekdays:
+            return rule
+    return None
+
+
+def limit_for(date: str, attribute: str) -> int:
+    """Cover limit of one counter attribute on ``date`` (0 means no limit)."""
+    rule = rule_for(date)
+    if rule is None:
+        return 0
+    return rule.slot_covers if attribute.startswith("slot_") else rule.service_covers
+
+
+def covers_by_attribute(time: str, covers: int) -> dict[str, int]:
+    return {slot_attribute(time): covers, service_attribute(time): covers}
+
+
+def admits(counters: dict[str, Any], date: str, time: str, covers: int) -> bool:
+    """Whether ``covers`` more guests arriving at ``time`` stay within the limits."""
+    for attribute, added in covers_by_attribute(time, covers).items():
+        limit = limit_for(date, attribute)
+        if limit and int(counters.get(attribute, 0)) + added > limit:
+            return False
+    return True
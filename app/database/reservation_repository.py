@@ -2,181 +2,213 @@
 
 from __future__ import annotations
 
+import heapq
 import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
 from typing import Any
 from uuid import uuid4
 
 from boto3.dynamodb.conditions import Attr, Key
 
-from app.database.dynamodb_client import db_client
+from app.config import settings
+from app.database import opening_hours, pacing
+from app.database.allocation import Booking, greedy_seated, plan_reseating
+from app.database.availability import DayOccupancy, next_date, slot_index, table_members
+from app.database.availability import slot_keys as build_slot_keys
+from app.database.availability_cache import AvailabilityCache
+from app.database.dynamodb_client import DynamoDBClient, get_db_client
+from app.database.opening_hours import SERVICE_DAY_ROLLOVER
+from app.database.table_catalog import TableCatalog
 
 logger = logging.getLogger(__name__)
 
 ACTIVE_STATUSES = {"pending", "confirmed"}
 VALID_STATUSES = {"pending", "confirmed", "cancelled"}
-SLOT_MINUTES = 30
 DEFAULT_RESERVATION_DURATION_MINUTES = 90
 RESERVATION_RETENTION_DAYS = 180
 LOOKUP_RETENTION_DAYS = 30
 OCCUPANCY_RETENTION_DAYS = 2
+MAX_SEARCH_DAYS = 14
+ALTERNATIVE_SLOT_RADIUS = 4
+ALTERNATIVE_DAY_RADIUS = 1
+NO_TABLES_MESSAGE = "No hay mesas disponibles para ese horario"
+SAVE_FAILED_MESSAGE = "No se pudo guardar la reserva"
+PACING_FULL_MESSAGE = "La cocina no admite más comensales a esa hora"
+DUPLICATE_ID_MESSAGE = "No se pudo guardar la reserva (puede que el ID ya exista)"
+CONCURRENT_CHANGE_MESSAGE = "La reserva ha cambiado mientras se actualizaba. Inténtalo de nuevo"
+NOT_FOUND_MESSAGE = "No existe la reserva indicada"
+NO_TABLES_FOR_CHANGES_MESSAGE = "No hay disponibilidad para los cambios solicitados"
 
 DEFAULT_TABLES: list[dict[str, Any]] = [
-    {"table_id": "S1", "zone": "salon", "capacity_min": 1, "capacity_max": 2, "priority": 1, "is_active": True},
-    {"table_id": "S2", "zone": "salon", "capacity_min": 1, "capacity_max": 2, "priority": 2, "is_active": True},
-    {"table_id": "S3", "zone": "salon", "capacity_min": 2, "capacity_max": 4, "priority": 1, "is_active": True},
-    {"table_id": "S4", "zone": "salon", "capacity_min": 2, "capacity_max": 4, "priority": 2, "is_active": True},
-    {"table_id": "S5", "zone": "salon", "capacity_min": 4, "capacity_max": 6, "priority": 1, "is_active": True},
-    {"table_id": "S6", "zone": "salon", "capacity_min": 6, "capacity_max": 8, "priority": 1, "is_active": True},
-    {"table_id": "T1", "zone": "terraza", "capacity_min": 1, "capacity_max": 2, "priority": 1, "is_active": True},
-    {"table_id": "T2", "zone": "terraza", "capacity_min": 1, "capacity_max": 2, "priority": 2, "is_active": True},
-    {"table_id": "T3", "zone": "terraza", "capacity_min": 2, "capacity_max": 4, "priority": 1, "is_active": True},
-    {"table_id": "T4", "zone": "terraza", "capacity_min": 2, "capacity_max": 4, "priority": 2, "is_active": True},
-    {"table_id": "T5", "zone": "terraza", "capacity_min": 4, "capacity_max": 6, "priority": 1, "is_active": True},
+    {"table_id": "S1", "zone": "salon", "capacity_min": 1, "capacity_max": 2, "priority": 1, "is_active": True, "combinable_with": []},
+    {"table_id": "S2", "zone": "salon", "capacity_min": 1, "capacity_max": 2, "priority": 2, "is_active": True, "combinable_with": []},
+    {"table_id": "S3", "zone": "salon", "capacity_min": 2, "capacity_max": 4, "priority": 1, "is_active": True, "combinable_with": ["S4"]},
+    {"table_id": "S4", "zone": "salon", "capacity_min": 2, "capacity_max": 4, "priority": 2, "is_active": True, "combinable_with": ["S3"]},
+    {"table_id": "S5", "zone": "salon", "capacity_min": 4, "capacity_max": 6, "priority": 1, "is_active": True, "combinable_with": ["S6"]},
+    {"table_id": "S6", "zone": "salon", "capacity_min": 6, "capacity_max": 8, "priority": 1, "is_active": True, "combinable_with": ["S5"]},
+    {"table_id": "T1", "zone": "terraza", "capacity_min": 1, "capacity_max": 2, "priority": 1, "is_active": True, "combinable_with": []},
+    {"table_id": "T2", "zone": "terraza", "capacity_min": 1, "capacity_max": 2, "priority": 2, "is_active": True, "combinable_with": []},
+    {"table_id": "T3", "zone": "terraza", "capacity_min": 2, "capacity_max": 4, "priority": 1, "is_active": True, "combinable_with": ["T4"]},
+    {"table_id": "T4", "zone": "terraza", "capacity_min": 2, "capacity_max": 4, "priority": 2, "is_active": True, "combinable_with": ["T3", "T5"]},
+    {"table_id": "T5", "zone": "terraza", "capacity_min": 4, "capacity_max": 6, "priority": 1, "is_active": True, "combinable_with": ["T4"]},
 ]
 
 
-class ReservationRepository:
-    """Handles reservation persistence and availability rules."""
+def _listing_order(row: dict[str, Any]) -> tuple[str, str, str]:
+    return (row.get("date", ""), row.get("time", ""), row.get("id", ""))
+
+
+@lru_cache(maxsize=1024)
+def _date_epoch(date: str) -> int:
+    return int(datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=UTC).timestamp())
+
+
+class BaseReservationRepository(ABC):
+    """Reservation rules over any storage: validation, allocation, re-seating, pacing and availability.
+
+    Subclasses store reservations, slot claims and pacing counters, and
+    commit each change atomically; everything else is shared.
+    """
 
     def __init__(self) -> None:
-        self.client = db_client
-        self._seed_tables()
+        self.catalog = self._create_catalog()
+        self.availability_cache = AvailabilityCache(
+            settings.availability_cache_max_entries,
+            settings.availability_cache_ttl_seconds,
+        )
 
-    def _now_iso(self) -> str:
-        return datetime.now(UTC).isoformat()
+    @abstractmethod
+    def _create_catalog(self) -> TableCatalog:
+        """Table catalog read from this storage."""
 
-    def _ttl_from_reservation_datetime(self, date: str, time: str, keep_days: int) -> int:
-        base_dt = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M").replace(tzinfo=UTC)
-        return int((base_dt + timedelta(days=keep_days)).timestamp())
+    @abstractmethod
+    def seed_tables(self) -> int:
+        """Create the default tables that are missing; returns how many were written."""
 
-    def _seed_tables(self) -> None:
-        try:
-            for table in DEFAULT_TABLES:
-                key = {"PK": f"TABLE#{table['table_id']}", "SK": "META"}
-                existing = self.client.get_item(key)
-                if existing:
-                    continue
+    @abstractmethod
+    def get_reservation(self, reservation_id: str) -> dict[str, Any] | None:
+        """The stored reservation, or ``None`` if there is none with that id."""
 
-                self.client.put_item(
-                    {
-                        **key,
-                        "entity_type": "table",
-                        "table_id": table["table_id"],
-                        "zone": table["zone"],
-                        "capacity_min": table["capacity_min"],
-                        "capacity_max": table["capacity_max"],
-                        "priority": table["priority"],
-                        "is_active": table["is_active"],
-                        "created_at": self._now_iso(),
-                    }
-                )
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Could not seed table catalog: %s", str(exc))
+    @abstractmethod
+    def query_reservations_by_date(self, date: str) -> list[dict[str, Any]]:
+        """Every reservation of ``date``, whatever its status."""
 
-    def _normalize_zone(self, preference: str) -> str | None:
-        pref = (preference or "").lower()
-        if "terraza" in pref:
-            return "terraza"
-        if "salon" in pref or "salón" in pref or "interior" in pref:
-            return "salon"
-        return None
+    @abstractmethod
+    def query_reservations_by_status(self, status: str, date: str | None = None) -> list[dict[str, Any]]:
+        """Reservations with ``status``, optionally only those of ``date``."""
 
-    def _reservation_duration(self, num_people: int) -> int:
-        _ = num_people
-        return DEFAULT_RESERVATION_DURATION_MINUTES
+    @abstractmethod
+    def scan_all_reservations(self, status_filter: str | None = None) -> list[dict[str, Any]]:
+        """Every reservation, optionally only those with ``status_filter``."""
 
-    def _slot_keys(self, date: str, time: str, duration_minutes: int) -> list[str]:
-        start = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M")
-        count = max(1, (duration_minutes + SLOT_MINUTES - 1) // SLOT_MINUTES)
-        return [
-            (start + timedelta(minutes=index * SLOT_MINUTES)).strftime("%Y-%m-%d#%H:%M")
-            for index in range(count)
-        ]
+    @abstractmethod
+    def count_reservations_by_status(self) -> dict[str, int]:
+        """Reservations per status."""
 
-    def _validate_date_time(self, date: str, time: str) -> tuple[bool, str]:
-        try:
-            day = datetime.strptime(date, "%Y-%m-%d")
-        except ValueError:
-            return False, "Formato de fecha inválido. Usa YYYY-MM-DD"
+    @abstractmethod
+    def list_reservations(
+        self,
+        *,
+        date: str = "",
+        status: str = "all",
+        customer_name: str = "",
+        phone: str = "",
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Matching reservations by date, time and id; at most ``limit`` of them."""
 
-        try:
-            parsed_time = datetime.strptime(time, "%H:%M")
-        except ValueError:
-            return False, "Formato de hora inválido. Usa HH:MM"
+    @abstractmethod
+    def query_occupancy_by_date(self, date: str, *, before: str | None = None) -> list[dict[str, Any]]:
+        """Slot claims of one date, optionally only those before ``before``."""
 
-        if parsed_time.minute not in (0, 30):
-            return False, "Solo hay reservas cada 30 minutos (por ejemplo 20:00 o 20:30)"
+    @abstractmethod
+    def slot_owners(self, date: str) -> dict[tuple[str, str], str]:
+        """Reservation holding each claimed ``(table_id, slot_key)`` of ``date``."""
 
-        reservation_dt = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M").replace(tzinfo=UTC)
-        if reservation_dt < datetime.now(UTC):
-            return False, "No se pueden crear reservas en fechas/horas pasadas"
+    @abstractmethod
+    def _load_day_occupancy(self, date: str) -> DayOccupancy:
+        """Occupancy of a service day with reservation ownership."""
 
-        weekday = day.weekday()  # Monday = 0
-        hour = parsed_time.hour
-        minute = parsed_time.minute
+    @abstractmethod
+    def _load_slot_occupancy(
+        self,
+        date: str,
+        tables: list[dict[str, Any]],
+        slot_keys: list[str],
+    ) -> DayOccupancy:
+        """Occupancy of only the ``tables`` and ``slot_keys`` of one request."""
 
-        if weekday == 0:
-            return False, "El restaurante está cerrado los lunes"
+    @abstractmethod
+    def _load_availability_summaries(self, dates: list[str]) -> dict[str, set[str]]:
+        """Occupied ``<time>#<table>`` entries per date."""
 
-        if weekday in (1, 2, 3):
-            lunch = (13 <= hour < 16) or (hour == 16 and minute == 0)
-            dinner = (20 <= hour < 23) or (hour == 23 and minute <= 30)
-            if lunch or dinner:
-                return True, ""
-            return False, "Martes a jueves: 13:00-16:00 y 20:00-23:30"
+    @abstractmethod
+    def rebuild_availability_summary(self, date: str) -> int:
+        """Recompute a date's summary from its claims; returns the slot count."""
 
-        if weekday in (4, 5):
-            valid = (13 <= hour <= 23) or (hour == 0 and minute == 0)
-            if valid:
-                return True, ""
-            return False, "Viernes y sábado: 13:00-00:00"
+    @abstractmethod
+    def _load_pacing(self, dates: list[str]) -> dict[str, dict[str, Any]]:
+        """Pacing counters per date, or nothing when no pacing rule is configured."""
 
-        if weekday == 6:
-            valid = 13 <= hour < 17 or (hour == 17 and minute == 0)
-            if valid:
-                return True, ""
-            return False, "Domingo: 13:00-17:00"
+    @abstractmethod
+    def _write_pacing(self, date: str, counters: dict[str, int]) -> None:
+        """Replace a date's pacing counters."""
 
-        return True, ""
+    @abstractmethod
+    def _commit_new_reservation(
+        self,
+        reservation: dict[str, Any],
+        slot_keys: list[str],
+    ) -> tuple[bool, str, dict[str, Any] | None]:
+        """Store a new reservation with its claims and pacing covers, all or nothing."""
 
-    def _active_tables(self) -> list[dict[str, Any]]:
-        tables = self.client.scan(
-            FilterExpression=Attr("entity_type").eq("table") & Attr("is_active").eq(True)
-        )
-        ordered = sorted(
-            tables,
-            key=lambda table: (
-                int(table.get("capacity_max", 99)),
-                int(table.get("priority", 99)),
-                str(table.get("table_id", "")),
-            ),
-        )
-        return ordered
+    @abstractmethod
+    def _commit_reservation_change(
+        self,
+        current: dict[str, Any],
+        merged: dict[str, Any],
+        new_slot_keys: list[str] | None,
+    ) -> tuple[bool, str, dict[str, Any] | None]:
+        """Commit a move, resize, status change or cancellation, all or nothing."""
 
-    def _slot_occupied(self, table_id: str, slot_key: str, reservation_id: str | None = None) -> bool:
-        item = self.client.get_item({"PK": f"TABLE#{table_id}", "SK": f"SLOT#{slot_key}"})
-        if not item:
-            return False
-        if reservation_id and item.get("reservation_id") == reservation_id:
-            return False
-        return item.get("status") in ACTIVE_STATUSES
+    def _now_iso(self) -> str:
+        return datetime.now(UTC).isoformat()
 
-    def _find_table_for_reservation(
+    def _normalize_zone(self, preference: str) -> str | None:
+        pref = (preference or "").lower()
+        if "terraza" in pref:
+            return "terraza"
+        if "salon" in pref or "salón" in pref or "interior" in pref:
+            return "salon"
+        return None
+
+    def _reservation_duration(self, num_people: int, date: str = "", time: str = "") -> int:
+        return opening_hours.reservation_duration(num_people, date, time)
+
+    def _slot_keys(self, date: str, time: str, duration_minutes: int) -> list[str]:
+        return build_slot_keys(date, time, duration_minutes)
+
+    def _validate_date_time(self, date: str, time: str) -> tuple[bool, str]:
+        return opening_hours.validate(date, time)
+
+    def _active_tables(self) -> list[dict[str, Any]]:
+        return self.catalog.active_tables()
+
+    def _candidate_tables(
         self,
-        date: str,
-        time: str,
+        tables: list[dict[str, Any]],
         num_people: int,
         preferences: str,
-        duration_minutes: int,
-        reservation_id: str | None = None,
-    ) -> tuple[dict[str, Any] | None, list[str]]:
-        slot_keys = self._slot_keys(date, time, duration_minutes)
+    ) -> list[dict[str, Any]]:
         preferred_zone = self._normalize_zone(preferences)
 
         candidates = [
             table
-            for table in self._active_tables()
+            for table in tables
             if int(table.get("capacity_min", 1)) <= num_people <= int(table.get("capacity_max", 999))
         ]
 
@@ -185,143 +217,230 @@ class ReservationRepository:
             if preferred:
                 candidates = preferred
 
-        for table in candidates:
-            if all(
-                not self._slot_occupied(table["table_id"], slot_key, reservation_id=reservation_id)
-                for slot_key in slot_keys
-            ):
-                return table, slot_keys
+        return candidates
 
-        return None, slot_keys
+    def _allocation_candidates(self, num_people: int, preferences: str) -> list[dict[str, Any]]:
+        """Tables and table combinations that fit the party, single tables first.
 
-    def _reservation_key(self, reservation_id: str) -> dict[str, str]:
-        return {"PK": f"RESERVATION#{reservation_id}", "SK": "DETAILS"}
+        Combinations are listed even when a single table fits, so a party
+        whose single table is taken can still be seated on a free combination.
+        """
+        return self._candidate_tables([*self._active_tables(), *self.catalog.combinations()], num_people, preferences)
 
-    def _customer_key(self, phone: str, date: str, time: str, reservation_id: str) -> dict[str, str]:
+    def availability_summary(self, date: str) -> set[str]:
+        """Occupied ``<time>#<table>`` entries of ``date`` as the availability summary records them."""
+        return self._load_availability_summaries([date])[date]
+
+    def _day_occupancy_from_summary(self, date: str, summaries: dict[str, set[str]]) -> DayOccupancy:
+        occupancy = DayOccupancy(date)
+        following = next_date(date)
+        for slot_date, entries in ((date, summaries.get(date, set())), (following, summaries.get(following, set()))):
+            for entry in entries:
+                if slot_date == following and entry >= SERVICE_DAY_ROLLOVER:
+                    continue
+                slot_time, table_id = entry.split("#", 1)
+                occupancy.add(table_id, slot_date, slot_time)
+        return occupancy
+
+    def _pacing_deltas(
+        self,
+        before: dict[str, Any] | None,
+        after: dict[str, Any] | None,
+    ) -> dict[str, dict[str, int]]:
+        """Net change of each pacing counter, by date, when ``before`` becomes ``after``.
+
+        Moving a booking within the same service nets the service counter to
+        zero, so it is neither re-checked nor touched. Dates without a pacing
+        rule keep no counters, so bookings on them write no PACE# item
+        (``rebuild_pacing`` fills them in if a rule is added later).
+        """
+        deltas: dict[str, dict[str, int]] = {}
+        for reservation, sign in ((before, -1), (after, 1)):
+            if not reservation or reservation.get("status") not in ACTIVE_STATUSES:
+                continue
+            if pacing.rule_for(reservation["date"]) is None:
+                continue
+            counters = deltas.setdefault(reservation["date"], {})
+            for attribute, covers in pacing.covers_by_attribute(
+                reservation["time"], sign * int(reservation["num_people"])
+            ).items():
+                counters[attribute] = counters.get(attribute, 0) + covers
         return {
-            "PK": f"CUSTOMER#{phone}",
-            "SK": f"RESERVATION#{date}#{time}#{reservation_id}",
+            date: {attribute: covers for attribute, covers in counters.items() if covers}
+            for date, counters in deltas.items()
+            if any(counters.values())
         }
 
-    def _save_customer_lookup(self, reservation: dict[str, Any]) -> None:
-        key = self._customer_key(
-            reservation["phone"], reservation["date"], reservation["time"], reservation["id"]
-        )
-        ttl_epoch = self._ttl_from_reservation_datetime(
-            reservation["date"],
-            reservation["time"],
-            LOOKUP_RETENTION_DAYS,
-        )
-        self.client.put_item(
-            {
-                **key,
-                "entity_type": "customer_lookup",
-                "reservation_id": reservation["id"],
-                "status": reservation["status"],
-                "date": reservation["date"],
-                "time": reservation["time"],
-                "ttl": ttl_epoch,
-                "updated_at": self._now_iso(),
-            }
-        )
+    def pacing_counters(self, date: str) -> dict[str, int]:
+        """Covers booked per slot and service attribute on ``date`` (empty without pacing rules)."""
+        stored = self._load_pacing([date]).get(date, {})
+        return {
+            attribute: int(covers)
+            for attribute, covers in stored.items()
+            if attribute.startswith(("slot_", "service_"))
+        }
 
-    def _delete_customer_lookup(self, reservation: dict[str, Any]) -> None:
-        self.client.delete_item(
-            self._customer_key(reservation["phone"], reservation["date"], reservation["time"], reservation["id"])
-        )
+    def rebuild_pacing(self, date: str) -> int:
+        """Recompute a date's pacing counters from its active reservations; returns the covers."""
+        counters: dict[str, int] = {}
+        for row in self.query_reservations_by_date(date):
+            if row.get("entity_type") != "reservation" or row.get("status") not in ACTIVE_STATUSES:
+                continue
+            for attribute, covers in pacing.covers_by_attribute(
+                str(row["time"]), int(row.get("num_people", 0))
+            ).items():
+                counters[attribute] = counters.get(attribute, 0) + covers
 
-    def _save_occupancy(
+        self._write_pacing(date, counters)
+        return sum(covers for attribute, covers in counters.items() if attribute.startswith("slot_"))
+
+    def _find_table_for_reservation(
         self,
-        table_id: str,
-        slot_keys: list[str],
-        reservation: dict[str, Any],
-    ) -> tuple[bool, str]:
-        created_keys: list[dict[str, str]] = []
+        date: str,
+        time: str,
+        num_people: int,
+        preferences: str,
+        duration_minutes: int,
+        reservation_id: str | None = None,
+        *,
+        occupancy: DayOccupancy | None = None,
+    ) -> tuple[dict[str, Any] | None, list[str]]:
+        slot_keys = self._slot_keys(date, time, duration_minutes)
+        candidates = self._allocation_candidates(num_people, preferences)
+        if not candidates:
+            return None, slot_keys
 
-        for slot_key in slot_keys:
-            key = {"PK": f"TABLE#{table_id}", "SK": f"SLOT#{slot_key}"}
-            slot_date, slot_time = slot_key.split("#", 1)
-            ttl_epoch = self._ttl_from_reservation_datetime(
-                slot_date,
-                slot_time,
-                OCCUPANCY_RETENTION_DAYS,
-            )
-            ok = self.client.put_item(
-                {
-                    **key,
-                    "entity_type": "occupancy",
-                    "table_id": table_id,
-                    "reservation_id": reservation["id"],
-                    "status": reservation["status"],
-                    "date": reservation["date"],
-                    "time": slot_key.split("#", 1)[1],
-                    "ttl": ttl_epoch,
-                    "updated_at": self._now_iso(),
-                },
-                condition_expression="attribute_not_exists(PK)",
-            )
+        if occupancy is None:
+            occupancy = self._load_slot_occupancy(date, candidates, slot_keys)
 
-            if not ok:
-                for created in created_keys:
-                    self.client.delete_item(created)
-                return False, f"El slot {slot_key} ya no estaba disponible"
+        table = occupancy.first_free(
+            candidates,
+            occupancy.request_mask(time, duration_minutes),
+            exclude_reservation=reservation_id,
+        )
+        return table, slot_keys
 
-            created_keys.append(key)
+    def _fits(self, table: dict[str, Any], num_people: int) -> bool:
+        return int(table.get("capacity_min", 1)) <= num_people <= int(table.get("capacity_max", 999))
 
-        return True, ""
+    def _reseat_for_request(
+        self,
+        date: str,
+        time: str,
+        num_people: int,
+        preferences: str,
+        duration_minutes: int,
+        reservation_id: str,
+    ) -> dict[str, Any] | None:
+        """Re-seat the day's active reservations so a request first-fit rejected fits.
+
+        Reservations keep their zone and only move to tables that fit their
+        party. Returns the table for the request, or ``None`` when no seating
+        exists or a move could not be applied.
+        """
+        tables = self._active_tables()
+        by_id = {table["table_id"]: table for table in tables}
+        request_candidates = self._allocation_candidates(num_people, preferences)
+        if not request_candidates:
+            return None
+
+        occupancy = self._load_day_occupancy(date)
+        fixed = {table_id: occupancy.table_mask(table_id, reservation_id) for table_id in by_id}
+        rows_by_id: dict[str, dict[str, Any]] = {}
+        bookings: list[Booking] = []
+
+        for row in self.query_reservations_by_date(date):
+            table = by_id.get(str(row.get("table_id", "")))
+            if (
+                row.get("entity_type") != "reservation"
+                or row.get("status") not in ACTIVE_STATUSES
+                or row.get("id") == reservation_id
+                or not table
+            ):
+                continue
+            held = occupancy.owned(row["id"]).get(table["table_id"], 0)
+            if not held:
+                continue
 
-    def _release_occupancy(self, table_id: str, slot_keys: list[str], reservation_id: str) -> None:
-        for slot_key in slot_keys:
-            self.client.delete_item(
-                {"PK": f"TABLE#{table_id}", "SK": f"SLOT#{slot_key}"},
-                condition_expression="reservation_id = :rid",
-                expression_attribute_values={":rid": reservation_id},
+            people = int(row.get("num_people", 1))
+            fixed[table["table_id"]] &= ~held
+            rows_by_id[row["id"]] = row
+            bookings.append(
+                Booking(
+                    reservation_id=row["id"],
+                    num_people=people,
+                    mask=held,
+                    candidates=tuple(
+                        candidate["table_id"]
+                        for candidate in tables
+                        if candidate.get("zone") == table.get("zone") and self._fits(candidate, people)
+                    ),
+                    table_id=table["table_id"],
+                )
             )
 
-    def _build_reservation_item(self, reservation: dict[str, Any]) -> dict[str, Any]:
-        ttl_epoch = self._ttl_from_reservation_datetime(
-            reservation["date"],
-            reservation["time"],
-            RESERVATION_RETENTION_DAYS,
+        request = Booking(
+            reservation_id=reservation_id,
+            num_people=num_people,
+            mask=occupancy.request_mask(time, duration_minutes),
+            candidates=tuple(table["table_id"] for table in request_candidates),
         )
-        return {
-            **self._reservation_key(reservation["id"]),
-            "entity_type": "reservation",
-            "GSI1PK": f"DATE#{reservation['date']}",
-            "GSI1SK": f"TIME#{reservation['time']}#RES#{reservation['id']}",
-            "id": reservation["id"],
-            "date": reservation["date"],
-            "time": reservation["time"],
-            "status": reservation["status"],
-            "num_people": reservation["num_people"],
-            "customer_name": reservation["customer_name"],
-            "phone": reservation["phone"],
-            "preferences": reservation.get("preferences", ""),
-            "special_occasion": reservation.get("special_occasion", ""),
-            "table_id": reservation.get("table_id", ""),
-            "table_zone": reservation.get("table_zone", ""),
-            "duration_min": reservation["duration_min"],
-            "ttl": ttl_epoch,
-            "created_at": reservation["created_at"],
-            "updated_at": reservation["updated_at"],
-        }
+        plan = plan_reseating(bookings, request, fixed)
+        if plan is None:
+            return None
+
+        table_id, moves = plan
+        for move in moves:
+            if not self._move_reservation(rows_by_id[move.booking.reservation_id], by_id[move.table_id]):
+                logger.warning("Re-seating aborted: could not move %s", move.booking.reservation_id)
+                return None
+
+        logger.info("Re-seated %s reservations on %s to fit %s", len(moves), date, reservation_id)
+        # The request may land on a table combination, which only its candidates list.
+        return next(candidate for candidate in request_candidates if candidate["table_id"] == table_id)
+
+    def _move_reservation(self, reservation: dict[str, Any], table: dict[str, Any]) -> bool:
+        moved, _, _ = self._commit_reservation_change(
+            reservation,
+            {
+                **reservation,
+                "table_id": table["table_id"],
+                "table_zone": table.get("zone", "salon"),
+                "updated_at": self._now_iso(),
+            },
+            self._slot_keys(
+                reservation["date"],
+                reservation["time"],
+                int(reservation.get("duration_min", DEFAULT_RESERVATION_DURATION_MINUTES)),
+            ),
+        )
+        return moved
 
-    def get_reservation(self, reservation_id: str) -> dict[str, Any] | None:
-        return self.client.get_item(self._reservation_key(reservation_id))
+    def _invalidate_availability(self, slot_keys: list[str]) -> None:
+        # A date's availability also depends on the next day's after-midnight slots.
+        dates: set[str] = set()
+        for slot_key in slot_keys:
+            slot_date = slot_key.split("#", 1)[0]
+            previous = (datetime.strptime(slot_date, "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d")
+            dates.update((slot_date, previous))
+        self.availability_cache.invalidate_dates(dates)
 
-    def create_reservation(self, payload: dict[str, Any]) -> tuple[bool, str, dict[str, Any] | None]:
+    def _prepare_reservation(self, payload: dict[str, Any]) -> tuple[str, dict[str, Any] | None]:
+        """Validate a create payload and build the reservation, or return the error."""
         valid, message = self._validate_date_time(payload["date"], payload["time"])
         if not valid:
-            return False, message, None
+            return message, None
 
         if payload["num_people"] < 1 or payload["num_people"] > 12:
-            return False, "El número de personas debe estar entre 1 y 12", None
+            return "El número de personas debe estar entre 1 y 12", None
 
         reservation_id = payload.get("id") or f"RES-{payload['date'].replace('-', '')}-{uuid4().hex[:6].upper()}"
-        duration = payload.get("duration_min") or self._reservation_duration(payload["num_people"])
+        duration = payload.get("duration_min") or self._reservation_duration(
+            payload["num_people"], payload["date"], payload["time"]
+        )
         now = self._now_iso()
 
-        reservation = {
+        return "", {
             "id": reservation_id,
             "date": payload["date"],
             "time": payload["time"],
@@ -336,119 +455,1048 @@ class ReservationRepository:
             "updated_at": now,
         }
 
-        table, slot_keys = self._find_table_for_reservation(
+    def create_reservation(self, payload: dict[str, Any]) -> tuple[bool, str, dict[str, Any] | None]:
+        error, reservation = self._prepare_reservation(payload)
+        if reservation is None:
+            return False, error, None
+
+        request = self._allocation_request(reservation)
+        table, slot_keys = self._find_table_for_reservation(*request, reservation_id=reservation["id"])
+        if not table and settings.allocation_reseating:
+            table = self._reseat_for_request(*request, reservation["id"])
+        if not table:
+            return False, NO_TABLES_MESSAGE, None
+
+        self._assign_table(reservation, table)
+        return self._commit_new_reservation(reservation, slot_keys)
+
+    def _allocation_request(self, reservation: dict[str, Any]) -> tuple[str, str, int, str, int]:
+        """Date, time, party size, preferences and duration to find ``reservation`` a table with."""
+        return (
             reservation["date"],
             reservation["time"],
-            reservation["num_people"],
-            reservation["preferences"],
-            reservation["duration_min"],
-            reservation_id=reservation_id,
+            int(reservation["num_people"]),
+            reservation.get("preferences", ""),
+            int(reservation["duration_min"]),
         )
 
-        if not table:
-            return False, "No hay mesas disponibles para ese horario", None
-
+    def _assign_table(self, reservation: dict[str, Any], table: dict[str, Any]) -> None:
         reservation["table_id"] = table["table_id"]
         reservation["table_zone"] = table.get("zone", "salon")
 
-        saved = self.client.put_item(
-            self._build_reservation_item(reservation),
-            condition_expression="attribute_not_exists(PK)",
-        )
-        if not saved:
-            return False, "No se pudo guardar la reserva (puede que el ID ya exista)", None
-
-        self._save_customer_lookup(reservation)
-
+    def _new_reservation_result(
+        self,
+        reservation: dict[str, Any],
+        slot_keys: list[str],
+        committed: bool,
+        error: str,
+    ) -> tuple[bool, str, dict[str, Any] | None]:
         if reservation["status"] in ACTIVE_STATUSES:
-            occupancy_saved, occupancy_error = self._save_occupancy(table["table_id"], slot_keys, reservation)
-            if not occupancy_saved:
-                self.client.delete_item(self._reservation_key(reservation["id"]))
-                self._delete_customer_lookup(reservation)
-                return False, occupancy_error, None
-
-        return True, "", reservation
+            # Committed or beaten to a slot, cached answers for these dates are stale.
+            self._invalidate_availability(slot_keys)
+        return (True, "", reservation) if committed else (False, error, None)
+
+    def slot_claims(self, reservation: dict[str, Any]) -> set[tuple[str, str]]:
+        """``(table_id, slot_key)`` pairs ``reservation`` holds while it is active."""
+        return self._held_claims(reservation)
+
+    def _held_claims(self, reservation: dict[str, Any], slot_keys: list[str] | None = None) -> set[tuple[str, str]]:
+        """(member table, slot_key) pairs an active reservation holds."""
+        if reservation.get("status") not in ACTIVE_STATUSES or not reservation.get("table_id"):
+            return set()
+        if slot_keys is None:
+            slot_keys = self._slot_keys(
+                reservation["date"],
+                reservation["time"],
+                int(reservation.get("duration_min", DEFAULT_RESERVATION_DURATION_MINUTES)),
+            )
+        return {(member, slot_key) for member in table_members(reservation["table_id"]) for slot_key in slot_keys}
 
-    def update_reservation(self, reservation_id: str, updates: dict[str, Any]) -> tuple[bool, str, dict[str, Any] | None]:
-        current = self.get_reservation(reservation_id)
-        if not current:
-            return False, "No existe la reserva indicada", None
+    def _claim_changes(
+        self,
+        current: dict[str, Any],
+        merged: dict[str, Any],
+        new_slot_keys: list[str] | None,
+    ) -> tuple[list[tuple[str, str]], list[tuple[str, str]], list[tuple[str, str]]]:
+        """Claims added, released and kept (only when the status changes) turning ``current`` into ``merged``."""
+        old_claims = self._held_claims(current)
+        if merged["status"] not in ACTIVE_STATUSES:
+            new_claims: set[tuple[str, str]] = set()
+        elif new_slot_keys is None:
+            new_claims = old_claims
+        else:
+            new_claims = self._held_claims(merged, new_slot_keys)
+        added = sorted(new_claims - old_claims)
+        released = sorted(old_claims - new_claims)
+        kept = sorted(old_claims & new_claims) if current.get("status") != merged["status"] else []
+        return added, released, kept
 
+    def _change_result(
+        self,
+        merged: dict[str, Any],
+        touched: list[str],
+        committed: bool,
+        error: str,
+    ) -> tuple[bool, str, dict[str, Any] | None]:
+        if touched:
+            self._invalidate_availability(touched)
+        return (True, "", merged) if committed else (False, error, None)
+
+    def _merge_update(
+        self,
+        current: dict[str, Any],
+        updates: dict[str, Any],
+    ) -> tuple[str, dict[str, Any] | None, bool]:
+        """Apply and validate ``updates``; returns (error, merged, whether the table must be re-allocated)."""
         merged = {**current, **updates}
-        merged["id"] = reservation_id
         merged["status"] = merged.get("status", "pending").lower()
         merged["updated_at"] = self._now_iso()
 
         if merged["status"] not in VALID_STATUSES:
-            return False, "Estado inválido. Usa pending, confirmed o cancelled", None
+            return "Estado inválido. Usa pending, confirmed o cancelled", None, False
 
         if int(merged["num_people"]) < 1 or int(merged["num_people"]) > 12:
-            return False, "El número de personas debe estar entre 1 y 12", None
-
-        if not merged.get("duration_min"):
-            merged["duration_min"] = self._reservation_duration(int(merged["num_people"]))
+            return "El número de personas debe estar entre 1 y 12", None, False
 
-        current_active = current.get("status") in ACTIVE_STATUSES
-        target_active = merged.get("status") in ACTIVE_STATUSES
+        resized = any(current.get(field) != merged.get(field) for field in ("date", "time", "num_people"))
+        if not updates.get("duration_min") and (resized or not merged.get("duration_min")):
+            merged["duration_min"] = self._reservation_duration(
+                int(merged["num_people"]), merged["date"], merged["time"]
+            )
 
         date_or_time_changed = (
             current.get("date") != merged.get("date") or current.get("time") != merged.get("time")
         )
-        if target_active or date_or_time_changed:
+        if merged["status"] in ACTIVE_STATUSES or date_or_time_changed:
             valid, message = self._validate_date_time(merged["date"], merged["time"])
             if not valid:
-                return False, message, None
+                return message, None, False
 
         reallocate = any(
             current.get(field) != merged.get(field)
             for field in ("date", "time", "num_people", "preferences", "status")
         )
+        return "", merged, reallocate
+
+    def update_reservation(self, reservation_id: str, updates: dict[str, Any]) -> tuple[bool, str, dict[str, Any] | None]:
+        current = self.get_reservation(reservation_id)
+        if not current:
+            return False, NOT_FOUND_MESSAGE, None
+
+        error, merged, reallocate = self._merge_update(current, {**updates, "id": reservation_id})
+        if merged is None:
+            return False, error, None
+        target_active = merged["status"] in ACTIVE_STATUSES
 
         new_slot_keys: list[str] = []
         if target_active and reallocate:
-            table, new_slot_keys = self._find_table_for_reservation(
-                merged["date"],
-                merged["time"],
-                int(merged["num_people"]),
-                merged.get("preferences", ""),
-                int(merged["duration_min"]),
-                reservation_id=reservation_id,
-            )
+            request = self._allocation_request(merged)
+            table, new_slot_keys = self._find_table_for_reservation(*request, reservation_id=reservation_id)
+            if not table and settings.allocation_reseating:
+                table = self._reseat_for_request(*request, reservation_id)
             if not table:
-                return False, "No hay disponibilidad para los cambios solicitados", None
-            merged["table_id"] = table["table_id"]
-            merged["table_zone"] = table.get("zone", "salon")
+                return False, NO_TABLES_FOR_CHANGES_MESSAGE, None
+            self._assign_table(merged, table)
 
-        if target_active and reallocate:
-            ok, error = self._save_occupancy(merged["table_id"], new_slot_keys, merged)
-            if not ok:
-                return False, error, None
-
-        if current_active and current.get("table_id"):
-            old_slots = self._slot_keys(
-                current["date"],
-                current["time"],
-                int(current.get("duration_min", DEFAULT_RESERVATION_DURATION_MINUTES)),
+        return self._commit_reservation_change(current, merged, new_slot_keys if reallocate else None)
+
+    def cancel_reservation(self, reservation_id: str) -> tuple[bool, str, dict[str, Any] | None]:
+        return self.update_reservation(reservation_id, {"status": "cancelled"})
+
+    def service_report(self, date: str) -> dict[str, dict[str, Any]]:
+        """Seated covers per service, compared with a greedy first-fit replay.
+
+        ``greedy_covers`` replays the day's active reservations in creation
+        order with first-fit on an empty floor, so ``covers - greedy_covers``
+        is what re-seating gained over the greedy policy.
+        """
+        tables = self._active_tables()
+        seats = sum(int(table.get("capacity_max", 0)) for table in tables)
+        reservations = sorted(
+            (
+                row
+                for row in self.query_reservations_by_date(date)
+                if row.get("entity_type") == "reservation" and row.get("status") in ACTIVE_STATUSES
+            ),
+            key=lambda row: (str(row.get("created_at", "")), str(row.get("id", ""))),
+        )
+
+        occupancy = DayOccupancy(date)
+        greedy = greedy_seated(
+            [
+                Booking(
+                    reservation_id=row["id"],
+                    num_people=int(row.get("num_people", 1)),
+                    mask=occupancy.request_mask(
+                        row["time"],
+                        int(row.get("duration_min", DEFAULT_RESERVATION_DURATION_MINUTES)),
+                    ),
+                    candidates=tuple(
+                        table["table_id"]
+                        for table in self._allocation_candidates(
+                            int(row.get("num_people", 1)), row.get("preferences", "")
+                        )
+                    ),
+                )
+                for row in reservations
+            ]
+        )
+        greedy_ids = {booking.reservation_id for booking in greedy}
+
+        report: dict[str, dict[str, Any]] = {
+            service: {"reservations": 0, "covers": 0, "greedy_covers": 0, "seats": seats}
+            for service in ("lunch", "dinner")
+        }
+        for row in reservations:
+            time = str(row.get("time", ""))
+            service = opening_hours.service_for(time)
+            people = int(row.get("num_people", 0))
+            report[service]["reservations"] += 1
+            report[service]["covers"] += people
+            if row["id"] in greedy_ids:
+                report[service]["greedy_covers"] += people
+        return report
+
+    def _bookable_times(self, date: str) -> list[str]:
+        return opening_hours.bookable_times(date)
+
+    def _free_times(
+        self,
+        occupancy: DayOccupancy,
+        tables: list[dict[str, Any]],
+        times: list[str],
+        num_people: int,
+        pace: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        available: list[dict[str, Any]] = []
+        for time in times:
+            # A date with a rule but no PACE# item yet has booked no covers, not unlimited ones.
+            if not pacing.admits(pace or {}, occupancy.date, time, num_people):
+                continue
+            duration = self._reservation_duration(num_people, occupancy.date, time)
+            table = occupancy.first_free(tables, occupancy.request_mask(time, duration))
+            if table:
+                available.append(
+                    {
+                        "time": time,
+                        "table_id": table["table_id"],
+                        "zone": table.get("zone", "salon"),
+                    }
+                )
+        return available
+
+    def _availability_key(self, date: str, num_people: int, preferred_zone: str) -> tuple[str, int, str]:
+        return date, num_people, self._normalize_zone(preferred_zone) or ""
+
+    def available_times(self, date: str, num_people: int, preferred_zone: str = "") -> list[dict[str, Any]]:
+        cache_key, generation, cached = self._cached_availability(date, num_people, preferred_zone)
+        if cached is not None:
+            return cached
+
+        times = self._bookable_times(date)
+        tables = self._allocation_candidates(num_people, preferred_zone) if times else []
+        available: list[dict[str, Any]] = []
+        if tables:
+            # One summary read for the whole date; every time is then a bitmask check.
+            summaries = self._load_availability_summaries([date, next_date(date)])
+            occupancy = self._day_occupancy_from_summary(date, summaries)
+            pace = self._load_pacing([date]).get(date)
+            available = self._free_times(occupancy, tables, times, num_people, pace)
+        return self._cache_availability(cache_key, generation, available)
+
+    def _cached_availability(
+        self,
+        date: str,
+        num_people: int,
+        preferred_zone: str,
+    ) -> tuple[tuple[str, int, str], int, list[dict[str, Any]] | None]:
+        """Cache key, the date's cache generation and the cached answer (``None`` on a miss)."""
+        cache_key = self._availability_key(date, num_people, preferred_zone)
+        cached = self.availability_cache.get(cache_key)
+        if cached is not None:
+            return cache_key, 0, list(cached)
+        return cache_key, self.availability_cache.generation(date), None
+
+    def _cache_availability(
+        self,
+        cache_key: tuple[str, int, str],
+        generation: int,
+        available: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        self.availability_cache.put(cache_key, available, generation)
+        return list(available)
+
+    def find_next_available(
+        self,
+        start_date: str,
+        end_date: str,
+        num_people: int,
+        preferred_zone: str = "",
+        limit: int = 5,
+    ) -> list[dict[str, Any]]:
+        """Earliest free slots across a date range, ordered by date and time.
+
+        Dates already in the availability cache are not read again; the
+        summaries of all the others (plus their next days, for after-midnight
+        slots) come from a single BatchGetItem. The result stops at ``limit``
+        slots.
+        """
+        try:
+            start = datetime.strptime(start_date, "%Y-%m-%d")
+            end = datetime.strptime(end_date or start_date, "%Y-%m-%d")
+        except ValueError:
+            return []
+
+        days = min((end - start).days + 1, MAX_SEARCH_DAYS)
+        if days < 1 or limit < 1:
+            return []
+
+        tables = self._allocation_candidates(num_people, preferred_zone)
+        if not tables:
+            return []
+
+        dates = [(start + timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range(days)]
+        bookable = {date: self._bookable_times(date) for date in dates}
+        cached = {
+            date: self.availability_cache.get(self._availability_key(date, num_people, preferred_zone))
+            for date in dates
+            if bookable[date]
+        }
+        generations = {date: self.availability_cache.generation(date) for date in cached}
+
+        missing = [date for date, free in cached.items() if free is None]
+        summaries = (
+            self._load_availability_summaries(sorted({*missing, *(next_date(date) for date in missing)}))
+            if missing
+            else {}
+        )
+        paces = self._load_pacing(missing)
+
+        found: list[dict[str, Any]] = []
+        for date in dates:
+            if not bookable[date]:
+                continue
+
+            free = cached[date]
+            if free is None:
+                occupancy = self._day_occupancy_from_summary(date, summaries)
+                free = self._free_times(occupancy, tables, bookable[date], num_people, paces.get(date))
+                self.availability_cache.put(
+                    self._availability_key(date, num_people, preferred_zone), free, generations[date]
+                )
+
+            for slot in free:
+                found.append({"date": date, **slot})
+                if len(found) >= limit:
+                    return found
+
+        return found
+
+    def nearest_alternatives(
+        self,
+        date: str,
+        time: str,
+        num_people: int,
+        preferences: str = "",
+        k: int = 3,
+    ) -> list[dict[str, Any]]:
+        """The ``k`` feasible slots closest to a requested one that was full.
+
+        Candidates are the same day within ``ALTERNATIVE_SLOT_RADIUS`` slots,
+        then the same window on adjacent days; within a day the preferred zone
+        ranks first, then the smallest time distance. All dates are read from
+        the availability summaries with a single BatchGetItem.
+        """
+        try:
+            requested = datetime.strptime(date, "%Y-%m-%d")
+            requested_slot = slot_index(time)
+        except ValueError:
+            return []
+
+        preferred_zone = self._normalize_zone(preferences)
+        candidates = self._allocation_candidates(num_people, "")
+        if not candidates or k < 1:
+            return []
+        preferred = [table for table in candidates if table.get("zone") == preferred_zone]
+        others = [table for table in candidates if table.get("zone") != preferred_zone]
+
+        days = [
+            (abs(offset), (requested + timedelta(days=offset)).strftime("%Y-%m-%d"))
+            for offset in range(-ALTERNATIVE_DAY_RADIUS, ALTERNATIVE_DAY_RADIUS + 1)
+        ]
+        bookable = {day: self._bookable_times(day) for _, day in days}
+        dates = [day for _, day in days if bookable[day]]
+        if not dates:
+            return []
+
+        summaries = self._load_availability_summaries(sorted({*dates, *(next_date(day) for day in dates)}))
+        paces = self._load_pacing(dates)
+
+        ranked: list[tuple[tuple[int, int, int, str], dict[str, Any]]] = []
+        for day_distance, day in days:
+            if day not in dates:
+                continue
+            occupancy = self._day_occupancy_from_summary(day, summaries)
+            for slot_time in bookable[day]:
+                distance = abs(slot_index(slot_time) - requested_slot)
+                if distance > ALTERNATIVE_SLOT_RADIUS or (day == date and slot_time == time):
+                    continue
+                if not pacing.admits(paces.get(day, {}), day, slot_time, num_people):
+                    continue
+                mask = occupancy.request_mask(
+                    slot_time, self._reservation_duration(num_people, day, slot_time)
+                )
+                zone_mismatch = 0
+                table = occupancy.first_free(preferred, mask)
+                if not table:
+                    zone_mismatch = 1 if preferred_zone else 0
+                    table = occupancy.first_free(others, mask)
+                if not table:
+                    continue
+                ranked.append(
+                    (
+                        (day_distance, zone_mismatch, distance, f"{day} {slot_time}"),
+                        {"date": day, "time": slot_time, "zone": table.get("zone", "salon")},
+                    )
+                )
+
+        ranked.sort(key=lambda entry: entry[0])
+        return [alternative for _, alternative in ranked[:k]]
+
+
+class ReservationRepository(BaseReservationRepository):
+    """Reservations, slot claims, summaries and pacing counters in the DynamoDB single table."""
+
+    def __init__(self, client: DynamoDBClient | None = None) -> None:
+        self.client = client if client is not None else get_db_client()
+        # Dates whose AVAIL# summary this process has seen exist (see _seed_availability_summaries).
+        self._seeded_summaries: set[str] = set()
+        super().__init__()
+
+    def _create_catalog(self) -> TableCatalog:
+        return TableCatalog(self.client, settings.table_catalog_ttl_seconds)
+
+    def _ttl_from_reservation_datetime(self, date: str, time: str, keep_days: int) -> int:
+        minutes = opening_hours.MINUTES_BY_TIME.get(time)
+        if minutes is None:
+            base_dt = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M").replace(tzinfo=UTC)
+            return int((base_dt + timedelta(days=keep_days)).timestamp())
+        return _date_epoch(date) + minutes * 60 + keep_days * 86400
+
+    def _table_item(self, table: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "PK": f"TABLE#{table['table_id']}",
+            "SK": "META",
+            "entity_type": "table",
+            "table_id": table["table_id"],
+            "zone": table["zone"],
+            "capacity_min": table["capacity_min"],
+            "capacity_max": table["capacity_max"],
+            "priority": table["priority"],
+            "is_active": table["is_active"],
+            "combinable_with": table["combinable_with"],
+            "created_at": self._now_iso(),
+        }
+
+    def seed_tables(self) -> int:
+        """Create the default tables that are missing; returns how many were written.
+
+        Idempotent: one BatchGet finds what exists, one BatchWrite adds the
+        missing tables (and ``combinable_with`` on tables created before it
+        existed), and the catalog version is bumped only if something changed.
+        Run it from ``scripts/seed_tables.py``, not on startup.
+        """
+        existing = {
+            str(item["table_id"]): item
+            for item in self.client.batch_get_items(
+                [{"PK": f"TABLE#{table['table_id']}", "SK": "META"} for table in DEFAULT_TABLES],
+                consistent_read=True,
+                strict=True,
             )
-            if target_active:
-                keep = {f"SLOT#{slot}" for slot in new_slot_keys if current.get("table_id") == merged.get("table_id")}
-                release = [slot for slot in old_slots if f"SLOT#{slot}" not in keep]
-            else:
-                release = old_slots
-            self._release_occupancy(current["table_id"], release, reservation_id)
+        }
+        pending = []
+        for table in DEFAULT_TABLES:
+            current = existing.get(table["table_id"])
+            if current is None:
+                pending.append(self._table_item(table))
+            elif "combinable_with" not in current and table["combinable_with"]:
+                pending.append({**current, "combinable_with": table["combinable_with"]})
+
+        if pending:
+            if not self.client.batch_put_items(pending):
+                raise RuntimeError("Could not write the table catalog")
+            self.catalog.bump_version()
+        return len(pending)
+
+    def _legacy_occupancy_key(self, table_id: str, slot_key: str) -> dict[str, str]:
+        return {"PK": f"TABLE#{table_id}", "SK": f"SLOT#{slot_key}"}
+
+    def _occupancy_key(self, table_id: str, slot_key: str) -> dict[str, str]:
+        slot_date, slot_time = slot_key.split("#", 1)
+        return {"PK": f"OCC#{slot_date}", "SK": f"{slot_time}#{table_id}"}
+
+    def query_occupancy_by_date(self, date: str, *, before: str | None = None) -> list[dict[str, Any]]:
+        key_condition = Key("PK").eq(f"OCC#{date}")
+        if before:
+            key_condition = key_condition & Key("SK").lt(before)
+        return self.client.query(KeyConditionExpression=key_condition)
+
+    def _add_occupancy_row(self, occupancy: DayOccupancy, row: dict[str, Any]) -> None:
+        if row.get("status") not in ACTIVE_STATUSES:
+            return
+        slot_time, table_id = str(row["SK"]).split("#", 1)
+        occupancy.add(
+            table_id,
+            str(row["PK"]).removeprefix("OCC#"),
+            slot_time,
+            str(row.get("reservation_id", "")),
+        )
 
-        self.client.put_item(self._build_reservation_item(merged))
+    def slot_owners(self, date: str) -> dict[tuple[str, str], str]:
+        """Reservation holding each claimed ``(table_id, slot_key)`` of ``date``."""
+        owners: dict[tuple[str, str], str] = {}
+        for row in self.query_occupancy_by_date(date):
+            if row.get("status") in ACTIVE_STATUSES:
+                slot_time, table_id = str(row["SK"]).split("#", 1)
+                owners[(table_id, f"{date}#{slot_time}")] = str(row.get("reservation_id", ""))
+        return owners
+
+    def _load_day_occupancy(self, date: str) -> DayOccupancy:
+        """Occupancy with reservation ownership, read from the occupancy rows."""
+        rows = self.query_occupancy_by_date(date) + self.query_occupancy_by_date(
+            next_date(date), before=SERVICE_DAY_ROLLOVER
+        )
+        return self._occupancy_from_rows(date, rows)
+
+    def _occupancy_from_rows(self, date: str, rows: list[dict[str, Any]]) -> DayOccupancy:
+        occupancy = DayOccupancy(date)
+        for row in rows:
+            self._add_occupancy_row(occupancy, row)
+        return occupancy
+
+    def _summary_key(self, date: str) -> dict[str, str]:
+        return {"PK": f"AVAIL#{date}", "SK": "SUMMARY"}
+
+    def _summary_entries(self, rows: list[dict[str, Any]]) -> set[str]:
+        return {str(row["SK"]) for row in rows if row.get("status") in ACTIVE_STATUSES}
+
+    def _apply_update(self, update: dict[str, Any]) -> bool:
+        return self.client.update_item(
+            update["Key"],
+            update_expression=update["UpdateExpression"],
+            condition_expression=update.get("ConditionExpression"),
+            expression_attribute_names=update.get("ExpressionAttributeNames"),
+            expression_attribute_values=update.get("ExpressionAttributeValues"),
+        )
 
-        old_lookup = self._customer_key(current["phone"], current["date"], current["time"], reservation_id)
-        new_lookup = self._customer_key(merged["phone"], merged["date"], merged["time"], reservation_id)
-        if old_lookup != new_lookup:
-            self.client.delete_item(old_lookup)
-        self._save_customer_lookup(merged)
+    def _summary_updates(self, action: str, claims: list[tuple[str, str]]) -> list[dict[str, Any]]:
+        """``ADD`` or ``DELETE`` of (table_id, slot_key) pairs, as one update per date summary.
 
-        return True, "", merged
+        String-set ADD/DELETE are atomic and commutative, so concurrent writers
+        never overwrite each other and no read is needed.
+        """
+        by_date: dict[str, set[str]] = {}
+        for table_id, slot_key in claims:
+            slot_date, slot_time = slot_key.split("#", 1)
+            by_date.setdefault(slot_date, set()).add(f"{slot_time}#{table_id}")
 
-    def cancel_reservation(self, reservation_id: str) -> tuple[bool, str, dict[str, Any] | None]:
-        return self.update_reservation(reservation_id, {"status": "cancelled"})
+        return [
+            {
+                "Key": self._summary_key(slot_date),
+                "UpdateExpression": f"{action} occupied :slots SET entity_type = :entity, #ttl = :ttl, updated_at = :now",
+                "ExpressionAttributeNames": {"#ttl": "ttl"},
+                "ExpressionAttributeValues": {
+                    ":slots": entries,
+                    ":entity": "availability_summary",
+                    ":ttl": self._ttl_from_reservation_datetime(slot_date, "00:00", OCCUPANCY_RETENTION_DAYS + 1),
+                    ":now": self._now_iso(),
+                },
+            }
+            for slot_date, entries in by_date.items()
+        ]
+
+    def _log_stale_summary(self, update: dict[str, Any]) -> None:
+        # A stale entry only hides a free slot until the next rebuild; it never allows a double booking.
+        logger.warning(
+            "Could not remove released slots from %s; run rebuild_availability_summary to repair it",
+            update["Key"]["PK"],
+        )
+
+    def _availability_summary_item(self, date: str, entries: set[str]) -> dict[str, Any]:
+        item: dict[str, Any] = {
+            **self._summary_key(date),
+            "entity_type": "availability_summary",
+            "ttl": self._ttl_from_reservation_datetime(date, "00:00", OCCUPANCY_RETENTION_DAYS + 1),
+            "updated_at": self._now_iso(),
+        }
+        if entries:
+            item["occupied"] = entries
+        return item
+
+    def _summary_put(self, date: str, entries: set[str], *, only_if_missing: bool) -> dict[str, Any]:
+        """``put_item`` arguments storing a date's summary, optionally only where there is none."""
+        return {
+            "item": self._availability_summary_item(date, entries),
+            "condition_expression": "attribute_not_exists(PK)" if only_if_missing else None,
+        }
+
+    def _write_availability_summary(self, date: str, entries: set[str], *, only_if_missing: bool) -> bool:
+        return self.client.put_item(**self._summary_put(date, entries, only_if_missing=only_if_missing))
+
+    def rebuild_availability_summary(self, date: str) -> int:
+        """Recompute a date's summary from its occupancy rows; returns the slot count."""
+        entries = self._summary_entries(self.query_occupancy_by_date(date))
+        self._write_availability_summary(date, entries, only_if_missing=False)
+        return len(entries)
+
+    def _summaries_from_items(self, items: list[dict[str, Any]]) -> dict[str, set[str]]:
+        return {
+            str(item["PK"]).removeprefix("AVAIL#"): {str(entry) for entry in item.get("occupied", set())}
+            for item in items
+        }
+
+    def _load_availability_summaries(self, dates: list[str]) -> dict[str, set[str]]:
+        """Occupied ``<time>#<table>`` entries per date, one BatchGetItem for all dates.
+
+        Dates without a summary yet are built from their occupancy rows and
+        stored only if no writer created the summary in the meantime.
+        """
+        items = self.client.batch_get_items([self._summary_key(date) for date in dates], consistent_read=True)
+        summaries = self._summaries_from_items(items)
+        for date in self._missing_summaries(dates, summaries):
+            summaries[date] = self._summary_entries(self.query_occupancy_by_date(date))
+            self._write_availability_summary(date, summaries[date], only_if_missing=True)
+        return summaries
+
+    def _missing_summaries(self, dates: list[str], summaries: dict[str, set[str]]) -> list[str]:
+        return [date for date in dates if date not in summaries]
+
+    def _unseeded_summary_dates(self, slot_keys: list[str]) -> list[str]:
+        return sorted({slot_key.split("#", 1)[0] for slot_key in slot_keys} - self._seeded_summaries)
+
+    def _seed_availability_summaries(self, slot_keys: list[str]) -> None:
+        """Make sure the dates of ``slot_keys`` have a summary before a write ADDs or DELETEs entries.
+
+        On a missing summary either update would create one holding only that
+        write's slots, leaving out the bookings already on the date, so it is
+        first built from the occupancy rows (a conditional create). Each date
+        is checked once per process; summaries are never removed before the
+        date has passed.
+        """
+        dates = self._unseeded_summary_dates(slot_keys)
+        if dates:
+            self._load_availability_summaries(dates)
+            self._seeded_summaries.update(dates)
+
+    def _pacing_update(self, date: str, counters: dict[str, int]) -> dict[str, Any] | None:
+        """ADD of ``counters`` to a date's pacing item, or ``None`` if it can never fit.
+
+        Increases are conditioned on the counter staying within its limit, so
+        the check and the claim are a single atomic write.
+        """
+        names = {"#ttl": "ttl"}
+        values: dict[str, Any] = {
+            ":entity": "pacing",
+            ":ttl": self._ttl_from_reservation_datetime(date, "00:00", OCCUPANCY_RETENTION_DAYS + 1),
+            ":now": self._now_iso(),
+        }
+        additions: list[str] = []
+        conditions: list[str] = []
+        for position, (attribute, covers) in enumerate(sorted(counters.items())):
+            names[f"#c{position}"] = attribute
+            values[f":c{position}"] = covers
+            additions.append(f"#c{position} :c{position}")
+            limit = pacing.limit_for(date, attribute)
+            if covers > 0 and limit:
+                if covers > limit:
+                    return None
+                values[f":max{position}"] = limit - covers
+                conditions.append(f"(attribute_not_exists(#c{position}) OR #c{position} <= :max{position})")
+
+        return {
+            "Key": pacing.pace_key(date),
+            "UpdateExpression": f"ADD {', '.join(additions)} SET entity_type = :entity, #ttl = :ttl, updated_at = :now",
+            "ConditionExpression": " AND ".join(conditions) or None,
+            "ExpressionAttributeNames": names,
+            "ExpressionAttributeValues": values,
+        }
+
+    def _load_pacing(self, dates: list[str]) -> dict[str, dict[str, Any]]:
+        """Pacing counters per date, or nothing when no pacing rule is configured."""
+        keys = self._pacing_keys(dates)
+        if not keys:
+            return {}
+        return self._pacing_from_items(self.client.batch_get_items(keys, consistent_read=True))
+
+    def _pacing_keys(self, dates: list[str]) -> list[dict[str, str]]:
+        """Keys of the dates' PACE# items; none without pacing rules, as nothing is kept then."""
+        if not settings.pacing_rules:
+            return []
+        return [pacing.pace_key(date) for date in dates]
+
+    def _pacing_from_items(self, items: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+        return {str(item["PK"]).removeprefix("PACE#"): item for item in items}
+
+    def _write_pacing(self, date: str, counters: dict[str, int]) -> None:
+        self.client.put_item(
+            {
+                **pacing.pace_key(date),
+                **counters,
+                "entity_type": "pacing",
+                "ttl": self._ttl_from_reservation_datetime(date, "00:00", OCCUPANCY_RETENTION_DAYS + 1),
+                "updated_at": self._now_iso(),
+            }
+        )
+
+    def _load_slot_occupancy(
+        self,
+        date: str,
+        tables: list[dict[str, Any]],
+        slot_keys: list[str],
+    ) -> DayOccupancy:
+        """Probe only the (table, slot) pairs of one request with BatchGetItem."""
+        keys = self._slot_occupancy_keys(tables, slot_keys)
+        return self._occupancy_from_rows(date, self.client.batch_get_items(keys))
+
+    def _slot_occupancy_keys(self, tables: list[dict[str, Any]], slot_keys: list[str]) -> list[dict[str, str]]:
+        return [
+            self._occupancy_key(member, slot_key)
+            for table in tables
+            for member in table_members(table["table_id"])
+            for slot_key in slot_keys
+        ]
+
+    def _reservation_key(self, reservation_id: str) -> dict[str, str]:
+        return {"PK": f"RESERVATION#{reservation_id}", "SK": "DETAILS"}
+
+    def _customer_key(self, phone: str, date: str, time: str, reservation_id: str) -> dict[str, str]:
+        return {
+            "PK": f"CUSTOMER#{phone}",
+            "SK": f"RESERVATION#{date}#{time}#{reservation_id}",
+        }
+
+    def _customer_lookup_item(self, reservation: dict[str, Any]) -> dict[str, Any]:
+        key = self._customer_key(
+            reservation["phone"], reservation["date"], reservation["time"], reservation["id"]
+        )
+        ttl_epoch = self._ttl_from_reservation_datetime(
+            reservation["date"],
+            reservation["time"],
+            LOOKUP_RETENTION_DAYS,
+        )
+        return {
+            **key,
+            "entity_type": "customer_lookup",
+            "reservation_id": reservation["id"],
+            "status": reservation["status"],
+            "date": reservation["date"],
+            "time": reservation["time"],
+            "ttl": ttl_epoch,
+            "updated_at": self._now_iso(),
+        }
+
+    def _occupancy_item(self, table_id: str, slot_key: str, reservation: dict[str, Any]) -> dict[str, Any]:
+        slot_date, slot_time = slot_key.split("#", 1)
+        return {
+            **self._occupancy_key(table_id, slot_key),
+            "entity_type": "occupancy",
+            "table_id": table_id,
+            "reservation_id": reservation["id"],
+            "status": reservation["status"],
+            "date": reservation["date"],
+            "slot_date": slot_date,
+            "time": slot_time,
+            "ttl": self._ttl_from_reservation_datetime(slot_date, slot_time, OCCUPANCY_RETENTION_DAYS),
+            "updated_at": self._now_iso(),
+        }
+
+    def _build_reservation_item(self, reservation: dict[str, Any]) -> dict[str, Any]:
+        ttl_epoch = self._ttl_from_reservation_datetime(
+            reservation["date"],
+            reservation["time"],
+            RESERVATION_RETENTION_DAYS,
+        )
+        return {
+            **self._reservation_key(reservation["id"]),
+            "entity_type": "reservation",
+            "GSI1PK": f"DATE#{reservation['date']}",
+            "GSI1SK": f"TIME#{reservation['time']}#RES#{reservation['id']}",
+            "id": reservation["id"],
+            "date": reservation["date"],
+            "time": reservation["time"],
+            "status": reservation["status"],
+            "num_people": reservation["num_people"],
+            "customer_name": reservation["customer_name"],
+            "phone": reservation["phone"],
+            "preferences": reservation.get("preferences", ""),
+            "special_occasion": reservation.get("special_occasion", ""),
+            "table_id": reservation.get("table_id", ""),
+            "table_zone": reservation.get("table_zone", ""),
+            "duration_min": reservation["duration_min"],
+            "version": int(reservation.get("version", 1)),
+            "ttl": ttl_epoch,
+            "created_at": reservation["created_at"],
+            "updated_at": reservation["updated_at"],
+        }
+
+    def get_reservation(self, reservation_id: str) -> dict[str, Any] | None:
+        return self.client.get_item(self._reservation_key(reservation_id))
+
+    def _failure_message(self, actions: list[tuple[dict[str, Any], str]], reasons: list[str]) -> str:
+        """Message of the first action whose condition cancelled the transaction."""
+        failed = next(
+            (position for position, code in enumerate(reasons) if code == "ConditionalCheckFailed"),
+            None,
+        )
+        return actions[failed][1] if failed is not None else SAVE_FAILED_MESSAGE
+
+    def _transact(self, actions: list[tuple[dict[str, Any], str]]) -> tuple[bool, str]:
+        """Run (action, failure message) pairs as one transaction.
+
+        On cancellation the message of the first action whose condition
+        failed is returned, e.g. the slot that was already taken.
+        """
+        committed, reasons = self.client.transact_write([action for action, _ in actions])
+        return self._transaction_result(actions, committed, reasons)
+
+    def _transaction_result(
+        self,
+        actions: list[tuple[dict[str, Any], str]],
+        committed: bool,
+        reasons: list[str],
+    ) -> tuple[bool, str]:
+        return (True, "") if committed else (False, self._failure_message(actions, reasons))
+
+    def _claim_actions(
+        self,
+        claims: list[tuple[str, str]],
+        reservation: dict[str, Any],
+        condition_expression: str,
+    ) -> list[tuple[dict[str, Any], str]]:
+        values = {":rid": reservation["id"]} if ":rid" in condition_expression else None
+        return [
+            (
+                {
+                    "Put": {
+                        "Item": self._occupancy_item(member, slot_key, reservation),
+                        "ConditionExpression": condition_expression,
+                        "ExpressionAttributeValues": values,
+                    }
+                },
+                f"El slot {slot_key} ya no estaba disponible",
+            )
+            for member, slot_key in claims
+        ]
+
+    def _legacy_occupancy_actions(
+        self,
+        added: list[tuple[str, str]],
+        released: list[tuple[str, str]],
+        reservation: dict[str, Any],
+    ) -> list[tuple[dict[str, Any], str]]:
+        """Mirror claim changes onto the pre-migration ``TABLE#<id>/SLOT#<date>#<time>`` rows.
+
+        Only with ``OCCUPANCY_LEGACY_KEYS``, while workers of the previous
+        release may still be running: they only check those keys, so claiming
+        both layouts keeps either release from booking a slot the other holds.
+        """
+        if not settings.occupancy_legacy_keys:
+            return []
+        actions: list[tuple[dict[str, Any], str]] = [
+            (
+                {
+                    "Put": {
+                        "Item": {
+                            **self._occupancy_item(member, slot_key, reservation),
+                            **self._legacy_occupancy_key(member, slot_key),
+                        },
+                        "ConditionExpression": "attribute_not_exists(PK)",
+                    }
+                },
+                f"El slot {slot_key} ya no estaba disponible",
+            )
+            for member, slot_key in added
+        ]
+        actions.extend(
+            (
+                {
+                    "Delete": {
+                        "Key": self._legacy_occupancy_key(member, slot_key),
+                        "ConditionExpression": "attribute_not_exists(PK) OR reservation_id = :rid",
+                        "ExpressionAttributeValues": {":rid": reservation["id"]},
+                    }
+                },
+                SAVE_FAILED_MESSAGE,
+            )
+            for member, slot_key in released
+        )
+        return actions
+
+    def _pacing_actions(
+        self,
+        before: dict[str, Any] | None,
+        after: dict[str, Any] | None,
+    ) -> list[tuple[dict[str, Any], str]] | None:
+        """Conditional pacing updates for a change, or ``None`` if a limit can never fit."""
+        actions: list[tuple[dict[str, Any], str]] = []
+        for date, counters in self._pacing_deltas(before, after).items():
+            update = self._pacing_update(date, counters)
+            if update is None:
+                return None
+            actions.append(({"Update": update}, PACING_FULL_MESSAGE))
+        return actions
+
+    def _new_reservation_actions(
+        self,
+        reservation: dict[str, Any],
+        slot_keys: list[str],
+    ) -> list[tuple[dict[str, Any], str]] | None:
+        """Transaction creating a reservation, or ``None`` if it can never fit the pacing limits.
+
+        Every action keeps the condition it had as a standalone write, so a
+        cancelled transaction leaves nothing behind and its cancellation
+        reasons point at the slot (or limit) that was already taken.
+        """
+        pacing_actions = self._pacing_actions(None, reservation)
+        if pacing_actions is None:
+            return None
+
+        actions: list[tuple[dict[str, Any], str]] = [
+            (
+                {
+                    "Put": {
+                        "Item": self._build_reservation_item(reservation),
+                        "ConditionExpression": "attribute_not_exists(PK)",
+                    }
+                },
+                DUPLICATE_ID_MESSAGE,
+            ),
+            ({"Put": {"Item": self._customer_lookup_item(reservation)}}, SAVE_FAILED_MESSAGE),
+        ]
+
+        if reservation["status"] in ACTIVE_STATUSES:
+            # Combined tables claim every member table's slots or none of them.
+            claims = sorted(self._held_claims(reservation, slot_keys))
+            actions.extend(self._claim_actions(claims, reservation, "attribute_not_exists(PK)"))
+            actions.extend(self._legacy_occupancy_actions(claims, [], reservation))
+            actions.extend(({"Update": update}, SAVE_FAILED_MESSAGE) for update in self._summary_updates("ADD", claims))
+        actions.extend(pacing_actions)
+        return actions
+
+    def _commit_new_reservation(
+        self,
+        reservation: dict[str, Any],
+        slot_keys: list[str],
+    ) -> tuple[bool, str, dict[str, Any] | None]:
+        actions = self._new_reservation_actions(reservation, slot_keys)
+        if actions is None:
+            return False, PACING_FULL_MESSAGE, None
+
+        if reservation["status"] in ACTIVE_STATUSES:
+            self._seed_availability_summaries(slot_keys)
+        committed, error = self._transact(actions)
+        return self._new_reservation_result(reservation, slot_keys, committed, error)
+
+    def _reservation_change(
+        self,
+        current: dict[str, Any],
+        merged: dict[str, Any],
+        new_slot_keys: list[str] | None,
+    ) -> tuple[list[tuple[dict[str, Any], str]], list[tuple[str, str]], list[str]] | None:
+        """Transaction turning ``current`` into ``merged``, releases left for after it and the slots it touches.
+
+        ``new_slot_keys`` is ``None`` when the table and slots stay as they
+        are. Slots held both before and after are left in place, so a move that
+        overlaps the reservation's own slots never conflicts with itself. The
+        reservation put is conditioned on the version that was read, so a
+        concurrent change makes this one fail instead of being overwritten.
+        Returns ``None`` if the change can never fit the pacing limits.
+        """
+        added, released, kept = self._claim_changes(current, merged, new_slot_keys)
+
+        pacing_actions = self._pacing_actions(current, merged)
+        if pacing_actions is None:
+            return None
+
+        expected_version = current.get("version")
+        merged["version"] = int(expected_version or 0) + 1
+        if expected_version is None:
+            version_condition = "attribute_exists(PK) AND attribute_not_exists(version)"
+            version_values = None
+        else:
+            version_condition = "version = :version"
+            version_values = {":version": expected_version}
+
+        actions: list[tuple[dict[str, Any], str]] = [
+            (
+                {
+                    "Put": {
+                        "Item": self._build_reservation_item(merged),
+                        "ConditionExpression": version_condition,
+                        "ExpressionAttributeValues": version_values,
+                    }
+                },
+                CONCURRENT_CHANGE_MESSAGE,
+            )
+        ]
+
+        old_lookup = self._customer_key(current["phone"], current["date"], current["time"], current["id"])
+        new_lookup = self._customer_lookup_item(merged)
+        if old_lookup != {"PK": new_lookup["PK"], "SK": new_lookup["SK"]}:
+            actions.append(({"Delete": {"Key": old_lookup}}, SAVE_FAILED_MESSAGE))
+        actions.append(({"Put": {"Item": new_lookup}}, SAVE_FAILED_MESSAGE))
+
+        actions.extend(self._claim_actions(added, merged, "attribute_not_exists(PK)"))
+        actions.extend(self._legacy_occupancy_actions(added, released, merged))
+        # Rows of this reservation are rewritten (status) or removed; a missing row is not an error.
+        actions.extend(self._claim_actions(kept, merged, "attribute_not_exists(PK) OR reservation_id = :rid"))
+        actions.extend(
+            (
+                {
+                    "Delete": {
+                        "Key": self._occupancy_key(member, slot_key),
+                        "ConditionExpression": "attribute_not_exists(PK) OR reservation_id = :rid",
+                        "ExpressionAttributeValues": {":rid": current["id"]},
+                    }
+                },
+                SAVE_FAILED_MESSAGE,
+            )
+            for member, slot_key in released
+        )
+        actions.extend(({"Update": update}, SAVE_FAILED_MESSAGE) for update in self._summary_updates("ADD", added))
+        # A transaction may not touch an item twice, so a summary that also gets an
+        # ADD has its DELETE applied after the commit; the rest commit with the change.
+        added_dates = {slot_key.split("#", 1)[0] for _, slot_key in added}
+        deferred = [claim for claim in released if claim[1].split("#", 1)[0] in added_dates]
+        in_transaction = [claim for claim in released if claim[1].split("#", 1)[0] not in added_dates]
+        actions.extend(
+            ({"Update": update}, SAVE_FAILED_MESSAGE) for update in self._summary_updates("DELETE", in_transaction)
+        )
+        actions.extend(pacing_actions)
+
+        touched = sorted({slot_key for _, slot_key in (*added, *released)})
+        return actions, deferred, touched
+
+    def _commit_reservation_change(
+        self,
+        current: dict[str, Any],
+        merged: dict[str, Any],
+        new_slot_keys: list[str] | None,
+    ) -> tuple[bool, str, dict[str, Any] | None]:
+        """Commit a move, resize, status change or cancellation as one transaction."""
+        change = self._reservation_change(current, merged, new_slot_keys)
+        if change is None:
+            return False, PACING_FULL_MESSAGE, None
+        actions, deferred, touched = change
+
+        self._seed_availability_summaries(touched)
+        committed, error = self._transact(actions)
+        result = self._change_result(merged, touched, committed, error)
+        if committed:
+            for update in self._summary_updates("DELETE", deferred):
+                if not self._apply_update(update):
+                    self._log_stale_summary(update)
+        return result
 
     def query_reservations_by_date(self, date: str) -> list[dict[str, Any]]:
         return self.client.query(
@@ -470,10 +1518,40 @@ class ReservationRepository:
 
     def scan_all_reservations(self, status_filter: str | None = None) -> list[dict[str, Any]]:
         if status_filter:
-            return self.client.scan(
+            return self.client.scan_all(
                 FilterExpression=Attr("entity_type").eq("reservation") & Attr("status").eq(status_filter)
             )
-        return self.client.scan(FilterExpression=Attr("entity_type").eq("reservation"))
+        return self.client.scan_all(FilterExpression=Attr("entity_type").eq("reservation"))
+
+    def count_reservations_by_status(self) -> dict[str, int]:
+        """Reservations per status, from a parallel scan projecting only ``status``."""
+        counts: Counter[str] = Counter()
+        stream = self.client.parallel_scan(**self._status_count_request())
+        for page in stream.pages():
+            counts.update(str(item.get("status")) for item in page)
+        if stream.failed:
+            logger.error("Counting reservations by status failed; returning no counts")
+            return {}
+        return dict(counts)
+
+    def _status_count_request(self) -> dict[str, Any]:
+        return {
+            "FilterExpression": Attr("entity_type").eq("reservation"),
+            "ProjectionExpression": "#status",
+            "ExpressionAttributeNames": {"#status": "status"},
+        }
+
+    def _listing_request(self, date: str, status: str) -> tuple[str, dict[str, Any], bool]:
+        """Operation and parameters feeding ``list_reservations``, and whether rows arrive sorted.
+
+        GSI1 sorts a day's reservations by ``TIME#<time>#RES#<id>``, the listing
+        order, so a limited date listing can stop reading early.
+        """
+        if date:
+            return "query", {"IndexName": "GSI1", "KeyConditionExpression": Key("GSI1PK").eq(f"DATE#{date}")}, True
+        if status in VALID_STATUSES:
+            return "query", {"IndexName": "StatusDateIndex", "KeyConditionExpression": Key("status").eq(status)}, False
+        return "scan", {"FilterExpression": Attr("entity_type").eq("reservation")}, False
 
     def list_reservations(
         self,
@@ -482,16 +1560,56 @@ class ReservationRepository:
         status: str = "all",
         customer_name: str = "",
         phone: str = "",
+        limit: int | None = None,
     ) -> list[dict[str, Any]]:
+        """Matching reservations by date, time and id; at most ``limit`` of them.
+
+        Rows are streamed page by page and only the first ``limit`` are kept,
+        so memory stays flat however large the table is.
+        """
         status = status.lower()
+        operation, request, ordered = self._listing_request(date, status)
+        stream = self.client.iter_query(**request) if operation == "query" else self.client.parallel_scan(**request)
+
+        reservations: list[dict[str, Any]] = []
+        for page in stream.pages():
+            rows = self._filter_reservations(page, status=status, customer_name=customer_name, phone=phone)
+            reservations = self._first_reservations(reservations, rows, limit, ordered=ordered)
+            if self._listing_complete(reservations, limit, ordered=ordered):
+                break
+        if stream.failed:
+            logger.error("Listing reservations failed; returning no rows instead of a partial list")
+            return []
+        return reservations
 
-        if date:
-            items = self.query_reservations_by_date(date)
-        elif status in VALID_STATUSES:
-            items = self.query_reservations_by_status(status)
-        else:
-            items = self.scan_all_reservations()
+    def _listing_complete(self, reservations: list[dict[str, Any]], limit: int | None, *, ordered: bool) -> bool:
+        """Whether no later page can change the listing: sorted rows and ``limit`` of them kept."""
+        return ordered and limit is not None and len(reservations) >= limit
 
+    def _first_reservations(
+        self,
+        kept: list[dict[str, Any]],
+        rows: list[dict[str, Any]],
+        limit: int | None,
+        *,
+        ordered: bool,
+    ) -> list[dict[str, Any]]:
+        """Merge a page of ``rows`` into the sorted ``kept`` list, trimmed to ``limit``."""
+        if ordered:
+            merged = kept + rows
+            return merged if limit is None else merged[:limit]
+        if limit is None:
+            return sorted(kept + rows, key=_listing_order)
+        return heapq.nsmallest(limit, kept + rows, key=_listing_order)
+
+    def _filter_reservations(
+        self,
+        items: list[dict[str, Any]],
+        *,
+        status: str,
+        customer_name: str,
+        phone: str,
+    ) -> list[dict[str, Any]]:
         reservations = [item for item in items if item.get("entity_type") == "reservation"]
 
         if status in VALID_STATUSES:
@@ -507,38 +1625,30 @@ class ReservationRepository:
             phone_query = phone.strip()
             reservations = [row for row in reservations if row.get("phone") == phone_query]
 
-        reservations.sort(key=lambda row: (row.get("date", ""), row.get("time", ""), row.get("id", "")))
         return reservations
 
-    def available_times(self, date: str, num_people: int, preferred_zone: str = "") -> list[dict[str, Any]]:
-        times = [
-            "13:00", "13:30", "14:00", "14:30", "15:00", "15:30", "16:00",
-            "20:00", "20:30", "21:00", "21:30", "22:00", "22:30", "23:00", "23:30",
-        ]
 
-        available: list[dict[str, Any]] = []
-        for time in times:
-            valid, _ = self._validate_date_time(date, time)
-            if not valid:
-                continue
+def build_reservation_repository() -> BaseReservationRepository:
+    if settings.reservation_backend == "sqlite":
+        from app.database.sqlite_repository import SqliteReservationRepository  # noqa: WPS433
 
-            table, _ = self._find_table_for_reservation(
-                date,
-                time,
-                num_people,
-                preferred_zone,
-                self._reservation_duration(num_people),
-            )
-            if table:
-                available.append(
-                    {
-                        "time": time,
-                        "table_id": table["table_id"],
-                        "zone": table.get("zone", "salon"),
-                    }
-                )
+        return SqliteReservationRepository(settings.sqlite_path)
+    repository = ReservationRepository()
+    if settings.dynamodb_backend == "memory":
+        # The in-process table starts empty in every process, so nothing else can seed it.
+        repository.seed_tables()
+    return repository
 
-        return available
+
+_reservation_repository: BaseReservationRepository | None = None
+_reservation_repository_lock = threading.Lock()
 
 
-reservation_repository = ReservationRepository()
+def get_reservation_repository() -> BaseReservationRepository:
+    """Process-wide repository, built on first use so workers start without touching storage."""
+    global _reservation_repository
+    if _reservation_repository is None:
+        with _reservation_repository_lock:
+            if _reservation_repository is None:
+                _reservation_repository = build_reservation_repository()
+    return _reservation_repository
@@ -0,0 +1,500 @@
+"""SQLite storage for single-node deployments.
+
+``SqliteReservationRepository`` gets every rule from ``BaseReservationRepository``
+(validation, allocation, re-seating, pacing limits, the availability cache)
+and stores reservations, slot claims and pacing counters in relational
+tables, where ``ReservationRepository`` uses DynamoDB items. Unique keys take the place of conditional
+puts: a slot is claimed by inserting its ``(slot_date, slot_time, table_id)``
+row, so two reservations can never hold it. Claims only exist for active
+reservations, so they double as the availability summary.
+
+Each write is one ``BEGIN IMMEDIATE`` transaction; WAL mode lets readers
+carry on while it commits. Connections are per thread.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from app.config import settings
+from app.database import pacing
+from app.database.availability import DayOccupancy, next_date, table_members
+from app.database.opening_hours import SERVICE_DAY_ROLLOVER
+from app.database.reservation_repository import (
+    CONCURRENT_CHANGE_MESSAGE,
+    DEFAULT_TABLES,
+    DUPLICATE_ID_MESSAGE,
+    OCCUPANCY_RETENTION_DAYS,
+    PACING_FULL_MESSAGE,
+    RESERVATION_RETENTION_DAYS,
+    SAVE_FAILED_MESSAGE,
+    VALID_STATUSES,
+    BaseReservationRepository,
+)
+from app.database.table_catalog import TableCatalog
+
+logger = logging.getLogger(__name__)
+
+RESERVATION_COLUMNS = (
+    "id",
+    "date",
+    "time",
+    "status",
+    "num_people",
+    "customer_name",
+    "phone",
+    "preferences",
+    "special_occasion",
+    "table_id",
+    "table_zone",
+    "duration_min",
+    "version",
+    "created_at",
+    "updated_at",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS restaurant_tables (
+    table_id TEXT PRIMARY KEY,
+    zone TEXT NOT NULL,
+    capacity_min INTEGER NOT NULL,
+    capacity_max INTEGER NOT NULL,
+    priority INTEGER NOT NULL,
+    is_active INTEGER NOT NULL,
+    combinable_with TEXT NOT NULL DEFAULT '[]',
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS catalog_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reservations (
+    id TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    status TEXT NOT NULL,
+    num_people INTEGER NOT NULL,
+    customer_name TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    preferences TEXT NOT NULL DEFAULT '',
+    special_occasion TEXT NOT NULL DEFAULT '',
+    table_id TEXT NOT NULL DEFAULT '',
+    table_zone TEXT NOT NULL DEFAULT '',
+    duration_min INTEGER NOT NULL,
+    version INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reservations_by_date ON reservations (date, time, id);
+CREATE INDEX IF NOT EXISTS reservations_by_status ON reservations (status, date);
+CREATE INDEX IF NOT EXISTS reservations_by_phone ON reservations (phone, date, time);
+CREATE TABLE IF NOT EXISTS occupancy (
+    slot_date TEXT NOT NULL,
+    slot_time TEXT NOT NULL,
+    table_id TEXT NOT NULL,
+    reservation_id TEXT NOT NULL,
+    PRIMARY KEY (slot_date, slot_time, table_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS occupancy_by_reservation ON occupancy (reservation_id);
+CREATE TABLE IF NOT EXISTS pacing (
+    date TEXT NOT NULL,
+    attribute TEXT NOT NULL,
+    covers INTEGER NOT NULL,
+    PRIMARY KEY (date, attribute)
+) WITHOUT ROWID;
+"""
+
+
+def _placeholders(count: int) -> str:
+    return ", ".join("?" * count)
+
+
+def _days_ago(days: int) -> str:
+    return (datetime.now(UTC) - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+class _Rejected(Exception):
+    """Rolls a write transaction back with the message shown to the customer."""
+
+
+class SqliteDatabase:
+    """A WAL-mode database file with one connection per thread."""
+
+    def __init__(self, path: str, busy_timeout_ms: int) -> None:
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection().executescript(SCHEMA)
+
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit mode: transactions are opened explicitly by ``transaction``.
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction holding the database write lock from its first statement."""
+        connection = self.connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+
+class SqliteTableCatalog(TableCatalog):
+    """``TableCatalog`` reading the tables and the catalog version from SQLite."""
+
+    def __init__(self, database: SqliteDatabase, ttl_seconds: int) -> None:
+        super().__init__(None, ttl_seconds)
+        self.database = database
+
+    def _read_version(self) -> int:
+        row = self.database.connection().execute("SELECT version FROM catalog_version WHERE id = 1").fetchone()
+        return int(row["version"]) if row else 0
+
+    def _load_tables(self) -> list[dict[str, Any]]:
+        rows = self.database.connection().execute(
+            "SELECT * FROM restaurant_tables WHERE is_active = 1 ORDER BY capacity_max, priority, table_id"
+        )
+        return [
+            {
+                **dict(row),
+                "entity_type": "table",
+                "is_active": bool(row["is_active"]),
+                "combinable_with": json.loads(row["combinable_with"]),
+            }
+            for row in rows
+        ]
+
+    def bump_version(self) -> None:
+        with self.database.transaction() as connection:
+            connection.execute(
+                "INSERT INTO catalog_version (id, version) VALUES (1, 1) "
+                "ON CONFLICT (id) DO UPDATE SET version = version + 1"
+            )
+        self.invalidate()
+
+
+class SqliteReservationRepository(BaseReservationRepository):
+    """``BaseReservationRepository`` storing reservations, slot claims and pacing in SQLite."""
+
+    def __init__(self, path: str) -> None:
+        self.database = SqliteDatabase(path, settings.sqlite_busy_timeout_ms)
+        super().__init__()
+        self._purge_expired()
+        logger.info("SQLite reservation storage ready: %s", path)
+
+    def _create_catalog(self) -> TableCatalog:
+        return SqliteTableCatalog(self.database, settings.table_catalog_ttl_seconds)
+
+    def _purge_expired(self) -> None:
+        """Drop what the DynamoDB TTL would have expired: old claims, pacing and reservations."""
+        with self.database.transaction() as connection:
+            connection.execute("DELETE FROM occupancy WHERE slot_date < ?", (_days_ago(OCCUPANCY_RETENTION_DAYS),))
+            connection.execute("DELETE FROM pacing WHERE date < ?", (_days_ago(OCCUPANCY_RETENTION_DAYS + 1),))
+            connection.execute("DELETE FROM reservations WHERE date < ?", (_days_ago(RESERVATION_RETENTION_DAYS),))
+
+    def seed_tables(self) -> int:
+        """Insert the default tables that are missing; returns how many were added."""
+        now = self._now_iso()
+        with self.database.transaction() as connection:
+            seeded = sum(
+                connection.execute(
+                    "INSERT OR IGNORE INTO restaurant_tables (table_id, zone, capacity_min, capacity_max, "
+                    "priority, is_active, combinable_with, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        table["table_id"],
+                        table["zone"],
+                        table["capacity_min"],
+                        table["capacity_max"],
+                        table["priority"],
+                        table["is_active"],
+                        json.dumps(table["combinable_with"]),
+                        now,
+                    ),
+                ).rowcount
+                for table in DEFAULT_TABLES
+            )
+        if seeded:
+            self.catalog.bump_version()
+        return seeded
+
+    # -- reads ------------------------------------------------------------------
+
+    def _reservation(self, row: sqlite3.Row) -> dict[str, Any]:
+        return {"entity_type": "reservation", **dict(row)}
+
+    def _reservations(self, where: str, params: tuple[Any, ...]) -> list[dict[str, Any]]:
+        rows = self.database.connection().execute(
+            f"SELECT * FROM reservations WHERE {where} ORDER BY date, time, id", params
+        )
+        return [self._reservation(row) for row in rows]
+
+    def get_reservation(self, reservation_id: str) -> dict[str, Any] | None:
+        rows = self._reservations("id = ?", (reservation_id,))
+        return rows[0] if rows else None
+
+    def query_reservations_by_date(self, date: str) -> list[dict[str, Any]]:
+        return self._reservations("date = ?", (date,))
+
+    def query_reservations_by_status(self, status: str, date: str | None = None) -> list[dict[str, Any]]:
+        if date:
+            return self._reservations("status = ? AND date = ?", (status.lower(), date))
+        return self._reservations("status = ?", (status.lower(),))
+
+    def scan_all_reservations(self, status_filter: str | None = None) -> list[dict[str, Any]]:
+        if status_filter:
+            return self._reservations("status = ?", (status_filter,))
+        return self._reservations("1 = 1", ())
+
+    def count_reservations_by_status(self) -> dict[str, int]:
+        rows = self.database.connection().execute("SELECT status, COUNT(*) AS total FROM reservations GROUP BY status")
+        return {row["status"]: row["total"] for row in rows}
+
+    def list_reservations(
+        self,
+        *,
+        date: str = "",
+        status: str = "all",
+        customer_name: str = "",
+        phone: str = "",
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Matching reservations by date, time and id; at most ``limit`` of them.
+
+        Date, status and phone are indexed filters. The name match stays in
+        Python (case-insensitive beyond ASCII) and reading stops at ``limit``.
+        """
+        status = status.lower()
+        conditions: list[str] = []
+        params: list[Any] = []
+        for column, value in (
+            ("date", date),
+            ("status", status if status in VALID_STATUSES else ""),
+            ("phone", phone.strip()),
+        ):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        where = " AND ".join(conditions) or "1 = 1"
+        rows = self.database.connection().execute(
+            f"SELECT * FROM reservations WHERE {where} ORDER BY date, time, id", params
+        )
+
+        name_query = customer_name.lower().strip()
+        reservations: list[dict[str, Any]] = []
+        for row in rows:
+            if name_query and name_query not in row["customer_name"].lower():
+                continue
+            reservations.append(self._reservation(row))
+            if limit is not None and len(reservations) >= limit:
+                break
+        return reservations
+
+    def query_occupancy_by_date(self, date: str, *, before: str | None = None) -> list[dict[str, Any]]:
+        """Slot claims of one date (``time``, ``table_id``, ``reservation_id``), optionally before a time."""
+        where, params = "slot_date = ?", [date]
+        if before:
+            where, params = f"{where} AND slot_time < ?", [date, before]
+        rows = self.database.connection().execute(
+            "SELECT slot_date, slot_time AS time, table_id, reservation_id FROM occupancy "
+            f"WHERE {where} ORDER BY slot_time, table_id",
+            params,
+        )
+        return [dict(row) for row in rows]
+
+    def slot_owners(self, date: str) -> dict[tuple[str, str], str]:
+        return {
+            (row["table_id"], f"{date}#{row['time']}"): row["reservation_id"]
+            for row in self.query_occupancy_by_date(date)
+        }
+
+    def _load_day_occupancy(self, date: str) -> DayOccupancy:
+        occupancy = DayOccupancy(date)
+        rows = self.database.connection().execute(
+            "SELECT slot_date, slot_time, table_id, reservation_id FROM occupancy "
+            "WHERE slot_date = ? OR (slot_date = ? AND slot_time < ?)",
+            (date, next_date(date), SERVICE_DAY_ROLLOVER),
+        )
+        for row in rows:
+            occupancy.add(row["table_id"], row["slot_date"], row["slot_time"], row["reservation_id"])
+        return occupancy
+
+    def _load_slot_occupancy(
+        self,
+        date: str,
+        tables: list[dict[str, Any]],
+        slot_keys: list[str],
+    ) -> DayOccupancy:
+        """Probe only the (table, slot) pairs of one request through the claims' primary key."""
+        occupancy = DayOccupancy(date)
+        members = sorted({member for table in tables for member in table_members(table["table_id"])})
+        times_by_date: dict[str, list[str]] = {}
+        for slot_key in slot_keys:
+            slot_date, slot_time = slot_key.split("#", 1)
+            times_by_date.setdefault(slot_date, []).append(slot_time)
+
+        connection = self.database.connection()
+        for slot_date, times in times_by_date.items():
+            rows = connection.execute(
+                "SELECT slot_time, table_id, reservation_id FROM occupancy "
+                f"WHERE slot_date = ? AND slot_time IN ({_placeholders(len(times))}) "
+                f"AND table_id IN ({_placeholders(len(members))})",
+                (slot_date, *times, *members),
+            )
+            for row in rows:
+                occupancy.add(row["table_id"], slot_date, row["slot_time"], row["reservation_id"])
+        return occupancy
+
+    def _load_availability_summaries(self, dates: list[str]) -> dict[str, set[str]]:
+        summaries: dict[str, set[str]] = {date: set() for date in dates}
+        rows = self.database.connection().execute(
+            f"SELECT slot_date, slot_time, table_id FROM occupancy WHERE slot_date IN ({_placeholders(len(dates))})",
+            dates,
+        )
+        for row in rows:
+            summaries[row["slot_date"]].add(f"{row['slot_time']}#{row['table_id']}")
+        return summaries
+
+    def rebuild_availability_summary(self, date: str) -> int:
+        """The claims are the summary here; returns the date's claimed slot count."""
+        return len(self._load_availability_summaries([date])[date])
+
+    def _load_pacing(self, dates: list[str]) -> dict[str, dict[str, Any]]:
+        if not settings.pacing_rules or not dates:
+            return {}
+        rows = self.database.connection().execute(
+            f"SELECT date, attribute, covers FROM pacing WHERE date IN ({_placeholders(len(dates))})",
+            dates,
+        )
+        counters: dict[str, dict[str, Any]] = {}
+        for row in rows:
+            counters.setdefault(row["date"], {})[row["attribute"]] = row["covers"]
+        return counters
+
+    # -- writes -----------------------------------------------------------------
+
+    def _write_pacing(self, date: str, counters: dict[str, int]) -> None:
+        with self.database.transaction() as connection:
+            connection.execute("DELETE FROM pacing WHERE date = ?", (date,))
+            connection.executemany(
+                "INSERT INTO pacing (date, attribute, covers) VALUES (?, ?, ?)",
+                [(date, attribute, covers) for attribute, covers in counters.items()],
+            )
+
+    def _apply_pacing(
+        self,
+        connection: sqlite3.Connection,
+        before: dict[str, Any] | None,
+        after: dict[str, Any] | None,
+    ) -> None:
+        """Add a change's covers to the pacing counters, rejecting it if an increase passes a limit."""
+        for date, counters in self._pacing_deltas(before, after).items():
+            for attribute, covers in sorted(counters.items()):
+                (total,) = connection.execute(
+                    "INSERT INTO pacing (date, attribute, covers) VALUES (?, ?, ?) "
+                    "ON CONFLICT (date, attribute) DO UPDATE SET covers = covers + excluded.covers "
+                    "RETURNING covers",
+                    (date, attribute, covers),
+                ).fetchone()
+                limit = pacing.limit_for(date, attribute)
+                if covers > 0 and limit and total > limit:
+                    raise _Rejected(PACING_FULL_MESSAGE)
+
+    def _claim(self, connection: sqlite3.Connection, claims: list[tuple[str, str]], reservation_id: str) -> None:
+        for member, slot_key in claims:
+            slot_date, slot_time = slot_key.split("#", 1)
+            try:
+                connection.execute(
+                    "INSERT INTO occupancy (slot_date, slot_time, table_id, reservation_id) VALUES (?, ?, ?, ?)",
+                    (slot_date, slot_time, member, reservation_id),
+                )
+            except sqlite3.IntegrityError as exc:
+                raise _Rejected(f"El slot {slot_key} ya no estaba disponible") from exc
+
+    def _write(self, reservation_id: str, apply: Callable[[sqlite3.Connection], None]) -> str:
+        """Run ``apply(connection)`` in one transaction; returns the error message, empty on success."""
+        try:
+            with self.database.transaction() as connection:
+                apply(connection)
+        except _Rejected as exc:
+            return str(exc)
+        except sqlite3.Error as exc:
+            logger.error("SQLite write failed for reservation %s: %s", reservation_id, str(exc))
+            return SAVE_FAILED_MESSAGE
+        return ""
+
+    def _commit_new_reservation(
+        self,
+        reservation: dict[str, Any],
+        slot_keys: list[str],
+    ) -> tuple[bool, str, dict[str, Any] | None]:
+        row = {**reservation, "version": int(reservation.get("version", 1))}
+
+        def apply(connection: sqlite3.Connection) -> None:
+            try:
+                connection.execute(
+                    f"INSERT INTO reservations ({', '.join(RESERVATION_COLUMNS)}) "
+                    f"VALUES ({_placeholders(len(RESERVATION_COLUMNS))})",
+                    [row.get(column, "") for column in RESERVATION_COLUMNS],
+                )
+            except sqlite3.IntegrityError as exc:
+                raise _Rejected(DUPLICATE_ID_MESSAGE) from exc
+            self._claim(connection, sorted(self._held_claims(reservation, slot_keys)), reservation["id"])
+            self._apply_pacing(connection, None, reservation)
+
+        error = self._write(reservation["id"], apply)
+        return self._new_reservation_result(reservation, slot_keys, not error, error)
+
+    def _commit_reservation_change(
+        self,
+        current: dict[str, Any],
+        merged: dict[str, Any],
+        new_slot_keys: list[str] | None,
+    ) -> tuple[bool, str, dict[str, Any] | None]:
+        """Commit a move, resize, status change or cancellation as one transaction.
+
+        The row is updated only if its version is still the one that was read,
+        so a concurrent change makes this one fail instead of being overwritten.
+        """
+        added, released, _ = self._claim_changes(current, merged, new_slot_keys)
+        expected_version = int(current.get("version") or 0)
+        merged["version"] = expected_version + 1
+        columns = [column for column in RESERVATION_COLUMNS if column != "id"]
+
+        def apply(connection: sqlite3.Connection) -> None:
+            updated = connection.execute(
+                f"UPDATE reservations SET {', '.join(f'{column} = ?' for column in columns)} "
+                "WHERE id = ? AND version = ?",
+                [*(merged.get(column, "") for column in columns), current["id"], expected_version],
+            ).rowcount
+            if not updated:
+                raise _Rejected(CONCURRENT_CHANGE_MESSAGE)
+            connection.executemany(
+                "DELETE FROM occupancy WHERE slot_date = ? AND slot_time = ? AND table_id = ? AND reservation_id = ?",
+                [(*slot_key.split("#", 1), member, current["id"]) for member, slot_key in released],
+            )
+            self._claim(connection, added, merged["id"])
+            self._apply_pacing(connection, current, merged)
+
+        error = self._write(current["id"], apply)
+        touched = sorted({slot_key for _, slot_key in (*added, *released)})
+        return self._change_result(merged, touched, not error, error)
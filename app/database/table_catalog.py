@@ -0,0 +1,162 @@
+"""Process-local cache of the restaurant table catalog."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any
+
+from boto3.dynamodb.conditions import Attr
+
+from app.database.dynamodb_client import DynamoDBClient
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_KEY = {"PK": "CATALOG", "SK": "VERSION"}
+MAX_COMBINATION_SIZE = 3
+
+
+def build_combinations(tables: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Precompute every valid combination of adjacent tables in the same zone.
+
+    A combination is a connected set of ``combinable_with`` links. It only
+    serves parties larger than any of its members; its capacity is the sum of
+    the members' maximum capacities.
+    """
+    by_id = {str(table["table_id"]): table for table in tables}
+    adjacency = {
+        table_id: {
+            str(other)
+            for other in table.get("combinable_with", [])
+            if str(other) in by_id and by_id[str(other)].get("zone") == table.get("zone")
+        }
+        for table_id, table in by_id.items()
+    }
+
+    groups: set[frozenset[str]] = set()
+    frontier = {frozenset([table_id]) for table_id in by_id}
+    for _ in range(MAX_COMBINATION_SIZE - 1):
+        grown = {
+            group | {neighbour}
+            for group in frontier
+            for member in group
+            for neighbour in adjacency[member]
+            if neighbour not in group
+        }
+        groups |= grown
+        frontier = grown
+
+    combinations = []
+    for group in groups:
+        members = sorted(group)
+        first = by_id[members[0]]
+        combinations.append(
+            {
+                "table_id": "+".join(members),
+                "members": members,
+                "zone": first.get("zone", "salon"),
+                "capacity_min": max(int(by_id[member].get("capacity_max", 0)) for member in members) + 1,
+                "capacity_max": sum(int(by_id[member].get("capacity_max", 0)) for member in members),
+                "priority": max(int(by_id[member].get("priority", 99)) for member in members),
+            }
+        )
+
+    return sorted(
+        combinations,
+        key=lambda combo: (combo["capacity_max"], len(combo["members"]), combo["priority"], combo["table_id"]),
+    )
+
+
+class TableCatalog:
+    """Caches the active tables, sorted once, per process.
+
+    Every ``ttl_seconds`` the cache reads the catalog version item (a single
+    GetItem) and only re-scans the tables when the version changed, so edits
+    made through ``bump_version`` reach every worker without a restart. A
+    load that finds no tables is not cached: the previous catalog is served
+    and the next call tries again.
+    """
+
+    def __init__(self, client: DynamoDBClient | None, ttl_seconds: int) -> None:
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._tables: list[dict[str, Any]] = []
+        self._combinations: list[dict[str, Any]] = []
+        self._version: int | None = None
+        self._checked_at = 0.0
+
+    def _read_version(self) -> int:
+        item = self.client.get_item(CATALOG_VERSION_KEY)
+        return int(item.get("version", 0)) if item else 0
+
+    def _load_tables(self) -> list[dict[str, Any]]:
+        tables = self.client.scan_all(
+            FilterExpression=Attr("entity_type").eq("table") & Attr("is_active").eq(True)
+        )
+        return sorted(
+            tables,
+            key=lambda table: (
+                int(table.get("capacity_max", 99)),
+                int(table.get("priority", 99)),
+                str(table.get("table_id", "")),
+            ),
+        )
+
+    def is_fresh(self) -> bool:
+        return self._version is not None and time.monotonic() - self._checked_at < self.ttl_seconds
+
+    def active_tables(self) -> list[dict[str, Any]]:
+        """Return the active tables ordered by (capacity_max, priority, table_id).
+
+        The returned list is shared; callers must not mutate it.
+        """
+        if self.is_fresh():
+            return self._tables
+
+        with self._lock:
+            if self.is_fresh():
+                return self._tables
+
+            version = self._read_version()
+            if version != self._version:
+                tables = self._load_tables()
+                if not tables:
+                    # A failed scan comes back empty too: keep the previous catalog and retry on the next call.
+                    logger.warning(
+                        "Table catalog version %s read no tables; if it persists, seed it with scripts/seed_tables.py",
+                        version,
+                    )
+                    return self._tables
+                self._tables = tables
+                self._combinations = build_combinations(tables)
+                logger.info(
+                    "Table catalog loaded: version=%s tables=%s combinations=%s",
+                    version,
+                    len(self._tables),
+                    len(self._combinations),
+                )
+                self._version = version
+            self._checked_at = time.monotonic()
+
+        return self._tables
+
+    def combinations(self) -> list[dict[str, Any]]:
+        """Table combinations for the current catalog version, smallest first."""
+        self.active_tables()
+        return self._combinations
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version = None
+
+    def bump_version(self) -> None:
+        """Mark the catalog as changed for every process."""
+        self.client.update_item(
+            CATALOG_VERSION_KEY,
+            update_expression="ADD #version :one",
+            expression_attribute_names={"#version": "version"},
+            expression_attribute_values={":one": 1},
+        )
+        self.invalidate()
@@ -0,0 +1,178 @@
+"""DynamoDB usage accounting: calls, items, latency and consumed capacity per operation."""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+READ_OPERATIONS = frozenset({"get_item", "batch_get_item", "query", "scan"})
+
+
+class OperationUsage:
+    """Totals for one DynamoDB operation (or for all of them)."""
+
+    __slots__ = ("calls", "items", "latency_ms", "rcu", "wcu")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.items = 0
+        self.latency_ms = 0.0
+        self.rcu = 0.0
+        self.wcu = 0.0
+
+    def add(self, other: OperationUsage) -> None:
+        self.calls += other.calls
+        self.items += other.items
+        self.latency_ms += other.latency_ms
+        self.rcu += other.rcu
+        self.wcu += other.wcu
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "items": self.items,
+            "latency_ms": round(self.latency_ms, 1),
+            "rcu": round(self.rcu, 2),
+            "wcu": round(self.wcu, 2),
+        }
+
+
+class UsageReport:
+    """Usage per operation; safe to record into from several threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.by_operation: dict[str, OperationUsage] = {}
+
+    def record(self, operation: str, usage: OperationUsage) -> None:
+        with self._lock:
+            self.by_operation.setdefault(operation, OperationUsage()).add(usage)
+
+    def merge(self, other: UsageReport) -> None:
+        with other._lock:
+            entries = list(other.by_operation.items())
+        for operation, usage in entries:
+            self.record(operation, usage)
+
+    def totals(self) -> OperationUsage:
+        total = OperationUsage()
+        with self._lock:
+            for usage in self.by_operation.values():
+                total.add(usage)
+        return total
+
+    def call_counts(self) -> dict[str, int]:
+        with self._lock:
+            return {operation: usage.calls for operation, usage in self.by_operation.items()}
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            operations = {operation: usage.as_dict() for operation, usage in sorted(self.by_operation.items())}
+        return {**self.totals().as_dict(), "operations": operations}
+
+
+class UsageRollup:
+    """Usage accumulated per name (agent tool, inbound message...) across the process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._reports: dict[str, tuple[int, UsageReport]] = {}
+
+    def add(self, name: str, report: UsageReport) -> None:
+        with self._lock:
+            invocations, total = self._reports.get(name, (0, UsageReport()))
+            self._reports[name] = (invocations + 1, total)
+        total.merge(report)
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            reports = sorted(self._reports.items())
+        summary: dict[str, dict[str, Any]] = {}
+        for name, (invocations, report) in reports:
+            totals = report.totals()
+            summary[name] = {
+                "invocations": invocations,
+                **totals.as_dict(),
+                "rcu_per_invocation": round(totals.rcu / invocations, 2),
+                "wcu_per_invocation": round(totals.wcu / invocations, 2),
+            }
+        return summary
+
+
+tool_usage = UsageRollup()
+request_usage = UsageRollup()
+
+_scoped_usage: ContextVar[UsageReport | None] = ContextVar("dynamodb_scoped_usage", default=None)
+
+
+@contextmanager
+def track_usage() -> Iterator[UsageReport]:
+    """Collect the DynamoDB usage of the requests made inside the block.
+
+    Scopes nest: an inner block's usage is added to the enclosing one.
+    Threads and tasks started with a copy of the context record into it too.
+    """
+    report = UsageReport()
+    parent = _scoped_usage.get()
+    token = _scoped_usage.set(report)
+    try:
+        yield report
+    finally:
+        _scoped_usage.reset(token)
+        if parent is not None:
+            parent.merge(report)
+
+
+def consumed_capacity(operation: str, response: dict[str, Any]) -> tuple[float, float]:
+    """(read units, write units) reported by a response with ``ReturnConsumedCapacity``."""
+    consumed = response.get("ConsumedCapacity")
+    if not consumed:
+        return 0.0, 0.0
+    entries = consumed if isinstance(consumed, list) else [consumed]
+    read = write = 0.0
+    for entry in entries:
+        if "ReadCapacityUnits" in entry or "WriteCapacityUnits" in entry:
+            read += float(entry.get("ReadCapacityUnits", 0))
+            write += float(entry.get("WriteCapacityUnits", 0))
+        elif operation in READ_OPERATIONS:
+            read += float(entry.get("CapacityUnits", 0))
+        else:
+            write += float(entry.get("CapacityUnits", 0))
+    return read, write
+
+
+def item_count(operation: str, request: dict[str, Any], response: dict[str, Any]) -> int:
+    """Items read or written by one successful request."""
+    if operation in ("query", "scan"):
+        return int(response.get("Count", len(response.get("Items", []))))
+    if operation == "get_item":
+        return 1 if response.get("Item") else 0
+    if operation == "batch_get_item":
+        return sum(len(items) for items in response.get("Responses", {}).values())
+    if operation == "batch_write_item":
+        return sum(len(writes) for writes in request.get("RequestItems", {}).values())
+    if operation == "transact_write_items":
+        return len(request.get("TransactItems", []))
+    return 1
+
+
+def observe(
+    report: UsageReport,
+    operation: str,
+    request: dict[str, Any],
+    response: dict[str, Any] | None,
+    seconds: float,
+) -> None:
+    """Record one request in ``report`` (the client's totals) and in the current scope."""
+    usage = OperationUsage()
+    usage.calls = 1
+    usage.latency_ms = seconds * 1000
+    if response is not None:
+        usage.items = item_count(operation, request, response)
+        usage.rcu, usage.wcu = consumed_capacity(operation, response)
+    report.record(operation, usage)
+    scoped = _scoped_usage.get()
+    if scoped is not None:
+        scoped.record(operation, usage)
@@ -2,6 +2,7 @@
 Servidor FastAPI para el bot de WhatsApp de El Rincón de Andalucía.
 """
 import asyncio
+import json
 import logging
 from datetime import datetime
 from fastapi import FastAPI, Request, Form, HTTPException, Depends
@@ -12,7 +13,11 @@ from app.config import settings
 from app.agent.manager import agent_manager
 from app.agent.prompts import ERROR_MESSAGES
 from app.middleware.validation import twilio_validator
-from app.database.reservation_repository import reservation_repository
+from app.database.async_reservation_repository import (
+    close_async_reservation_repository,
+    get_async_reservation_repository,
+)
+from app.database.usage import request_usage, tool_usage, track_usage
 
 # Configurar logging
 logging.basicConfig(
@@ -109,6 +114,22 @@ async def health_check():
     }
 
 
+async def run_agent(phone: str, message: str) -> str:
+    """
+    Ejecuta el agente: en el event loop con el cliente DynamoDB asyncio,
+    o en un hilo con el cliente boto3 clásico. Registra el consumo de
+    DynamoDB (llamadas, RCU/WCU, latencia) de todo el mensaje.
+    """
+    with track_usage() as usage:
+        if settings.dynamodb_async:
+            response = await agent_manager.process_message_async(phone, message)
+        else:
+            response = await asyncio.to_thread(agent_manager.process_message, phone, message)
+    request_usage.add("whatsapp_message", usage)
+    logger.info(f"📊 DynamoDB del mensaje: {json.dumps(usage.as_dict(), sort_keys=True)}")
+    return response
+
+
 @app.post("/whatsapp")
 async def whatsapp_webhook(
     request: Request,
@@ -163,11 +184,7 @@ async def whatsapp_webhook(
         logger.info("🤖 Procesando con agente...")
         try:
             response_text = await asyncio.wait_for(
-                asyncio.to_thread(
-                    agent_manager.process_message,
-                    From,
-                    Body.strip(),
-                ),
+                run_agent(From, Body.strip()),
                 timeout=settings.agent_processing_timeout_seconds,
             )
         except asyncio.TimeoutError:
@@ -220,7 +237,7 @@ async def test_message(phone: str = Form(...), message: str = Form(...)):
         raise HTTPException(status_code=404, detail="Not found")
     
     try:
-        response = agent_manager.process_message(phone, message)
+        response = await run_agent(phone, message)
         return {
             "status": "success",
             "phone": phone,
@@ -236,28 +253,37 @@ async def test_message(phone: str = Form(...), message: str = Form(...)):
 async def get_stats():
     """Obtener estadísticas básicas del servidor."""
     try:
-        from collections import Counter
-        
-        # Obtener todas las reservas
-        all_reservations = reservation_repository.scan_all_reservations()
-        
-        # Contar por estado
-        statuses = [r.get('status') for r in all_reservations]
-        reservations_by_status = dict(Counter(statuses))
-        
-        # Reservas de hoy
+        # Reservas por estado (solo se lee el atributo status), de hoy e informe de servicios en paralelo
         today = datetime.now().strftime("%Y-%m-%d")
-        today_reservations = reservation_repository.query_reservations_by_date(today)
+        repository = get_async_reservation_repository()
+        reservations_by_status, today_reservations, services_today = await asyncio.gather(
+            repository.count_reservations_by_status(),
+            repository.query_reservations_by_date(today),
+            repository.service_report(today),
+        )
         
+        stats = {
+            "total_reservations": sum(reservations_by_status.values()),
+            "today_reservations": len(today_reservations),
+            "by_status": reservations_by_status,
+            "active_users": agent_manager.get_active_sessions_count(),
+            "services_today": services_today,
+            "availability_cache": repository.repository.availability_cache.stats(),
+        }
+        # Con RESERVATION_BACKEND=sqlite no hay cliente de DynamoDB del que informar
+        if repository.client is not None:
+            stats.update(
+                {
+                    "dynamodb_usage": repository.client.call_stats(),
+                    "dynamodb_usage_by_tool": tool_usage.as_dict(),
+                    "dynamodb_usage_by_request": request_usage.as_dict(),
+                    "dynamodb_transport": repository.client.transport_stats(),
+                }
+            )
         return {
             "status": "success",
             "timestamp": datetime.now().isoformat(),
-            "stats": {
-                "total_reservations": len(all_reservations),
-                "today_reservations": len(today_reservations),
-                "by_status": reservations_by_status,
-                "active_users": agent_manager.get_active_sessions_count()
-            }
+            "stats": stats,
         }
     except Exception as e:
         logger.error(f"Error obteniendo stats: {e}")
@@ -306,6 +332,7 @@ async def startup_event():
 async def shutdown_event():
     """Se ejecuta cuando se detiene el servidor."""
     logger.info("👋 Servidor detenido")
+    await close_async_reservation_repository()
     logger.info(f"📊 Sesiones activas al cerrar: {agent_manager.get_active_sessions_count()}")
 
 
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Compare a plain Scan with parallel segmented scans on a large synthetic table.
+
+Seeds ``--items`` synthetic rows (``PK=BENCH#<n>``) so the table looks like a
+long history, then times full-table scans with the same filter /stats uses
+for 1 segment and each ``--segments`` value. Meant for DynamoDB Local or a
+throwaway table (or ``DYNAMODB_BACKEND=memory`` with ``DYNAMODB_MEMORY_LATENCY_MS``
+to model round trips); ``--cleanup`` deletes the synthetic rows afterwards.
+
+Usage:
+  DYNAMODB_ENDPOINT_URL=http://localhost:8000 python3 scripts/benchmark_parallel_scan.py --items 50000 --segments 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Ensure repository root is importable when running as a script (e.g. `uv run scripts/...`).
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Mide la mejora del Scan paralelo por segmentos")
+    parser.add_argument("--items", type=int, default=20000, help="Filas sintéticas a sembrar (default: 20000)")
+    parser.add_argument("--payload-bytes", type=int, default=400, help="Tamaño de relleno por fila (default: 400)")
+    parser.add_argument("--segments", type=int, nargs="+", default=[2, 4, 8], help="Segmentos a comparar")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por configuración (default: 3)")
+    parser.add_argument("--threads", type=int, default=16, help="Hilos para sembrar y limpiar (default: 16)")
+    parser.add_argument("--skip-seed", action="store_true", help="No sembrar (las filas ya existen)")
+    parser.add_argument("--cleanup", action="store_true", help="Borrar las filas sintéticas al terminar")
+    parser.add_argument(
+        "--allow-remote",
+        action="store_true",
+        help="Permitir ejecutarlo contra la tabla real (sin DYNAMODB_ENDPOINT_URL ni backend memory)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.items < 1 or args.repeat < 1 or min(args.segments) < 1:
+        raise SystemExit("--items, --repeat y --segments deben ser >= 1")
+
+    from boto3.dynamodb.conditions import Attr  # noqa: WPS433
+
+    from app.config import settings  # noqa: WPS433
+    from app.database.dynamodb_client import get_db_client  # noqa: WPS433
+
+    local = settings.dynamodb_endpoint_url or settings.dynamodb_backend == "memory"
+    if not local and not args.allow_remote:
+        raise SystemExit("Define DYNAMODB_ENDPOINT_URL (DynamoDB Local), usa DYNAMODB_BACKEND=memory o --allow-remote")
+
+    db_client = get_db_client()
+    padding = "x" * args.payload_bytes
+    keys = [{"PK": f"BENCH#{index:07d}", "SK": "ROW"} for index in range(args.items)]
+
+    if not args.skip_seed:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            written = sum(
+                executor.map(lambda key: db_client.put_item({**key, "entity_type": "benchmark", "payload": padding}), keys)
+            )
+        print(f"Sembradas {written} filas en {time.perf_counter() - started:.1f}s")
+
+    scan_filter = {"FilterExpression": Attr("entity_type").eq("reservation")}
+    results: dict[int, float] = {}
+    for segments in [1, *args.segments]:
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            stream = db_client.parallel_scan(segments=segments, **scan_filter)
+            matched = sum(len(page) for page in stream.pages())
+            timings.append(time.perf_counter() - started)
+            if stream.failed:
+                raise SystemExit(f"El scan con {segments} segmentos ha fallado")
+        results[segments] = min(timings)
+        print(
+            f"{segments:>3} segmentos: {results[segments]:.2f}s (mejor de {args.repeat}), "
+            f"{matched} reservas, x{results[1] / results[segments]:.2f}"
+        )
+
+    if args.cleanup:
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            deleted = sum(executor.map(db_client.delete_item, keys))
+        print(f"Borradas {deleted} filas sintéticas")
+
+
+if __name__ == "__main__":
+    main()
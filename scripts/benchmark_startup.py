@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Measure what a gunicorn worker pays on boot and on each ``--max-requests`` recycle.
+
+Each run starts a fresh interpreter, times ``import app.main`` (the whole
+worker boot, which should be pure Python import cost; ``--module`` picks
+another entry point) and then, separately, building the repository on first
+use and loading the table catalog, which is what the first request pays.
+
+Usage:
+  python3 scripts/benchmark_startup.py --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Ensure repository root is importable when running as a script (e.g. `uv run scripts/...`).
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+PROBE = """
+import importlib, json, sys, time
+sys.path.insert(0, {root!r})
+from app.database.usage import track_usage
+started = time.perf_counter()
+with track_usage() as boot:
+    importlib.import_module({module!r})
+imported = time.perf_counter()
+with track_usage() as first_use:
+    from app.database.reservation_repository import get_reservation_repository
+    get_reservation_repository().catalog.active_tables()
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "import_calls": boot.call_counts(),
+    "first_use_ms": (time.perf_counter() - imported) * 1000,
+    "first_use_calls": first_use.call_counts(),
+}}))
+"""
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Mide el arranque de un worker (importación y primer uso del repositorio)")
+    parser.add_argument("--runs", type=int, default=5, help="Procesos a lanzar (default: 5)")
+    parser.add_argument("--module", default="app.main", help="Módulo a importar (default: app.main)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.runs < 1:
+        raise SystemExit("--runs debe ser >= 1")
+
+    samples = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(root=str(REPO_ROOT), module=args.module)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    import_ms = statistics.median(sample["import_ms"] for sample in samples)
+    first_use_ms = statistics.median(sample["first_use_ms"] for sample in samples)
+    print(f"Importar {args.module}: {import_ms:.0f} ms (mediana de {args.runs}), llamadas: {samples[-1]['import_calls']}")
+    print(f"Primer uso del repositorio y catálogo: {first_use_ms:.0f} ms, llamadas: {samples[-1]['first_use_calls']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Book the same slot from many threads at once and check the table stays consistent.
+
+Meant for a local stand-in (DynamoDB Local or a moto server with the table
+already created, or ``DYNAMODB_BACKEND=memory``); the shared client, its pool
+and the transactions are the same ones the agent threads use.
+
+Usage:
+  DYNAMODB_ENDPOINT_URL=http://localhost:8000 python3 scripts/concurrency_check.py --date 2026-03-06 --time 21:00
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+# Ensure repository root is importable when running as a script (e.g. `uv run scripts/...`).
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Reserva el mismo hueco desde muchos hilos y verifica la consistencia")
+    parser.add_argument("--date", required=True, help="Fecha YYYY-MM-DD (debe estar abierta)")
+    parser.add_argument("--time", default="21:00", help="Hora HH:MM (default: 21:00)")
+    parser.add_argument("--people", type=int, default=2, help="Comensales por reserva (default: 2)")
+    parser.add_argument("--requests", type=int, default=40, help="Reservas a intentar (default: 40)")
+    parser.add_argument("--threads", type=int, default=16, help="Hilos concurrentes (default: 16)")
+    parser.add_argument("--keep", action="store_true", help="No cancelar las reservas creadas al terminar")
+    parser.add_argument(
+        "--allow-remote",
+        action="store_true",
+        help="Permitir ejecutarlo contra la tabla real (sin DYNAMODB_ENDPOINT_URL ni backend memory)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.requests < 1 or args.threads < 1:
+        raise SystemExit("--requests y --threads deben ser >= 1")
+
+    from app.config import settings  # noqa: WPS433
+    from app.database.consistency import check_consistency  # noqa: WPS433
+    from app.database.reservation_repository import ReservationRepository, get_reservation_repository  # noqa: WPS433
+
+    reservation_repository = get_reservation_repository()
+
+    local = settings.dynamodb_endpoint_url or settings.dynamodb_backend == "memory"
+    if not local and not args.allow_remote:
+        raise SystemExit("Define DYNAMODB_ENDPOINT_URL (DynamoDB Local), usa DYNAMODB_BACKEND=memory o --allow-remote")
+
+    def book(index: int) -> tuple[bool, str, dict[str, Any] | None]:
+        return reservation_repository.create_reservation(
+            {
+                "customer_name": f"Prueba concurrencia {index}",
+                "phone": f"+3460000{index:04d}",
+                "date": args.date,
+                "time": args.time,
+                "num_people": args.people,
+            }
+        )
+
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        results = list(executor.map(book, range(args.requests)))
+
+    created = [reservation for ok, _, reservation in results if ok and reservation]
+    reasons = Counter(error for ok, error, _ in results if not ok)
+    print(f"Reservas creadas: {len(created)} de {args.requests}")
+    for reason, count in reasons.most_common():
+        print(f"  {count} x {reason}")
+
+    problems = check_consistency(reservation_repository, args.date, created)
+
+    if not args.keep and created:
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            cancelled = list(executor.map(lambda r: reservation_repository.cancel_reservation(r["id"])[0], created))
+        print(f"Reservas canceladas: {sum(cancelled)} de {len(created)}")
+        problems += check_consistency(
+            reservation_repository,
+            args.date,
+            [reservation for reservation, ok in zip(created, cancelled) if not ok],
+        )
+
+    if isinstance(reservation_repository, ReservationRepository):
+        print(f"DynamoDB: {reservation_repository.client.call_stats()}")
+        print(f"Conexiones: {reservation_repository.client.transport_stats()}")
+    if problems:
+        print("\nInconsistencias:")
+        for problem in problems:
+            print(f"  - {problem}")
+        raise SystemExit(1)
+    print("\nSin inconsistencias")
+
+
+if __name__ == "__main__":
+    main()
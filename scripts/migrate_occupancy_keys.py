@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Move occupancy rows from the per-table layout to the date-partitioned one.
+
+Legacy rows live under ``PK=TABLE#<id>, SK=SLOT#<date>#<time>``. The repository
+now stores them under ``PK=OCC#<date>, SK=<time>#<table>`` so one Query returns
+a whole service day. Each release only sees its own layout, so a slot could
+be booked twice while both run. Upgrade in this order (re-running is safe):
+
+1. Deploy with ``OCCUPANCY_LEGACY_KEYS=true``: new workers claim and release
+   both layouts, so old and new workers see each other's bookings.
+2. Once no worker of the previous release is left, run this script.
+3. Set ``OCCUPANCY_LEGACY_KEYS=false`` and redeploy.
+
+With a single worker, stopping it, running the script and then starting the
+new release is enough.
+
+Usage:
+  python3 scripts/migrate_occupancy_keys.py --dry-run
+  python3 scripts/migrate_occupancy_keys.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from boto3.dynamodb.conditions import Attr
+
+# Ensure repository root is importable when running as a script (e.g. `uv run scripts/...`).
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Migra las filas de ocupación al esquema por fecha")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="No escribe en Dynamo, solo cuenta las filas a migrar",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    from app.database.reservation_repository import ReservationRepository, get_reservation_repository  # noqa: WPS433
+
+    reservation_repository = get_reservation_repository()
+    if not isinstance(reservation_repository, ReservationRepository):
+        raise SystemExit("La migración solo aplica a RESERVATION_BACKEND=dynamodb")
+    client = reservation_repository.client
+    legacy_rows = client.scan_all(
+        FilterExpression=Attr("entity_type").eq("occupancy") & Attr("PK").begins_with("TABLE#")
+    )
+    print(f"Filas de ocupación con esquema antiguo: {len(legacy_rows)}")
+
+    if args.dry_run:
+        print("Dry-run activado. No se ha migrado nada.")
+        return
+
+    migrated = 0
+    conflicts = 0
+    for row in legacy_rows:
+        table_id = str(row["PK"]).removeprefix("TABLE#")
+        slot_key = str(row["SK"]).removeprefix("SLOT#")
+        slot_date, slot_time = slot_key.split("#", 1)
+        new_key = reservation_repository._occupancy_key(table_id, slot_key)  # noqa: SLF001
+
+        ok = client.put_item(
+            {
+                **row,
+                **new_key,
+                "table_id": table_id,
+                "slot_date": slot_date,
+                "time": slot_time,
+            },
+            condition_expression="attribute_not_exists(PK) OR reservation_id = :rid",
+            expression_attribute_values={":rid": row.get("reservation_id", "")},
+        )
+        if not ok:
+            conflicts += 1
+            print(f"Conflicto: {table_id} {slot_key} ya ocupado por otra reserva, se conserva la fila antigua")
+            continue
+
+        client.delete_item({"PK": row["PK"], "SK": row["SK"]})
+        migrated += 1
+
+    print(f"Filas migradas: {migrated}")
+    print(f"Conflictos: {conflicts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Recompute the per-date availability summaries and kitchen pacing counters.
+
+Usage:
+  python3 scripts/rebuild_availability_summaries.py --start 2026-03-01 --days 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+# Ensure repository root is importable when running as a script (e.g. `uv run scripts/...`).
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Reconstruye los resúmenes de disponibilidad y el ritmo de cocina por fecha")
+    parser.add_argument(
+        "--start",
+        default=datetime.now(UTC).strftime("%Y-%m-%d"),
+        help="Primera fecha YYYY-MM-DD (default: hoy)",
+    )
+    parser.add_argument("--days", type=int, default=30, help="Número de días a reconstruir (default: 30)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.days < 1:
+        raise SystemExit("--days debe ser >= 1")
+
+    try:
+        start = datetime.strptime(args.start, "%Y-%m-%d")
+    except ValueError as exc:
+        raise SystemExit("--start debe tener formato YYYY-MM-DD") from exc
+
+    from app.database.reservation_repository import get_reservation_repository  # noqa: WPS433
+
+    reservation_repository = get_reservation_repository()
+
+    total = 0
+    for offset in range(args.days):
+        date = (start + timedelta(days=offset)).strftime("%Y-%m-%d")
+        slots = reservation_repository.rebuild_availability_summary(date)
+        covers = reservation_repository.rebuild_pacing(date)
+        total += slots
+        print(f"{date}: {slots} slots ocupados, {covers} comensales")
+
+    print(f"\nResúmenes reconstruidos: {args.days} días, {total} slots ocupados")
+
+
+if __name__ == "__main__":
+    main()
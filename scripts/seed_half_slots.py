@@ -17,8 +17,8 @@ from pathlib import Path
 from typing import Iterable
 
 import boto3
+from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
-from boto3.dynamodb.conditions import Attr
 
 # Ensure repository root is importable when running as a script (e.g. `uv run scripts/...`).
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -27,6 +27,7 @@ if str(REPO_ROOT) not in sys.path:
 
 ACTIVE_STATUSES: set[str] = set()
 reservation_repository = None
+opening_hours = None
 
 FIRST_NAMES = [
     "Ana",
@@ -126,32 +127,6 @@ class DayWindow:
     start_times: tuple[str, ...]
 
 
-def half_hour_times(start_hhmm: str, end_hhmm: str) -> list[str]:
-    start = datetime.strptime(start_hhmm, "%H:%M")
-    end = datetime.strptime(end_hhmm, "%H:%M")
-
-    out: list[str] = []
-    current = start
-    while current <= end:
-        out.append(current.strftime("%H:%M"))
-        current += timedelta(minutes=30)
-    return out
-
-
-def valid_times_for_weekday(weekday: int) -> list[str]:
-    # Monday=0 ... Sunday=6
-    if weekday == 0:
-        return []
-
-    if weekday in (1, 2, 3):
-        return half_hour_times("13:00", "16:00") + half_hour_times("20:00", "23:30")
-
-    if weekday in (4, 5):
-        return half_hour_times("13:00", "23:30") + ["00:00"]
-
-    return half_hour_times("13:00", "17:00")
-
-
 def build_date_windows(days: int) -> list[DayWindow]:
     now = datetime.now(UTC)
     windows: list[DayWindow] = []
@@ -159,8 +134,7 @@ def build_date_windows(days: int) -> list[DayWindow]:
     for offset in range(days):
         day = (now + timedelta(days=offset)).date()
         date_str = day.strftime("%Y-%m-%d")
-        weekday = day.weekday()
-        times = valid_times_for_weekday(weekday)
+        times = opening_hours.day_times(date_str)
 
         future_only: list[str] = []
         for time_str in times:
@@ -175,10 +149,7 @@ def build_date_windows(days: int) -> list[DayWindow]:
 
 
 def count_active_tables() -> int:
-    tables = reservation_repository.client.scan(
-        FilterExpression=Attr("entity_type").eq("table") & Attr("is_active").eq(True)
-    )
-    return len(tables)
+    return len(reservation_repository.catalog.active_tables())
 
 
 def estimate_total_slot_capacity(windows: Iterable[DayWindow], active_tables: int) -> int:
@@ -186,12 +157,21 @@ def estimate_total_slot_capacity(windows: Iterable[DayWindow], active_tables: in
 
 
 def count_used_slots_in_range(start_date: str, end_date: str) -> int:
-    occupancy = reservation_repository.client.scan(FilterExpression=Attr("entity_type").eq("occupancy"))
-    return sum(
-        1
-        for row in occupancy
-        if start_date <= str(row.get("date", "")) <= end_date and str(row.get("status", "")) in ACTIVE_STATUSES
-    )
+    used = 0
+    day = datetime.strptime(start_date, "%Y-%m-%d").date()
+    last = datetime.strptime(end_date, "%Y-%m-%d").date()
+    while day <= last:
+        # Solo se proyecta el estado: las filas se cuentan página a página sin acumularlas
+        occupancy = reservation_repository.client.iter_query(
+            KeyConditionExpression=Key("PK").eq(f"OCC#{day.strftime('%Y-%m-%d')}"),
+            ProjectionExpression="#status",
+            ExpressionAttributeNames={"#status": "status"},
+        )
+        used += sum(1 for row in occupancy if str(row.get("status", "")) in ACTIVE_STATUSES)
+        if occupancy.failed:
+            raise SystemExit(f"No se pudo leer la ocupación del {day.isoformat()}; no se crea ninguna reserva")
+        day += timedelta(days=1)
+    return used
 
 
 def random_customer() -> tuple[str, str]:
@@ -232,18 +212,21 @@ def create_random_reservation(windows: list[DayWindow]) -> bool:
 
 
 def main() -> None:
-    global ACTIVE_STATUSES, reservation_repository
+    global ACTIVE_STATUSES, opening_hours, reservation_repository
 
     args = parse_args()
     validate_aws_credentials()
 
     from app.database.reservation_repository import (  # noqa: WPS433
         ACTIVE_STATUSES as REPO_ACTIVE_STATUSES,
-        reservation_repository as REPO_INSTANCE,
+        get_reservation_repository,
     )
 
+    from app.database import opening_hours as OPENING_HOURS  # noqa: WPS433
+
     ACTIVE_STATUSES = REPO_ACTIVE_STATUSES
-    reservation_repository = REPO_INSTANCE
+    reservation_repository = get_reservation_repository()
+    opening_hours = OPENING_HOURS
 
     if args.days < 1:
         raise SystemExit("--days debe ser >= 1")
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Create the default restaurant tables (one-off, idempotent).
+
+Workers no longer seed the catalog when they start; run this once per
+environment (and again after adding tables to ``DEFAULT_TABLES``). Tables
+that already exist are left as they are.
+
+Usage:
+  python3 scripts/seed_tables.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ensure repository root is importable when running as a script (e.g. `uv run scripts/...`).
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Crea las mesas por defecto que falten en el catálogo")
+    return parser.parse_args()
+
+
+def main() -> None:
+    parse_args()
+
+    from app.config import settings  # noqa: WPS433
+    from app.database.reservation_repository import DEFAULT_TABLES, get_reservation_repository  # noqa: WPS433
+    from app.database.usage import track_usage  # noqa: WPS433
+
+    if settings.reservation_backend == "dynamodb" and settings.dynamodb_backend == "memory":
+        raise SystemExit("Con DYNAMODB_BACKEND=memory el catálogo se crea en cada proceso; no hay nada que sembrar")
+
+    started = time.perf_counter()
+    with track_usage() as usage:
+        try:
+            written = get_reservation_repository().seed_tables()
+        except Exception as exc:  # noqa: BLE001
+            raise SystemExit(f"No se pudo sembrar el catálogo: {exc}") from exc
+    elapsed = time.perf_counter() - started
+
+    print(f"Mesas creadas o actualizadas: {written} de {len(DEFAULT_TABLES)}")
+    calls = usage.call_counts()
+    print(f"Tiempo: {elapsed * 1000:.0f} ms" + (f", llamadas DynamoDB: {calls}" if calls else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Shared fixtures: reservation repositories over throwaway storage, no network."""
+
+from __future__ import annotations
+
+import os
+from datetime import date, timedelta
+
+# Settings are read on import, so the environment is fixed before ``app`` loads.
+os.environ.setdefault("TWILIO_AUTH_TOKEN", "test")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "test")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "test")
+os.environ.setdefault("AGENTCORE_MEMORY_ID", "test")
+os.environ["ENVIRONMENT"] = "test"
+os.environ["DYNAMODB_BACKEND"] = "memory"
+os.environ["RESERVATION_BACKEND"] = "dynamodb"
+
+import pytest  # noqa: E402
+
+from app.database.dynamodb_client import DynamoDBClient  # noqa: E402
+from app.database.reservation_repository import BaseReservationRepository, ReservationRepository  # noqa: E402
+from app.database.sqlite_repository import SqliteReservationRepository  # noqa: E402
+
+
+@pytest.fixture
+def booking_date() -> str:
+    """A Saturday at least two days ahead, so every service time is bookable."""
+    day = date.today() + timedelta(days=2)
+    while day.weekday() != 5:
+        day += timedelta(days=1)
+    return day.isoformat()
+
+
+@pytest.fixture
+def memory_repository() -> ReservationRepository:
+    """Repository over its own in-memory table, seeded with the default tables."""
+    repository = ReservationRepository(DynamoDBClient())
+    repository.seed_tables()
+    return repository
+
+
+@pytest.fixture
+def sqlite_repository(tmp_path) -> SqliteReservationRepository:
+    """Repository over a fresh SQLite file, seeded with the default tables."""
+    repository = SqliteReservationRepository(str(tmp_path / "reservations.db"))
+    repository.seed_tables()
+    return repository
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repository(request) -> BaseReservationRepository:
+    """Each storage backend in turn: DYNAMODB_BACKEND=memory and SQLite."""
+    return request.getfixturevalue(f"{request.param}_repository")
+
+
+def book(repository: BaseReservationRepository, day: str, time: str, num_people: int, **fields: str) -> dict:
+    """Create a reservation and return it, failing the test if it is rejected."""
+    success, error, reservation = repository.create_reservation(
+        {"date": day, "time": time, "num_people": num_people, "customer_name": "Test", "phone": "600000000", **fields}
+    )
+    assert success, error
+    return reservation
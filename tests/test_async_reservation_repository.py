@@ -0,0 +1,63 @@
+"""The async repository applies the blocking repository's rules, awaiting only the DynamoDB calls."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from conftest import book
+
+from app.config import PacingRule, settings
+from app.database import pacing
+from app.database.async_dynamodb_client import ThreadedDynamoDBClient
+from app.database.async_reservation_repository import AsyncReservationRepository
+from app.database.consistency import check_consistency
+from app.database.reservation_repository import PACING_FULL_MESSAGE
+
+
+@pytest.fixture
+def async_repository(memory_repository) -> AsyncReservationRepository:
+    return AsyncReservationRepository(memory_repository, ThreadedDynamoDBClient(memory_repository.client))
+
+
+def request(day: str, time: str, num_people: int) -> dict:
+    return {"date": day, "time": time, "num_people": num_people, "customer_name": "Test", "phone": "600000000"}
+
+
+def test_async_booking_uses_a_combination_when_the_single_table_is_taken(
+    memory_repository, async_repository, booking_date
+):
+    taken = book(memory_repository, booking_date, "21:00", 7)
+
+    available = asyncio.run(async_repository.available_times(booking_date, 7))
+    success, error, reservation = asyncio.run(async_repository.create_reservation(request(booking_date, "21:00", 7)))
+
+    assert "21:00" in {slot["time"] for slot in available}
+    assert success, error
+    assert reservation["table_id"] == "S3+S4"
+    assert check_consistency(memory_repository, booking_date, [taken, reservation]) == []
+
+
+def test_async_pacing_limit_applies_before_the_first_booking(async_repository, booking_date, monkeypatch):
+    monkeypatch.setattr(settings, "pacing_rules", [PacingRule(slot_covers=6)])
+    pacing.rule_for.cache_clear()
+    try:
+        available = asyncio.run(async_repository.available_times(booking_date, 8))
+        success, error, _ = asyncio.run(async_repository.create_reservation(request(booking_date, "21:00", 8)))
+    finally:
+        pacing.rule_for.cache_clear()
+
+    assert available == []
+    assert not success
+    assert error == PACING_FULL_MESSAGE
+
+
+def test_async_listing_stops_at_the_limit(memory_repository, async_repository, booking_date):
+    for time in ("21:00", "13:00", "14:00"):
+        book(memory_repository, booking_date, time, 2)
+
+    listed = asyncio.run(async_repository.list_reservations(date=booking_date, limit=2))
+    counts = asyncio.run(async_repository.count_reservations_by_status())
+
+    assert [row["time"] for row in listed] == ["13:00", "14:00"]
+    assert counts == {"pending": 3}
@@ -0,0 +1,68 @@
+"""The AVAIL# summary follows every change on the DynamoDB backend."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from conftest import book
+
+from app.database.async_dynamodb_client import ThreadedDynamoDBClient
+from app.database.async_reservation_repository import AsyncReservationRepository
+from app.database.consistency import check_consistency
+from app.database.usage import track_usage
+
+
+def test_cancel_clears_the_summary_in_the_same_transaction(memory_repository, booking_date):
+    reservation = book(memory_repository, booking_date, "21:00", 2)
+
+    with track_usage() as usage:
+        success, error, _ = memory_repository.cancel_reservation(reservation["id"])
+
+    assert success, error
+    assert "update_item" not in usage.call_counts()
+    assert memory_repository.availability_summary(booking_date) == set()
+
+
+def test_move_within_a_date_updates_the_summary(memory_repository, booking_date):
+    reservation = book(memory_repository, booking_date, "21:00", 2)
+
+    success, error, moved = memory_repository.update_reservation(reservation["id"], {"time": "13:00"})
+
+    assert success, error
+    assert check_consistency(memory_repository, booking_date, [moved]) == []
+
+
+def test_first_write_on_a_date_without_summary_keeps_earlier_bookings(memory_repository, booking_date):
+    earlier = book(memory_repository, booking_date, "21:00", 2)
+    # As left by a release that wrote occupancy rows but no summaries.
+    memory_repository.client.delete_item(memory_repository._summary_key(booking_date))
+    memory_repository._seeded_summaries.clear()
+
+    later = book(memory_repository, booking_date, "13:00", 2)
+
+    assert check_consistency(memory_repository, booking_date, [earlier, later]) == []
+
+
+def test_failed_summary_release_is_logged(memory_repository, booking_date, monkeypatch, caplog):
+    reservation = book(memory_repository, booking_date, "21:00", 2)
+    monkeypatch.setattr(memory_repository, "_apply_update", lambda update: False)
+
+    with caplog.at_level(logging.WARNING):
+        success, _, _ = memory_repository.update_reservation(reservation["id"], {"time": "13:00"})
+
+    assert success
+    assert f"AVAIL#{booking_date}" in caplog.text
+
+
+def test_async_update_keeps_the_summary_in_line(memory_repository, booking_date):
+    repository = AsyncReservationRepository(memory_repository, ThreadedDynamoDBClient(memory_repository.client))
+    reservation = book(memory_repository, booking_date, "21:00", 2)
+
+    success, error, moved = asyncio.run(repository.update_reservation(reservation["id"], {"time": "13:00"}))
+    assert success, error
+    assert check_consistency(memory_repository, booking_date, [moved]) == []
+
+    success, error, _ = asyncio.run(repository.cancel_reservation(reservation["id"]))
+    assert success, error
+    assert memory_repository.availability_summary(booking_date) == set()
@@ -0,0 +1,75 @@
+"""Many threads booking the same slot on the in-memory backend leave consistent state behind."""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import PacingRule, settings
+from app.database import pacing
+from app.database.async_dynamodb_client import ThreadedDynamoDBClient
+from app.database.async_reservation_repository import AsyncReservationRepository
+from app.database.consistency import check_consistency
+from app.database.reservation_repository import PACING_FULL_MESSAGE
+
+
+def test_concurrent_bookings_and_cancellations_stay_consistent(memory_repository, booking_date, monkeypatch):
+    monkeypatch.setattr(settings, "pacing_rules", [PacingRule(slot_covers=12)])
+    pacing.rule_for.cache_clear()
+
+    def book(index: int):
+        return memory_repository.create_reservation(
+            {
+                "customer_name": f"Prueba concurrencia {index}",
+                "phone": f"+3460000{index:04d}",
+                "date": booking_date,
+                "time": "21:00",
+                "num_people": 2,
+            }
+        )
+
+    try:
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(book, range(40)))
+        created = [reservation for ok, _, reservation in results if ok]
+
+        # Six parties of two fill the slot's twelve covers; nobody gets in beyond that.
+        assert len(created) == 6
+        assert PACING_FULL_MESSAGE in {error for ok, error, _ in results if not ok}
+        assert check_consistency(memory_repository, booking_date, created) == []
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            ids = [reservation["id"] for reservation in created]
+            cancelled = [ok for ok, _, _ in executor.map(memory_repository.cancel_reservation, ids)]
+        assert all(cancelled)
+        assert check_consistency(memory_repository, booking_date, []) == []
+    finally:
+        pacing.rule_for.cache_clear()
+
+
+def test_concurrent_async_bookings_share_one_client(memory_repository, booking_date):
+    # Every call runs in a worker thread over the same blocking client.
+    repository = AsyncReservationRepository(memory_repository, ThreadedDynamoDBClient(memory_repository.client))
+
+    async def book_all():
+        return await asyncio.gather(
+            *(
+                repository.create_reservation(
+                    {
+                        "customer_name": f"Prueba concurrencia {index}",
+                        "phone": f"+3460000{index:04d}",
+                        "date": booking_date,
+                        "time": "21:00",
+                        "num_people": 2,
+                    }
+                )
+                for index in range(30)
+            )
+        )
+
+    results = asyncio.run(book_all())
+    created = [reservation for ok, _, reservation in results if ok]
+
+    # Requests that read the same free table race for it; exactly one claim per table wins.
+    assert 0 < len(created) <= len(memory_repository._allocation_candidates(2, ""))
+    assert check_consistency(memory_repository, booking_date, created) == []
@@ -0,0 +1,74 @@
+"""Request building and result handling shared by the blocking and asyncio clients."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from app.database.async_dynamodb_client import ThreadedDynamoDBClient
+from app.database.dynamodb_client import BATCH_GET_MAX_RETRIES, DynamoDBClient, PageCursor
+
+
+def test_cancelled_transaction_reports_the_failed_condition():
+    client = DynamoDBClient()
+    assert client.put_item({"PK": "A", "SK": "1"})
+
+    committed, reasons = client.transact_write(
+        [
+            {"Put": {"Item": {"PK": "B", "SK": "1"}}},
+            {"Put": {"Item": {"PK": "A", "SK": "1"}, "ConditionExpression": "attribute_not_exists(PK)"}},
+        ]
+    )
+
+    assert not committed
+    assert reasons == ["None", "ConditionalCheckFailed"]
+    assert client.get_item({"PK": "B", "SK": "1"}) is None
+
+
+def test_batch_get_chunks_and_deduplicates_keys():
+    client = DynamoDBClient()
+    keys = [{"PK": f"ITEM#{index}", "SK": "META"} for index in range(150)]
+    assert client.batch_put_items(keys)
+
+    items = client.batch_get_items(keys + keys[:10])
+    threaded = asyncio.run(ThreadedDynamoDBClient(client).batch_get_items(keys))
+
+    assert len(items) == len(threaded) == 150
+    assert client.call_stats()["operations"]["batch_get_item"]["calls"] == 4
+
+
+def test_retry_delay_backs_off_then_gives_up():
+    client = DynamoDBClient()
+
+    delays = [client._retry_delay("batch_get_item", attempt, 3) for attempt in range(1, BATCH_GET_MAX_RETRIES + 1)]
+
+    assert delays == sorted(delays) and delays[0] > 0
+    assert client._retry_delay("batch_get_item", BATCH_GET_MAX_RETRIES + 1, 3) is None
+    with pytest.raises(RuntimeError, match="3 unprocessed keys"):
+        client._retry_delay("batch_get_item", BATCH_GET_MAX_RETRIES + 1, 3, strict=True)
+
+
+def test_parallel_scan_ends_when_a_segment_breaks(monkeypatch):
+    client = DynamoDBClient()
+    assert client.batch_put_items([{"PK": f"ITEM#{index}", "SK": "META"} for index in range(20)])
+
+    def broken_page(self, response):
+        raise ValueError("unreadable page")
+
+    monkeypatch.setattr(PageCursor, "_page", broken_page)
+    scan = client.parallel_scan(segments=3)
+    async_scan = ThreadedDynamoDBClient(client).parallel_scan(segments=3)
+
+    async def read_async_pages():
+        return [page async for page in async_scan.pages()]
+
+    # A segment that raises still has to report its end, or the consumer waits forever.
+    pages: list = []
+    reader = threading.Thread(target=lambda: pages.extend(scan.pages()), daemon=True)
+    reader.start()
+    reader.join(timeout=5)
+    assert not reader.is_alive() and pages == []
+    assert asyncio.run(asyncio.wait_for(read_async_pages(), timeout=5)) == []
+    assert scan.failed and async_scan.failed
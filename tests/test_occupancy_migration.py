@@ -0,0 +1,53 @@
+"""Transition from per-table occupancy rows: both layouts are claimed while old workers run."""
+
+from __future__ import annotations
+
+import pytest
+from conftest import book
+
+from app.config import settings
+
+
+@pytest.fixture
+def legacy_keys(monkeypatch):
+    monkeypatch.setattr(settings, "occupancy_legacy_keys", True)
+
+
+def legacy_row(repository, table_id: str, slot_key: str) -> dict | None:
+    return repository.client.get_item(repository._legacy_occupancy_key(table_id, slot_key))
+
+
+def test_a_slot_held_by_an_old_worker_cannot_be_booked(memory_repository, booking_date, legacy_keys):
+    # What the previous release writes when it books S1 at 21:00.
+    memory_repository.client.put_item(
+        {
+            **memory_repository._legacy_occupancy_key("S1", f"{booking_date}#21:00"),
+            "entity_type": "occupancy",
+            "table_id": "S1",
+            "reservation_id": "OLD",
+            "status": "confirmed",
+        }
+    )
+
+    success, error, _ = memory_repository.create_reservation(
+        {"date": booking_date, "time": "21:00", "num_people": 2, "customer_name": "Test", "phone": "600000000"}
+    )
+
+    assert not success
+    assert error == f"El slot {booking_date}#21:00 ya no estaba disponible"
+
+
+def test_new_bookings_claim_and_release_the_legacy_rows(memory_repository, booking_date, legacy_keys):
+    reservation = book(memory_repository, booking_date, "21:00", 2)
+    slot_key = f"{booking_date}#21:00"
+    assert legacy_row(memory_repository, reservation["table_id"], slot_key)["reservation_id"] == reservation["id"]
+
+    memory_repository.cancel_reservation(reservation["id"])
+
+    assert legacy_row(memory_repository, reservation["table_id"], slot_key) is None
+
+
+def test_legacy_rows_are_left_alone_by_default(memory_repository, booking_date):
+    reservation = book(memory_repository, booking_date, "21:00", 2)
+
+    assert legacy_row(memory_repository, reservation["table_id"], f"{booking_date}#21:00") is None
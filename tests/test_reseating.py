@@ -0,0 +1,19 @@
+"""Re-seating existing bookings so a request that first-fit rejected still fits."""
+
+from __future__ import annotations
+
+from conftest import book
+
+
+def test_reseat_frees_a_table_combination(memory_repository, booking_date):
+    first = book(memory_repository, booking_date, "21:00", 4, preferences="salon")
+    book(memory_repository, booking_date, "21:00", 4, preferences="salon")
+    blocker = book(memory_repository, booking_date, "21:00", 4, preferences="salon")
+    assert (first["table_id"], blocker["table_id"]) == ("S3", "S5")
+    memory_repository.cancel_reservation(first["id"])
+
+    # Only S5+S6 seats nine in the salon; the party of four on S5 has to move to S3.
+    large = book(memory_repository, booking_date, "21:00", 9, preferences="salon")
+
+    assert large["table_id"] == "S5+S6"
+    assert memory_repository.get_reservation(blocker["id"])["table_id"] == "S3"
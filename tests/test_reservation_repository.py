@@ -0,0 +1,131 @@
+"""Booking rules, checked against every storage backend."""
+
+from __future__ import annotations
+
+import pytest
+from conftest import book
+
+from app.config import PacingRule, settings
+from app.database import async_reservation_repository, opening_hours, pacing
+from app.database.reservation_repository import PACING_FULL_MESSAGE
+from app.database.availability import table_members
+
+
+@pytest.fixture
+def pacing_limit(monkeypatch):
+    """Limit every arrival slot to six covers; rule lookups are cached, so clear them around the test."""
+    monkeypatch.setattr(settings, "pacing_rules", [PacingRule(slot_covers=6)])
+    pacing.rule_for.cache_clear()
+    yield
+    pacing.rule_for.cache_clear()
+
+
+def available_at(repository, day: str, num_people: int, zone: str = "") -> set[str]:
+    return {slot["time"] for slot in repository.available_times(day, num_people, zone)}
+
+
+def test_create_stores_the_reservation(repository, booking_date):
+    reservation = book(repository, booking_date, "21:00", 2)
+
+    stored = repository.get_reservation(reservation["id"])
+    assert stored["status"] == "pending"
+    assert stored["table_id"] == reservation["table_id"]
+    assert stored["duration_min"] == opening_hours.reservation_duration(2, booking_date, "21:00")
+    assert [row["id"] for row in repository.query_reservations_by_date(booking_date)] == [reservation["id"]]
+
+
+def test_update_moves_the_reservation_and_frees_its_old_slot(repository, booking_date):
+    reservation = book(repository, booking_date, "21:00", 2)
+
+    success, error, updated = repository.update_reservation(reservation["id"], {"time": "13:00"})
+
+    assert success, error
+    assert repository.get_reservation(reservation["id"])["time"] == "13:00"
+    occupied = {row["time"] for row in repository.query_occupancy_by_date(booking_date)}
+    assert "21:00" not in occupied and "13:00" in occupied
+    assert updated["table_id"] == repository.get_reservation(reservation["id"])["table_id"]
+
+
+def test_cancel_releases_the_table(repository, booking_date):
+    reservation = book(repository, booking_date, "21:00", 2)
+
+    success, error, _ = repository.cancel_reservation(reservation["id"])
+
+    assert success, error
+    assert repository.get_reservation(reservation["id"])["status"] == "cancelled"
+    assert repository.query_occupancy_by_date(booking_date) == []
+
+
+def test_a_table_is_never_booked_twice(repository, booking_date):
+    booked = []
+    while len(booked) < 20:
+        success, error, reservation = repository.create_reservation(
+            {"date": booking_date, "time": "21:00", "num_people": 2, "customer_name": "Test", "phone": "600000000"}
+        )
+        if not success:
+            break
+        booked.append(reservation)
+
+    assert 0 < len(booked) < 20, error
+    tables = [member for reservation in booked for member in table_members(reservation["table_id"])]
+    assert len(tables) == len(set(tables))
+
+
+def test_large_party_gets_a_table_combination(repository, booking_date):
+    reservation = book(repository, booking_date, "21:00", 10, preferences="salon")
+
+    assert reservation["table_id"] == "S5+S6"
+    occupied = {row["table_id"] for row in repository.query_occupancy_by_date(booking_date)}
+    assert occupied == {"S5", "S6"}
+
+
+def test_a_combination_is_used_when_the_single_table_is_taken(repository, booking_date):
+    # S6 is the only single table for seven; the S3+S4 combination seats five to eight.
+    assert book(repository, booking_date, "21:00", 7)["table_id"] == "S6"
+
+    assert "21:00" in available_at(repository, booking_date, 7)
+    assert book(repository, booking_date, "21:00", 7)["table_id"] == "S3+S4"
+
+
+def test_pacing_limit_rejects_covers_over_the_slot_limit(repository, booking_date, pacing_limit):
+    first = book(repository, booking_date, "21:00", 4)
+
+    success, error, _ = repository.create_reservation(
+        {"date": booking_date, "time": "21:00", "num_people": 4, "customer_name": "Test", "phone": "600000000"}
+    )
+    assert not success
+    assert error == PACING_FULL_MESSAGE
+    assert "21:00" not in available_at(repository, booking_date, 4)
+    book(repository, booking_date, "21:30", 4)
+
+    # Cancelling gives the covers back to the slot.
+    repository.cancel_reservation(first["id"])
+    book(repository, booking_date, "21:00", 4)
+
+
+def test_pacing_limit_applies_before_the_first_booking(repository, booking_date, pacing_limit):
+    # No booking has written the date's pacing counters yet.
+    assert available_at(repository, booking_date, 8) == set()
+    assert repository.nearest_alternatives(booking_date, "21:00", 8) == []
+
+
+def test_bookings_invalidate_cached_availability(repository, booking_date):
+    # S5+S6 is the only salon table for ten.
+    assert "21:00" in available_at(repository, booking_date, 10, "salon")
+
+    reservation = book(repository, booking_date, "21:00", 10, preferences="salon")
+    assert "21:00" not in available_at(repository, booking_date, 10, "salon")
+
+    repository.cancel_reservation(reservation["id"])
+    assert "21:00" in available_at(repository, booking_date, 10, "salon")
+
+
+def test_sqlite_backend_builds_no_dynamodb_client(sqlite_repository, monkeypatch):
+    monkeypatch.setattr(settings, "reservation_backend", "sqlite")
+    monkeypatch.setattr(async_reservation_repository, "get_reservation_repository", lambda: sqlite_repository)
+    monkeypatch.setattr(async_reservation_repository, "build_async_client", pytest.fail)
+
+    repository = async_reservation_repository.build_async_repository()
+
+    assert repository.repository is sqlite_repository
+    assert repository.client is None
@@ -0,0 +1,30 @@
+"""The table catalog cache never keeps an empty (or failed) load."""
+
+from __future__ import annotations
+
+from app.database.reservation_repository import DEFAULT_TABLES
+
+
+def test_a_failed_first_load_is_retried_on_the_next_call(memory_repository, monkeypatch):
+    catalog = memory_repository.catalog
+    catalog.invalidate()
+    scan_all = catalog.client.scan_all
+    monkeypatch.setattr(catalog.client, "scan_all", lambda **kwargs: [])
+
+    assert catalog.active_tables() == []
+
+    monkeypatch.setattr(catalog.client, "scan_all", scan_all)
+    assert len(catalog.active_tables()) == len(DEFAULT_TABLES)
+
+
+def test_a_failed_reload_keeps_the_previous_catalog(memory_repository, monkeypatch):
+    catalog = memory_repository.catalog
+    tables = catalog.active_tables()
+    combinations = catalog.combinations()
+    monkeypatch.setattr(catalog.client, "scan_all", lambda **kwargs: [])
+
+    catalog.bump_version()
+
+    assert catalog.active_tables() == tables
+    assert catalog.combinations() == combinations
+    assert not catalog.is_fresh()